@@ -0,0 +1,103 @@
+"""
+Medicine autocomplete latency benchmark for Healio.AI backend
+
+Builds the prefix index over data/unified_medicines_database.json and
+reports p50/p99 latency of MedicineIndex.autocomplete for 1-6 character
+prefixes of real names, per category and across all categories.
+
+When the database has not been built (scripts/build_unified_database.py
+needs the ~248k-row source CSV), a deterministic synthetic database of the
+same size and letter distribution is used instead.
+
+Usage:
+    python benchmarks/bench_autocomplete.py [--queries 20000] [--limit 10] [--db PATH]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from medicine_index import MedicineIndex  # noqa: E402
+
+DEFAULT_DB = os.path.join(os.path.dirname(BACKEND_DIR), "data", "unified_medicines_database.json")
+SUMMARY = os.path.join(os.path.dirname(BACKEND_DIR), "data", "unified_db_summary.json")
+
+_SYLLABLES = ["am", "ox", "ci", "lin", "pa", "ra", "ce", "ta", "mol", "met", "for", "min", "az", "i",
+              "thro", "my", "cin", "ator", "va", "sta", "lo", "sar", "tan", "pred", "ni", "so", "lone",
+              "cef", "ix", "ime", "dox", "y", "cyc", "ine", "flu", "con", "zole", "ome", "pra"]
+_SUFFIXES = ["", "", "", " 500mg Tablet", " 250mg Capsule", " Syrup", " 10mg Tablet", " Injection",
+             " Cream", " Forte", " XR", " Plus", " DS", " Drops"]
+
+
+def synthetic_database(seed: int = 7) -> dict:
+    """A stand-in with the per-letter sizes recorded in data/unified_db_summary.json"""
+    rng = random.Random(seed)
+    with open(SUMMARY, encoding="utf-8") as f:
+        summary = json.load(f)
+    database = {}
+    for category, letters in summary.items():
+        database[category] = {}
+        for letter, count in letters.items():
+            names = set()
+            while len(names) < count:
+                stem = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4)))
+                head = letter if letter.isalpha() else str(rng.randint(1, 9))
+                names.add((head + stem).capitalize() + rng.choice(_SUFFIXES))
+            database[category][letter] = sorted(names)
+    return database
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--db", default=DEFAULT_DB)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        with open(args.db, encoding="utf-8") as f:
+            database = json.load(f)
+        source = args.db
+    else:
+        database = synthetic_database()
+        source = "synthetic (database not built)"
+
+    start = time.perf_counter()
+    index = MedicineIndex.from_database(database)
+    build_seconds = time.perf_counter() - start
+    counts = index.counts()
+    print(f"Source: {source}")
+    print(f"Indexed {sum(counts.values()):,} names in {build_seconds:.2f}s "
+          f"({', '.join(f'{c}: {n:,}' for c, n in counts.items())})")
+
+    rng = random.Random(11)
+    all_names = [name for prefix_index in index.categories.values() for name in prefix_index.names]
+    queries = []
+    for _ in range(args.queries):
+        name = rng.choice(all_names)
+        queries.append(name[:rng.randint(1, min(6, len(name)))])
+
+    print(f"\n{'category':<14} {'p50 (us)':>10} {'p99 (us)':>10} {'max (us)':>10}")
+    for category in [None, *index.categories]:
+        timings = []
+        for query in queries:
+            t0 = time.perf_counter()
+            index.autocomplete(query, category, args.limit)
+            timings.append((time.perf_counter() - t0) * 1e6)
+        timings.sort()
+        print(f"{category or 'all':<14} {percentile(timings, 0.50):>10.1f} "
+              f"{percentile(timings, 0.99):>10.1f} {timings[-1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
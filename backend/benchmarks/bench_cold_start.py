@@ -0,0 +1,52 @@
+"""
+Cold start import benchmark for Healio.AI backend
+
+Imports main under `python -X importtime` with VERCEL set, as
+test_cold_start.py does, and reports the import time owned by the app
+(main minus FastAPI/Pydantic/Starlette themselves) per run and its
+median. Exits non-zero when the median is over --budget milliseconds, so
+a deploy pipeline can gate on it; wall-clock timings are too noisy for
+the unit suite.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 5] [--budget 100]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test_cold_start import import_profile  # noqa: E402
+
+FRAMEWORK_PREFIXES = ("fastapi", "starlette", "pydantic")
+
+
+def app_import_ms(profile: list) -> float:
+    """main's cumulative import time minus the framework packages it imports"""
+    main_us = next(cumulative for cumulative, depth, name in profile if name == "main" and depth == 0)
+    framework_us = sum(
+        cumulative for cumulative, depth, name in profile
+        if depth == 1 and name.split(".")[0] in FRAMEWORK_PREFIXES
+    )
+    return (main_us - framework_us) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=float(os.getenv("COLD_START_BUDGET_MS", "100")))
+    args = parser.parse_args()
+
+    timings = [app_import_ms(import_profile()) for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"App import: median {median:.1f}ms over {args.runs} runs "
+          f"({', '.join(f'{t:.1f}' for t in timings)}), budget {args.budget:.0f}ms")
+    if median > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
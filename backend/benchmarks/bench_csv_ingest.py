@@ -0,0 +1,119 @@
+"""
+CSV ingestion benchmark for scripts/build_unified_database.py
+
+Times steps 1 and 3 of the build (CSV -> unique title-cased allopathic
+names) both ways, each in a fresh process so peak memory is its own:
+
+  pandas     read_csv of the whole file, then title_smart and a set
+             lookup per row in a Python loop (the default build)
+  streaming  stream_csv_names: pyarrow reads CSV_BLOCK_BYTES at a time,
+             Arrow string kernels title-case, hash lookups deduplicate
+             (the --streaming build)
+
+Both must return the same names in the same order. Without the real CSV
+(Medicines/ is not in every checkout) a synthetic one with the columns
+and duplicate rate of the 248k-row source is generated.
+
+Usage:
+    python benchmarks/bench_csv_ingest.py [--csv PATH] [--rows 248000]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+CSV_IN = os.path.join(REPO_DIR, "Medicines", "all_medicine databased.csv")
+STEMS = ["augment", "azithr", "dolo", "pan", "calp", "montel", "cetir", "amlo", "telmi", "metfor", "atorva",
+         "rosuva", "glim", "panto", "rabe", "ondan", "cefix", "amoxy", "levo", "diclo", "aceclo", "serra"]
+ENDINGS = ["in", "ol", "ex", "ix", "an", "ide", "ate", "one", "ium", "ra", "max", "cal"]
+FORMS = ["Tablet", "Capsule", "Syrup", "Injection", "Cream", "Tablet SR", "Tablet XR", "Oral Suspension", "Drops"]
+
+
+def write_synthetic_csv(path: str, rows: int):
+    """Rows shaped like the source: id, name, price, ..., two composition columns with commas"""
+    rng = random.Random(21)
+    names = []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "price(₹)", "Is_discontinued", "manufacturer_name", "type",
+                         "pack_size_label", "short_composition1", "short_composition2"])
+        for row in range(rows):
+            if names and rng.random() < 0.12:
+                # Repeats under other casing and spacing, as in the source
+                name = rng.choice(names)
+                name = rng.choice([name.upper(), name.lower(), "  " + name.replace(" ", "  ")])
+            else:
+                name = (f"{rng.choice(STEMS).capitalize()}{rng.choice(ENDINGS)}{rng.choice(STEMS)[:rng.randint(0, 3)]} "
+                        f"{rng.choice([5, 10, 20, 50, 100, 250, 500, 650])}{rng.choice(['', 'mg', ' Plus', ' Forte'])} "
+                        f"{rng.choice(FORMS)}")
+                names.append(name)
+            writer.writerow([row + 1, name, f"{rng.uniform(10, 900):.2f}", "FALSE", "Healio Pharma Ltd",
+                             "allopathy", "strip of 10 tablets", "Paracetamol (650mg), Caffeine (50mg)",
+                             "Amoxycillin  (500mg)"])
+
+
+def run(mode: str, path: str) -> dict:
+    """One mode in this process: seconds, peak RSS, and a digest of the names"""
+    import build_unified_database as build
+    # Libraries loaded before the baseline, so growth is the ingestion's own
+    if mode == "pandas":
+        import pandas  # noqa: F401
+    else:
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.csv  # noqa: F401
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "pandas":
+        names = build.unique_titled(build.read_csv_names(path))
+    else:
+        names = build.stream_csv_names(path)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"seconds": seconds, "peak_mb": peak / 1024, "growth_mb": (peak - baseline) / 1024,
+            "names": len(names), "digest": hashlib.sha1("\n".join(names).encode()).hexdigest()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=CSV_IN)
+    parser.add_argument("--rows", type=int, default=248000, help="Rows of the synthetic CSV")
+    parser.add_argument("--mode", choices=["pandas", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        print(json.dumps(run(args.mode, args.csv)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if not os.path.exists(path):
+            path = os.path.join(tmp, "synthetic.csv")
+            write_synthetic_csv(path, args.rows)
+            print(f"{args.csv} not found; using a synthetic CSV of {args.rows:,} rows")
+        print(f"CSV: {os.path.getsize(path) / (1024 * 1024):.1f} MB\n")
+        results = {}
+        for mode in ("pandas", "streaming"):
+            child = subprocess.run([sys.executable, __file__, "--mode", mode, "--csv", path],
+                                   capture_output=True, text=True, check=True)
+            results[mode] = json.loads(child.stdout)
+
+    print(f"{'mode':<10} {'names':>8} {'wall':>8} {'peak RSS':>9} {'growth':>8}")
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['names']:>8,} {result['seconds']:>7.2f}s {result['peak_mb']:>7.0f}MB "
+              f"{result['growth_mb']:>6.0f}MB")
+    assert results["pandas"]["digest"] == results["streaming"]["digest"], "the two modes returned different names"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Drug class lookup benchmark for Healio.AI backend
+
+Resolves 20-medication patient lists against data/drug_classes_database.json
+two ways and reports medication lists per second:
+
+  scan   for every medication, walk every class and compare its (already
+         normalized) drugs - the lookup before the reverse index
+  index  DrugClassIndex.resolve: one dict lookup and array slice per drug
+
+Both must return the same classes.
+
+Usage:
+    python benchmarks/bench_drug_classes.py [--lists 2000] [--size 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from drug_classes import DrugClassIndex, is_site_link, normalize_drug  # noqa: E402
+
+DATABASE = os.path.join(os.path.dirname(BACKEND_DIR), "data", "drug_classes_database.json")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lists", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(DATABASE, encoding="utf-8") as f:
+        classes = json.load(f)
+    start = time.perf_counter()
+    index = DrugClassIndex(classes)
+    print(f"{len(classes)} classes, {len(index.keys)} drug keys, {len(index.class_ids)} class ids, "
+          f"built in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    # Pre-normalized class lists, so the scan only pays for the walk itself
+    scanned = [(name, [normalize_drug(d) for d in drugs if not is_site_link(d)]) for name, drugs in classes.items()]
+
+    def scan(medication):
+        ingredients, route = normalize_drug(medication)
+        return [name for name, drugs in scanned
+                if any(i == ingredients and (route is None or r == route) for i, r in drugs)]
+
+    rng = random.Random(13)
+    drugs = sorted({d for ds in classes.values() for d in ds if not is_site_link(d)})
+    lists = [[f"{rng.choice(drugs)} {rng.choice(['', '10mg', '500 mg tablet'])}".strip()
+              for _ in range(args.size)] for _ in range(args.lists)]
+
+    scan_lists = lists[:max(1, args.lists // 20)]
+    start = time.perf_counter()
+    expected = [[scan(m) for m in medications] for medications in scan_lists]
+    scan_rate = len(scan_lists) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    resolved = [index.resolve(medications) for medications in lists]
+    index_rate = len(lists) / (time.perf_counter() - start)
+
+    for want, got in zip(expected, resolved):
+        assert want == [r["classes"] for r in got]
+    print(f"\n{'approach':<8} {'lists/s':>10} {'us/drug':>9}")
+    for label, rate in (("scan", scan_rate), ("index", index_rate)):
+        print(f"{label:<8} {rate:>10,.0f} {1e6 / rate / args.size:>9.1f}")
+    print(f"\nindex is {index_rate / scan_rate:,.0f}x faster ({args.size} medications per list)")
+
+
+if __name__ == "__main__":
+    main()
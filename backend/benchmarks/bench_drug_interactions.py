@@ -0,0 +1,111 @@
+"""
+Drug interaction screening benchmark for Healio.AI backend
+
+Screens a synthetic cohort (default 100k patients on 20 medications each,
+drawn from data/drug_classes_database.json, half of them from classes that
+have interactions) against data/drug_class_interactions.json three ways
+and reports patients per second:
+
+  rules   per pair of medications, walk every interaction rule and test
+          class membership - the check without a matrix
+  bitset  InteractionMatrix.screen per patient: O(k^2) bit tests
+  cohort  InteractionMatrix.screen_cohort: one numpy lookup per slot pair
+          for 8192 patients at a time (packing time reported separately)
+
+All three must find the same number of interactions per patient.
+
+Usage:
+    python benchmarks/bench_drug_interactions.py [--patients 100000] [--size 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from drug_classes import DrugClassIndex, is_site_link  # noqa: E402
+from drug_interactions import InteractionMatrix  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "data")
+CLASSES_PATH = os.path.join(DATA_DIR, "drug_classes_database.json")
+INTERACTIONS_PATH = os.path.join(DATA_DIR, "drug_class_interactions.json")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=20)
+    args = parser.parse_args()
+
+    index = DrugClassIndex.load(CLASSES_PATH)
+    start = time.perf_counter()
+    matrix = InteractionMatrix.load(INTERACTIONS_PATH, CLASSES_PATH)
+    print(f"{len(matrix.interactions)} interacting class pairs over {len(matrix.class_names)} classes, "
+          f"built in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    # Drugs resolved to class ids once; patients are lists of those
+    interacting = {name for interaction in matrix.interactions for name in interaction["classes"]}
+    with open(CLASSES_PATH, encoding="utf-8") as f:
+        classes = json.load(f)
+    drugs, risky = [], []
+    for name in sorted({d for ds in classes.values() for d in ds if not is_site_link(d)}):
+        class_ids = index.class_ids_of(name)
+        if len(class_ids):
+            drugs.append(class_ids)
+            if any(index.class_names[c] in interacting for c in class_ids):
+                risky.append(class_ids)
+    rng = random.Random(18)
+    patients = [[rng.choice(risky if rng.random() < 0.5 else drugs) for _ in range(args.size)]
+                for _ in range(args.patients)]
+
+    rules = [({matrix.class_names.index(a)}, {matrix.class_names.index(b)}) for a, b in
+             (interaction["classes"] for interaction in matrix.interactions)]
+
+    def rule_scan(medications):
+        count = 0
+        for i in range(len(medications)):
+            for j in range(i + 1, len(medications)):
+                first, second = set(medications[i]), set(medications[j])
+                for a, b in rules:
+                    count += len(first & a) * len(second & b) + len(first & b) * len(second & a)
+        return count
+
+    sample = patients[:max(1, args.patients // 100)]
+    start = time.perf_counter()
+    scanned = [rule_scan(p) for p in sample]
+    scan_rate = len(sample) / (time.perf_counter() - start)
+
+    sample = patients[:max(1, args.patients // 10)]
+    start = time.perf_counter()
+    screened = [len(matrix.screen(p)) for p in sample]
+    bitset_rate = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    packed = matrix.pack_cohort(patients)
+    pack_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    counts, worst = matrix.screen_packed(*packed)
+    screen_seconds = time.perf_counter() - start
+
+    assert scanned == screened[:len(scanned)] == counts[:len(scanned)].tolist()
+    assert screened == counts[:len(screened)].tolist()
+    flagged = int((counts > 0).sum())
+    print(f"{args.patients:,} patients x {args.size} medications, {packed[0].shape[1]} class slots; "
+          f"{flagged:,} patients ({flagged / args.patients:.0%}) with an interaction, "
+          f"{int((worst == 3).sum()):,} with a major one")
+
+    cohort_rate = args.patients / screen_seconds
+    print(f"\n{'approach':<8} {'patients/s':>12}")
+    print(f"{'rules':<8} {scan_rate:>12,.0f}")
+    print(f"{'bitset':<8} {bitset_rate:>12,.0f}   ({bitset_rate / scan_rate:,.0f}x)")
+    print(f"{'cohort':<8} {cohort_rate:>12,.0f}   ({cohort_rate / scan_rate:,.0f}x)")
+    print(f"\ncohort: {screen_seconds:.2f}s to screen, {pack_seconds:.2f}s to pack {args.patients:,} patients")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Email template render benchmark for Healio.AI backend
+
+Measures renders per second of each email type through the EmailService
+build_* methods (HTML + plain text + Resend params).
+
+Usage:
+    python benchmarks/bench_email_templates.py [--seconds 1.0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from email_service import EmailService  # noqa: E402
+
+CASES = {
+    "diagnosis": lambda: EmailService.build_diagnosis_complete(
+        "patient@example.com", "Asha <Patel>", "Likely tension-type headache & mild dehydration",
+        [{"name": "Tension headache", "confidence": 82.4},
+         {"name": "Migraine without aura", "confidence": 41},
+         {"name": "Dehydration", "confidence": 30}],
+        "c-123",
+    ),
+    "reminder/medication": lambda: EmailService.build_reminder(
+        "patient@example.com", "Asha", "medication",
+        {"medicine": "Metformin", "dosage": "500mg", "time": "8:00 AM"},
+    ),
+    "reminder/appointment": lambda: EmailService.build_reminder(
+        "patient@example.com", "Asha", "appointment",
+        {"doctor": "Dr. Rao", "date": "Oct 20", "time": "10:30 AM", "location": "Clinic 4"},
+    ),
+    "health_tip": lambda: EmailService.build_health_tip(
+        "patient@example.com", "Asha", "Hydrate early", "Drink a glass of warm water after waking up.",
+    ),
+}
+
+
+def measure(fn, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn()
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'template':<22} {'renders/sec':>12} {'us/render':>10}")
+    for name, fn in CASES.items():
+        rate = measure(fn, args.seconds)
+        print(f"{name:<22} {rate:>12,.0f} {1e6 / rate:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
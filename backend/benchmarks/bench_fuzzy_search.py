@@ -0,0 +1,104 @@
+"""
+Fuzzy medicine search benchmark for Healio.AI backend
+
+Builds the fuzzy index over the unified medicines database (or the same
+synthetic stand-in as bench_autocomplete.py when it has not been built),
+round-trips it through its on-disk format, and reports p50/p99 latency of
+FuzzyIndex.search for one- and two-word queries with 0-2 typos.
+
+Usage:
+    python benchmarks/bench_fuzzy_search.py [--queries 5000] [--db PATH]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_autocomplete import DEFAULT_DB, percentile, synthetic_database  # noqa: E402
+from fuzzy_index import FuzzyIndex, max_distance, words_of  # noqa: E402
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Apply up to max_distance(word) random edits"""
+    for _ in range(rng.randint(0, max_distance(word))):
+        i = rng.randrange(len(word))
+        edit = rng.choice(("delete", "insert", "replace", "swap"))
+        if edit == "delete" and len(word) > 4:
+            word = word[:i] + word[i + 1:]
+        elif edit == "insert":
+            word = word[:i] + rng.choice(LETTERS) + word[i:]
+        elif edit == "swap" and i + 1 < len(word):
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        else:
+            word = word[:i] + rng.choice(LETTERS) + word[i + 1:]
+    return word
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--db", default=DEFAULT_DB)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        with open(args.db, encoding="utf-8") as f:
+            database = json.load(f)
+        source = args.db
+    else:
+        database = synthetic_database()
+        source = "synthetic (database not built)"
+
+    start = time.perf_counter()
+    built = FuzzyIndex.build(database)
+    build_seconds = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fuzzy.json")
+        built.save(path)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        start = time.perf_counter()
+        index = FuzzyIndex.load(path)
+        load_seconds = time.perf_counter() - start
+
+    print(f"Source: {source}")
+    print(f"{len(index.names):,} names, {len(index.words):,} distinct words")
+    print(f"Build {build_seconds:.2f}s (at database-build time), file {size_mb:.1f}MB, "
+          f"server load {load_seconds:.2f}s")
+
+    rng = random.Random(5)
+    samples = {"1 word": [], "2 words": []}
+    while len(samples["2 words"]) < args.queries or len(samples["1 word"]) < args.queries:
+        words = [w for w in words_of(rng.choice(index.names)) if w.isalpha() and len(w) >= 4]
+        if not words:
+            continue
+        if len(samples["1 word"]) < args.queries:
+            samples["1 word"].append(typo(rng.choice(words), rng))
+        if len(words) >= 2 and len(samples["2 words"]) < args.queries:
+            samples["2 words"].append(" ".join(typo(w, rng) for w in rng.sample(words, 2)))
+
+    print(f"\n{'query':<10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'hit rate':>10}")
+    for label, queries in samples.items():
+        timings = []
+        hits = 0
+        for query in queries:
+            t0 = time.perf_counter()
+            results = index.search(query, None, args.limit)
+            timings.append((time.perf_counter() - t0) * 1000)
+            hits += bool(results)
+        timings.sort()
+        print(f"{label:<10} {percentile(timings, 0.50):>10.2f} {percentile(timings, 0.99):>10.2f} "
+              f"{hits / len(queries):>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Herb property query benchmark for Healio.AI backend
+
+Scales data/ayurvedic/herbs.json up to thousands of herbs (each copy gets
+randomly reshuffled properties) and compares HerbQueryEngine.query, which
+filters with bitset AND/OR and counts facets with popcount, against a scan
+that checks every herb's parsed properties per query. Both return the same
+totals and facet counts.
+
+Usage:
+    python benchmarks/bench_herb_query.py [--sizes 15,1000,5000,20000] [--queries 500]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from herb_query import FACETS, HerbQueryEngine, herb_facets  # noqa: E402
+
+HERBS = os.path.join(os.path.dirname(BACKEND_DIR), "data", "ayurvedic", "herbs.json")
+
+
+def scaled_herbs(herbs: list, size: int, rng: random.Random) -> list:
+    """`size` herbs whose fields are drawn from the real records"""
+    if size <= len(herbs):
+        return herbs[:size]
+    return [{**rng.choice(herbs), "id": f"synthetic{i}", **{facet: rng.choice(herbs)[facet] for facet in FACETS}}
+            for i in range(size)]
+
+
+def scan_query(parsed: list, filters: dict) -> tuple:
+    """Total and facet counts by checking every herb (match="any")"""
+    def passes(facets, skip=None):
+        return all(not values or set(values) & set(facets[facet])
+                   for facet, values in filters.items() if facet != skip)
+    total = sum(passes(facets) for facets in parsed)
+    counts = {facet: {} for facet in FACETS}
+    for facet in FACETS:
+        for facets in parsed:
+            if passes(facets, skip=facet):
+                for value in facets[facet]:
+                    counts[facet][value] = counts[facet].get(value, 0) + 1
+    return total, counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="15,1000,5000,20000")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    with open(HERBS, encoding="utf-8") as f:
+        source = json.load(f)
+    rng = random.Random(9)
+    print(f"{'herbs':>7} {'build (ms)':>11} {'bitset (us)':>12} {'scan (us)':>11} {'speedup':>8}")
+    for size in map(int, args.sizes.split(",")):
+        herbs = scaled_herbs(source, size, rng)
+        start = time.perf_counter()
+        engine = HerbQueryEngine(herbs)
+        build_ms = (time.perf_counter() - start) * 1000
+        parsed = [herb_facets(herb) for herb in herbs]
+
+        queries = []
+        for _ in range(args.queries):
+            facets = rng.sample(FACETS, rng.randint(1, 3))
+            queries.append({facet: rng.sample(sorted(engine.bitsets[facet]), 1) for facet in facets})
+
+        start = time.perf_counter()
+        results = [engine.query(filters, limit=20) for filters in queries]
+        bitset_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        scanned = queries[:max(1, min(len(queries), 200_000 // size))]
+        start = time.perf_counter()
+        for filters, result in zip(scanned, results):
+            total, counts = scan_query(parsed, filters)
+            assert total == result["total"]
+            assert all(counts[f].get(v, 0) == n for f in FACETS for v, n in result["facets"][f].items())
+        scan_us = (time.perf_counter() - start) / len(scanned) * 1e6
+        print(f"{size:>7} {build_ms:>11.1f} {bitset_us:>12.1f} {scan_us:>11.1f} {scan_us / bitset_us:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
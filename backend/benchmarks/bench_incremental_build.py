@@ -0,0 +1,89 @@
+"""
+Incremental build benchmark for scripts/build_unified_database.py
+
+Builds the unified database into a temporary directory, then times:
+
+  full       every source read and merged (a first build, or no --incremental)
+  no-op      --incremental with nothing changed: source and output hashes only
+  one source --incremental after herbs.json gains an entry: that source is
+             read again, the others come from data/unified_build, then the
+             merge and outputs are redone
+
+Without the real CSV (Medicines/ is not in every checkout) the synthetic
+one from bench_csv_ingest.py is used.
+
+Usage:
+    python benchmarks/bench_incremental_build.py [--csv PATH] [--rows 248000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import build_unified_database as build  # noqa: E402
+from bench_csv_ingest import write_synthetic_csv  # noqa: E402
+
+
+def timed(**kwargs):
+    start = time.perf_counter()
+    # The build's progress output is not what is measured
+    with contextlib.redirect_stdout(io.StringIO()):
+        read = build.build(**kwargs)
+    return time.perf_counter() - start, read
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=build.CSV_IN)
+    parser.add_argument("--rows", type=int, default=248000, help="Rows of the synthetic CSV")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not os.path.exists(args.csv):
+            args.csv = os.path.join(tmp, "synthetic.csv")
+            write_synthetic_csv(args.csv, args.rows)
+            print(f"CSV not found; using a synthetic CSV of {args.rows:,} rows")
+        build.CSV_IN = args.csv
+        build.AYUR_IN = shutil.copy(build.AYUR_IN, os.path.join(tmp, "herbs.json"))
+        build.OUT = os.path.join(tmp, "unified_medicines_database.json")
+        build.SUMMARY_OUT = os.path.join(tmp, "unified_db_summary.json")
+        build.FUZZY_OUT = os.path.join(tmp, "unified_medicines_fuzzy_index.json")
+        build.BUILD_DIR = os.path.join(tmp, "unified_build")
+        build.MANIFEST = os.path.join(build.BUILD_DIR, "manifest.json")
+
+        full, _ = timed()
+        with open(build.OUT, "rb") as f:
+            full_output = f.read()
+        noop, noop_read = timed(incremental=True)
+        assert noop_read == []
+
+        with open(build.AYUR_IN, encoding="utf-8") as f:
+            herbs = json.load(f)
+        with open(build.AYUR_IN, "w", encoding="utf-8") as f:
+            json.dump(herbs + [{"herb_name": "Benchmark Herb"}], f)
+        one, one_read = timed(incremental=True)
+        assert one_read == ["herbs"]
+        with open(build.AYUR_IN, "w", encoding="utf-8") as f:
+            json.dump(herbs, f)
+        timed(incremental=True)
+        with open(build.OUT, "rb") as f:
+            assert f.read() == full_output, "incremental output differs from the full build"
+
+    print(f"\n{'build':<12} {'wall':>8}")
+    for label, seconds in (("full", full), ("no-op", noop), ("one source", one)):
+        print(f"{label:<12} {seconds:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Materia medica parse and lookup benchmark for Healio.AI backend
+
+Parses the whole of Boericke's Materia Medica (scripts/boericke.txt) with
+the curated remedy names, then times a remedy section lookup two ways:
+
+  scan   a regex over the book text for the remedy's heading, then for the
+         section label after it - what answering from the raw text costs
+  store  MateriaMedica.section: two dict lookups
+
+Usage:
+    python benchmarks/bench_materia_medica.py [--runs 5] [--lookups 20000]
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+from build_materia_medica import PREPARATION  # noqa: E402
+from curated_medicines import HOMEOPATHIC_CURATED  # noqa: E402
+from materia_medica import MateriaMedica  # noqa: E402
+
+BOOK = os.path.join(REPO_DIR, "scripts", "boericke.txt")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(BOOK, encoding="utf-8") as f:
+        text = f.read()
+    names = [PREPARATION.sub("", name) for name in HOMEOPATHIC_CURATED]
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        book = MateriaMedica.from_text(text, names)
+        timings.append(time.perf_counter() - start)
+    sections = sum(len(remedy["sections"]) for remedy in book.remedies.values())
+    print(f"Parsed {len(text) / (1024 * 1024):.2f} MB into {len(book.remedies)} remedies, {sections:,} sections: "
+          f"best {min(timings) * 1000:.0f}ms, median {statistics.median(timings) * 1000:.0f}ms")
+
+    rng = random.Random(20)
+    lookups = [(remedy["heading"], section) for remedy in book.remedies.values() for section in remedy["sections"]]
+    lookups = [rng.choice(lookups) for _ in range(args.lookups)]
+
+    def scan(heading, section):
+        found = re.search(r"^\W*" + r"\W+".join(heading.upper().split()) + r"\W*$", text, re.M)
+        if found:
+            return re.compile(rf"^{section}\W*—", re.M | re.I).search(text, found.end())
+
+    scanned = lookups[:max(1, args.lookups // 100)]
+    start = time.perf_counter()
+    for heading, section in scanned:
+        scan(heading, section)
+    scan_us = (time.perf_counter() - start) / len(scanned) * 1e6
+    start = time.perf_counter()
+    for heading, section in lookups:
+        book.section(heading, section)
+    store_us = (time.perf_counter() - start) / len(lookups) * 1e6
+    print(f"\nSection lookup: scan {scan_us:,.0f}us, store {store_us:.1f}us ({scan_us / store_us:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Medicine substring search benchmark for Healio.AI backend
+
+Times "names containing q" over the unified medicines database three ways,
+for 3-6 character substrings of real names (and separately 2 characters):
+
+  scan        a Python loop over all lower-cased names collecting every
+              match, ranked like MedicineFTS (prefix matches first, then
+              alphabetical) - the same answer, total included
+  scan-first  the loop of src/app/api/medicines/search/route.ts: stops at
+              the first `limit` matches, so its total and ranking are partial
+  fts         MedicineFTS.search on the SQLite FTS5 trigram database
+
+When the database has not been built, the synthetic one from
+bench_autocomplete.py is used.
+
+Usage:
+    python benchmarks/bench_medicine_fts.py [--queries 2000] [--limit 40] [--db PATH]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_autocomplete import DEFAULT_DB, percentile, synthetic_database  # noqa: E402
+from medicine_fts import MedicineFTS, write_database  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=40)
+    parser.add_argument("--db", default=DEFAULT_DB)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        with open(args.db, encoding="utf-8") as f:
+            database = json.load(f)
+        source = args.db
+    else:
+        database = synthetic_database()
+        source = "synthetic (database not built)"
+    rows = [(name.lower(), name, category)
+            for category, letters in database.items() for names in letters.values() for name in names]
+    print(f"Source: {source} ({len(rows):,} names)")
+
+    def scan(q):
+        matches = [(not lower.startswith(q), lower, name, category) for lower, name, category in rows if q in lower]
+        matches.sort()
+        return matches[:args.limit], len(matches)
+
+    def scan_first(q):
+        matches = []
+        for lower, name, category in rows:
+            if q in lower:
+                matches.append((name, category))
+                if len(matches) >= args.limit:
+                    break
+        return matches
+
+    def substrings(count, shortest, longest):
+        rng = random.Random(25)
+        found = []
+        while len(found) < count:
+            name = rng.choice(rows)[0]
+            length = rng.randint(shortest, min(longest, len(name)))
+            start = rng.randint(0, len(name) - length)
+            # Queries are stripped before searching, so these would be shorter
+            if name[start] != " " and name[start + length - 1] != " ":
+                found.append(name[start:start + length])
+        return found
+
+    queries = substrings(args.queries, 3, 6)
+    # Under 3 characters there is no trigram to look up: MedicineFTS scans too
+    short_queries = substrings(max(1, args.queries // 10), 2, 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unified_medicines.sqlite3")
+        start = time.perf_counter()
+        write_database(database, path)
+        print(f"Wrote the FTS5 database in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+        index = MedicineFTS.load(path)
+
+        print(f"\n{'method':<12} {'p50':>9} {'p99':>9}   {'2 chars p50':>11}")
+        timings = {}
+        for label, search in (("scan", scan), ("scan-first", scan_first),
+                              ("fts", lambda q: index.search(q, limit=args.limit))):
+            for batch in (queries, short_queries):
+                latencies = []
+                for q in batch:
+                    start = time.perf_counter()
+                    search(q)
+                    latencies.append(time.perf_counter() - start)
+                latencies.sort()
+                timings.setdefault(label, latencies)
+            print(f"{label:<12} {percentile(timings[label], 0.5) * 1000:>7.2f}ms "
+                  f"{percentile(timings[label], 0.99) * 1000:>7.2f}ms   {percentile(latencies, 0.5) * 1000:>9.2f}ms")
+
+        mismatched = sum(scan(q)[1] != index.search(q, limit=args.limit)[1] for q in queries[:200])
+        print(f"\nfts vs scan p50: {percentile(timings['scan'], 0.5) / percentile(timings['fts'], 0.5):.0f}x faster; "
+              f"totals differ on {mismatched} of 200 queries")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
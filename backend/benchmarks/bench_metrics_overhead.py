@@ -0,0 +1,65 @@
+"""
+Metrics middleware overhead benchmark for Healio.AI backend
+
+Drives a trivial ASGI app directly (no sockets, no HTTP parsing) with and
+without MetricsMiddleware and reports the added cost per request.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py [--requests 200000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import MetricsMiddleware
+
+
+class Route:
+    path = "/api/email/status/{message_id}"
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = Route  # what Starlette's router does on a match
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def per_request_seconds(app, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/"}, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    wrapped = MetricsMiddleware(endpoint)
+    bare_best = wrapped_best = float("inf")
+    for _ in range(args.rounds):
+        bare_best = min(bare_best, asyncio.run(per_request_seconds(endpoint, args.requests)))
+        wrapped_best = min(wrapped_best, asyncio.run(per_request_seconds(wrapped, args.requests)))
+
+    print(f"{'bare app':<22} {bare_best * 1e6:8.2f} µs/request")
+    print(f"{'with metrics':<22} {wrapped_best * 1e6:8.2f} µs/request")
+    print(f"{'overhead':<22} {(wrapped_best - bare_best) * 1e6:8.2f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Rate limiter overhead benchmark for Healio.AI backend
+
+Measures the cost of one limiter hit (what slowapi does per request) for
+each storage backend and strategy. The RESP backend runs against the
+in-process fake server unless --resp-uri points at a real Redis.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py [--hits 20000] [--resp-uri resp://localhost:6379]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from limits import parse  # noqa: E402
+from limits.storage import storage_from_string  # noqa: E402
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter  # noqa: E402
+
+import rate_limit_storage  # noqa: E402,F401
+from test_rate_limit_storage import FakeRespServer  # noqa: E402
+
+
+def measure(uri: str, strategy, hits: int) -> float:
+    limiter = strategy(storage_from_string(uri))
+    limit = parse(f"{hits * 10}/minute")
+    keys = [f"198.51.100.{i % 250}" for i in range(hits)]
+    start = time.perf_counter()
+    for key in keys:
+        limiter.hit(limit, "/upload", key)
+    return (time.perf_counter() - start) / hits * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--resp-uri", default="")
+    args = parser.parse_args()
+
+    fake = None
+    resp_uri = args.resp_uri
+    if not resp_uri:
+        fake = FakeRespServer().start()
+        resp_uri = fake.uri
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "memory": "memory://",
+            "sqlite": f"sqlite:///{os.path.join(tmp, 'ratelimit.sqlite3')}",
+            "resp" + ("" if args.resp_uri else " (fake)"): resp_uri,
+        }
+        print(f"{'storage':<14} {'fixed-window':>14} {'sliding-window':>16}   (us per hit)")
+        for name, uri in backends.items():
+            fixed = measure(uri, FixedWindowRateLimiter, args.hits)
+            sliding = measure(uri, SlidingWindowCounterRateLimiter, args.hits)
+            print(f"{name:<14} {fixed:>14.1f} {sliding:>16.1f}")
+
+    if fake is not None:
+        fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()
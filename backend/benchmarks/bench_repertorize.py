@@ -0,0 +1,89 @@
+"""
+Repertorization latency benchmark for Healio.AI backend
+
+Loads the full repertory (data/repertory.npz; run scripts/build_repertory.py
+first) and times case analysis for cases of 10, 40 and 100 random rubrics,
+plus a worst case of the 40 largest rubrics, two ways:
+
+  dict    {sym_id: {rem: grade}} and a Python loop adding up the case's
+          rubrics - repertorization without the matrix
+  engine  RepertoryEngine.repertorize: one sparse row-sum over CSR arrays
+
+Both must produce the same totals. Reports p50/p99 latency per case,
+timing each approach over all cases in turn.
+
+Usage:
+    python benchmarks/bench_repertorize.py [--cases 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from repertory import RepertoryEngine  # noqa: E402
+
+REPERTORY = os.path.join(os.path.dirname(BACKEND_DIR), "data", "repertory.npz")
+
+
+def percentiles(seconds: list) -> tuple:
+    ordered = sorted(seconds)
+    return statistics.median(ordered) * 1e6, ordered[int(len(ordered) * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=2000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = RepertoryEngine.load(REPERTORY)
+    rows, columns = engine.shape
+    print(f"{rows:,} symptoms x {columns:,} remedies, {len(engine.grades):,} graded entries, "
+          f"loaded in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    repertory = {}
+    for row, sym_id in enumerate(engine.symptom_ids.tolist()):
+        span = slice(engine.indptr[row], engine.indptr[row + 1])
+        repertory[sym_id] = dict(zip(engine.indices[span].tolist(), engine.grades[span].tolist()))
+
+    def dict_scores(case):
+        totals = {}
+        for sym_id in case:
+            for remedy, grade in repertory.get(sym_id, {}).items():
+                totals[remedy] = totals.get(remedy, 0) + grade
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:20]
+
+    rng = random.Random(19)
+    symptom_ids = engine.symptom_ids.tolist()
+    sizes = (engine.indptr[1:] - engine.indptr[:-1]).tolist()
+    largest = [sym_id for _, sym_id in sorted(zip(sizes, symptom_ids), reverse=True)[:40]]
+    workloads = [(f"{n} rubrics", [rng.sample(symptom_ids, n) for _ in range(args.cases)]) for n in (10, 40, 100)]
+    workloads.append(("40 largest", [rng.sample(largest, 40) for _ in range(args.cases)]))
+
+    print(f"\n{'case':<12} {'entries':>8} {'dict p50':>9} {'p99':>8} {'engine p50':>11} {'p99':>8}  (us)")
+    for label, cases in workloads:
+        # Each approach over all cases in turn, so neither runs on caches the other just evicted
+        timings = {}
+        for name, repertorize in (("dict", dict_scores), ("engine", engine.repertorize)):
+            timings[name] = []
+            for case in cases:
+                begin = time.perf_counter()
+                repertorize(case)
+                timings[name].append(time.perf_counter() - begin)
+        for case in cases[:100]:
+            totals, _, _ = engine.scores(case)
+            assert all(totals[remedy] == total for remedy, total in dict_scores(case))
+        entries = statistics.mean(sum(len(repertory[s]) for s in case) for case in cases)
+        dict_p50, dict_p99 = percentiles(timings["dict"])
+        engine_p50, engine_p99 = percentiles(timings["engine"])
+        print(f"{label:<12} {entries:>8,.0f} {dict_p50:>9.0f} {dict_p99:>8.0f} {engine_p50:>11.0f} {engine_p99:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Sharded medicine database benchmark for Healio.AI backend
+
+Compares what a consumer needing one letter of one category reads and
+parses:
+
+  whole file   data/unified_medicines_database.json as the build writes it
+               (indent=2), parsed entirely
+  one shard    that letter's minified shard (build_unified_database.py
+               --shards), as stored and as sent with gzip or brotli
+               Content-Encoding, parsed alone
+
+for the largest Allopathic letter and a median-sized one. Without a built
+database the synthetic one from bench_autocomplete.py is used.
+
+Usage:
+    python benchmarks/bench_shards.py [--db PATH] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_autocomplete import DEFAULT_DB, synthetic_database  # noqa: E402
+from medicine_shards import ShardedDatabase, write_shards  # noqa: E402
+
+
+def best_ms(function, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        with open(args.db, encoding="utf-8") as f:
+            database = json.load(f)
+        source = args.db
+    else:
+        database = synthetic_database()
+        source = "synthetic (database not built)"
+    print(f"Source: {source}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        whole_path = os.path.join(tmp, "unified_medicines_database.json")
+        with open(whole_path, "w", encoding="utf-8") as f:
+            json.dump(database, f, ensure_ascii=False, indent=2)
+        manifest = write_shards(database, os.path.join(tmp, "shards"))
+
+        def parse_whole():
+            with open(whole_path, encoding="utf-8") as f:
+                json.load(f)
+
+        whole_bytes = os.path.getsize(whole_path)
+        whole_ms = best_ms(parse_whole, args.runs)
+        print(f"\n{'':<22} {'json':>10} {'gzip':>10} {'brotli':>10} {'parse':>9}")
+        print(f"{'whole file':<22} {whole_bytes:>10,} {'':>10} {'':>10} {whole_ms:>7.1f}ms")
+
+        letters = manifest["categories"]["Allopathic"]
+        by_size = sorted(letters, key=lambda letter: letters[letter]["count"])
+        for label, letter in (("largest", by_size[-1]), ("median", by_size[len(by_size) // 2])):
+            entry = letters[letter]
+
+            def parse_shard():
+                # A fresh reader each run, so the shard is really read and parsed
+                ShardedDatabase.load(os.path.join(tmp, "shards")).letter("Allopathic", letter)
+
+            shard_ms = best_ms(parse_shard, args.runs)
+            print(f"{f'Allopathic/{letter} ({label})':<22} {entry['bytes']:>10,} {entry['gzip_bytes']:>10,} "
+                  f"{entry.get('brotli_bytes', 0):>10,} {shard_ms:>7.1f}ms   "
+                  f"({whole_bytes / entry['bytes']:.0f}x smaller, {whole_ms / shard_ms:.0f}x faster)")
+
+        shard_files = [entry for letters in manifest["categories"].values() for entry in letters.values()]
+        print(f"\nAll {len(shard_files)} shards: " + ", ".join(
+            f"{label} {sum(entry.get(key, 0) for entry in shard_files):,} bytes"
+            for label, key in (("json", "bytes"), ("gzip", "gzip_bytes"), ("brotli", "brotli_bytes"))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Columnar snapshot start-up benchmark for Healio.AI backend
+
+Times what a consumer of the unified database pays on start before it can
+read the names of one letter, each mode in a fresh process:
+
+  json      json.load of data/unified_medicines_database.json (indent=2,
+            as the build writes it)
+  snapshot  MedicineSnapshot.load of the Arrow snapshot (build_unified_database.py
+            --snapshot) and a zero-copy view of Allopathic/A
+
+and the memory it took: peak RSS growth, and Python heap (tracemalloc, in
+a separate run since tracing slows json.load down). Without a built
+database the synthetic one from bench_autocomplete.py is used.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--db PATH]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_kb() -> int:
+    # ru_maxrss survives exec on Linux, so a child started by a bigger parent would report the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def open_database(mode: str, path: str) -> int:
+    """Load as a consumer would and return the size of Allopathic/A"""
+    if mode == "json":
+        with open(path, encoding="utf-8") as f:
+            return len(json.load(f)["Allopathic"]["A"])
+    from medicine_snapshot import MedicineSnapshot
+    return len(MedicineSnapshot.load(path).names("Allopathic", "A"))
+
+
+def run(mode: str, path: str) -> dict:
+    if mode == "snapshot":
+        import pyarrow  # noqa: F401  (the library itself is not the snapshot's cost)
+        import medicine_snapshot  # noqa: F401
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    count = open_database(mode, path)
+    seconds = time.perf_counter() - start
+    growth = peak_rss_kb() - baseline
+    tracemalloc.start()
+    open_database(mode, path)
+    heap = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ms": seconds * 1000, "growth_mb": growth / 1024, "heap_mb": heap / (1024 * 1024), "count": count}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--mode", choices=["json", "snapshot"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        print(json.dumps(run(args.mode, args.path)))
+        return
+
+    from bench_autocomplete import DEFAULT_DB, synthetic_database
+    from medicine_snapshot import write_snapshot
+
+    db_path = args.db or DEFAULT_DB
+    if os.path.exists(db_path):
+        with open(db_path, encoding="utf-8") as f:
+            database = json.load(f)
+        print(f"Source: {db_path}")
+    else:
+        database = synthetic_database()
+        print("Source: synthetic (database not built)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"json": os.path.join(tmp, "unified_medicines_database.json"),
+                 "snapshot": os.path.join(tmp, "unified_medicines.arrow")}
+        with open(paths["json"], "w", encoding="utf-8") as f:
+            json.dump(database, f, ensure_ascii=False, indent=2)
+        write_snapshot(database, paths["snapshot"])
+
+        print(f"\n{'mode':<10} {'file':>9} {'start':>9} {'RSS growth':>11} {'heap':>8}")
+        results = {}
+        for mode, path in paths.items():
+            child = subprocess.run([sys.executable, __file__, "--mode", mode, "--path", path],
+                                   capture_output=True, text=True, check=True)
+            results[mode] = result = json.loads(child.stdout)
+            print(f"{mode:<10} {os.path.getsize(path) / (1024 * 1024):>7.2f}MB {result['ms']:>7.1f}ms "
+                  f"{result['growth_mb']:>9.1f}MB {result['heap_mb']:>6.2f}MB")
+    assert results["json"]["count"] == results["snapshot"]["count"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Symptom search throughput benchmark for Healio.AI backend
+
+Compares SymptomIndex.search against a naive scan that walks every ailment
+of data/home_remedies/nuskhe.json per query and scores it with the same
+BM25 formula, on 1-3 symptom queries drawn from the corpus (plus misses).
+Both must return the same ranking; the report is queries per second.
+
+Usage:
+    python benchmarks/bench_symptom_search.py [--queries 20000] [--copies 1]
+
+--copies N repeats the corpus N times to see how each approach scales.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from symptom_index import B, K1, SymptomIndex, document_text, terms_of  # noqa: E402
+
+NUSKHE = os.path.join(os.path.dirname(BACKEND_DIR), "data", "home_remedies", "nuskhe.json")
+
+
+def naive_search(ailments: list, symptoms: list, limit: int) -> list:
+    """The pre-index approach: tokenize and score every ailment for every query"""
+    documents = [terms_of(" ".join(document_text(ailment))) for ailment in ailments]
+    average_length = sum(map(len, documents)) / len(documents)
+    query = set(terms_of(" ".join(symptoms)))
+    scores = {}
+    for doc_id, terms in enumerate(documents):
+        for term in query.intersection(terms):
+            containing = sum(term in other for other in documents)
+            idf = math.log(1 + (len(documents) - containing + 0.5) / (containing + 0.5))
+            tf = terms.count(term)
+            weight = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len(terms) / average_length))
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [ailments[doc_id]["id"] for doc_id, _ in ranked]
+
+
+def queries_per_second(search, queries: list) -> float:
+    start = time.perf_counter()
+    for symptoms in queries:
+        search(symptoms)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--copies", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(NUSKHE, encoding="utf-8") as f:
+        ailments = json.load(f) * args.copies
+    start = time.perf_counter()
+    index = SymptomIndex(ailments)
+    print(f"{len(ailments)} ailments, {len(index.postings)} terms, "
+          f"index built in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    rng = random.Random(3)
+    keywords = [k for ailment in ailments for k in ailment.get("symptoms_keywords", [])]
+    queries = [rng.sample(keywords, rng.randint(1, 3)) + (["xyzzy"] if rng.random() < 0.1 else [])
+               for _ in range(args.queries)]
+
+    naive_queries = queries[:max(1, args.queries // 100)]
+    for symptoms in naive_queries:
+        expected = naive_search(ailments, symptoms, args.limit)
+        assert [r["id"] for r in index.search(symptoms, args.limit)] == expected, symptoms
+
+    indexed = queries_per_second(lambda s: index.search(s, args.limit, 0), queries)
+    naive = queries_per_second(lambda s: naive_search(ailments, s, args.limit), naive_queries)
+    print(f"\n{'approach':<14} {'queries/s':>12}")
+    print(f"{'naive scan':<14} {naive:>12,.0f}")
+    print(f"{'BM25 index':<14} {indexed:>12,.0f}   ({indexed / naive:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
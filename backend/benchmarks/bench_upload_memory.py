@@ -0,0 +1,122 @@
+"""
+Upload memory benchmark for Healio.AI backend
+
+Starts the API under uvicorn once per upload mode, fires N concurrent
+uploads at POST /upload and reports the server's peak RSS (VmHWM).
+
+Usage:
+    python benchmarks/bench_upload_memory.py [--size-mb 8] [--concurrency 1,4,16]
+
+Linux only (reads /proc/<pid>/status).
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def wait_for_server(port: int, timeout: float = 15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def upload(port: int, payload: bytes, results: list):
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="report.txt"\r\n'
+        f"Content-Type: text/plain\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    conn.putrequest("POST", "/upload")
+    conn.putheader("Content-Type", f"multipart/form-data; boundary={boundary}")
+    conn.putheader("Content-Length", str(len(head) + len(payload) + len(tail)))
+    conn.endheaders()
+    conn.send(head)
+    conn.send(payload)
+    conn.send(tail)
+    results.append(conn.getresponse().status)
+
+
+def run(mode: str, concurrency: int, size_mb: int) -> float:
+    port = free_port()
+    env = dict(
+        os.environ,
+        UPLOAD_MODE=mode,
+        MAX_UPLOAD_SIZE_MB=str(size_mb + 1),
+        UPLOAD_RATE_LIMIT_PER_MINUTE="100000",
+        BACKEND_API_KEY="",
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+             "--port", str(port), "--log-level", "warning"],
+            cwd=workdir, env=env,
+        )
+        try:
+            wait_for_server(port)
+            payload = os.urandom(size_mb * 1024 * 1024)
+            results = []
+            threads = [threading.Thread(target=upload, args=(port, payload, results))
+                       for _ in range(concurrency)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            if results.count(200) != concurrency:
+                print(f"   [WARN] {mode}: statuses {results}")
+            return peak_rss_mb(proc.pid)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--concurrency", default="1,4,16")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    print(f"Peak server RSS uploading {args.size_mb}MB files (MB)")
+    print(f"{'concurrent':>10} {'buffered':>10} {'streaming':>10}")
+    for n in levels:
+        buffered = run("buffered", n, args.size_mb)
+        streaming = run("streaming", n, args.size_mb)
+        print(f"{n:>10} {buffered:>10.1f} {streaming:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
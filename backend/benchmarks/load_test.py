@@ -0,0 +1,168 @@
+"""
+Load test for the production server mode of the Healio.AI backend
+
+Starts `python main.py` with SERVER_MODE=production and WEB_CONCURRENCY set
+to each worker count in turn, drives GET / and POST /upload over keep-alive
+connections from several client processes, and reports requests per second.
+
+Usage:
+    python benchmarks/load_test.py [--workers 1,2,4] [--duration 10] [--connections 64]
+
+Rate limits are raised for the run so that every request reaches the handler.
+The client processes share the machine with the server, so the absolute
+figures understate what a dedicated host would serve; compare them relative
+to each other.
+"""
+
+import argparse
+import asyncio
+import http.client
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_server(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def build_request(endpoint: str, port: int) -> bytes:
+    if endpoint == "/":
+        return f"GET / HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n".encode()
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="report.txt"\r\n'
+        f"Content-Type: text/plain\r\n\r\n"
+        f"blood pressure 120/80\r\n"
+        f"--{boundary}--\r\n"
+    ).encode()
+    head = (
+        f"POST /upload HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Content-Type: multipart/form-data; boundary={boundary}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode()
+    return head + body
+
+
+async def connection_loop(port: int, request: bytes, deadline: float, counts: dict):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head[9:12])
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+            await reader.readexactly(length)
+            counts[status] = counts.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def client_process(port: int, endpoint: str, connections: int, duration: float, results):
+    async def main():
+        counts = {}
+        request = build_request(endpoint, port)
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            connection_loop(port, request, deadline, counts) for _ in range(connections)
+        ))
+        return counts
+
+    results.put(asyncio.run(main()))
+
+
+def drive(port: int, endpoint: str, connections: int, duration: float, clients: int) -> tuple:
+    """Returns (requests_per_second, non-2xx responses)"""
+    results = multiprocessing.Queue()
+    per_client = max(1, connections // clients)
+    procs = [
+        multiprocessing.Process(target=client_process, args=(port, endpoint, per_client, duration, results))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    totals = {}
+    for _ in procs:
+        for status, count in results.get().items():
+            totals[status] = totals.get(status, 0) + count
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - started
+    ok = sum(count for status, count in totals.items() if 200 <= status < 300)
+    return ok / elapsed, sum(totals.values()) - ok
+
+
+def run(workers: int, args) -> dict:
+    port = free_port()
+    workdir = tempfile.mkdtemp(prefix="healio-load-")  # uploads/ lands here
+    env = dict(
+        os.environ,
+        SERVER_MODE="production",
+        WEB_CONCURRENCY=str(workers),
+        HOST="127.0.0.1",
+        PORT=str(port),
+        RATE_LIMIT_PER_MINUTE="100000000",
+        UPLOAD_RATE_LIMIT_PER_MINUTE="100000000",
+        BACKEND_API_KEY="",
+    )
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, "main.py")],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_server(port)
+        drive(port, "/", args.connections, 1.0, args.clients)  # warm up every worker
+        return {
+            endpoint: drive(port, endpoint, args.connections, args.duration, args.clients)
+            for endpoint in ("/", "/upload")
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--clients", type=int, default=max(2, (os.cpu_count() or 2) // 2),
+                        help="client processes generating load")
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'GET / req/s':>14} {'POST /upload req/s':>20} {'errors':>8}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        result = run(workers, args)
+        errors = sum(failed for _, failed in result.values())
+        print(f"{workers:>8} {result['/'][0]:>14.0f} {result['/upload'][0]:>20.0f} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
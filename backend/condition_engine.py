@@ -0,0 +1,166 @@
+"""
+Condition matching for Healio.AI
+
+Turns data/pilot_conditions.json into a sparse condition x symptom-term
+matrix: each row holds TF-IDF weights of the words in a condition's name,
+symptoms_text and match_criteria (symptomWeights give explicit term
+weights, absentSymptoms negative ones), L2-normalized. A symptom vector is
+scored against every condition with one sparse matrix-vector product plus
+a log prevalence prior; a batch of vignettes is one sparse matrix-matrix
+product.
+
+Needs numpy and scipy, which are optional backend dependencies (installed
+in the Docker image); main.py imports this module on first use.
+"""
+
+import json
+import math
+import re
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+# Prior probability of a condition by its `prevalence` label
+PREVALENCE_PRIORS = {
+    "very_rare": 1e-5, "rare": 1e-4, "uncommon": 1e-3, "common": 1e-2, "very_common": 1e-1,
+}
+DEFAULT_PRIOR = 1e-3
+# Weight of a term listed in absentSymptoms ("No nausea"): evidence against the condition
+ABSENT_WEIGHT = -1.0
+# Similarity is at most 1; a tenfold prevalence difference is worth this much of it
+PRIOR_WEIGHT = 0.05
+# Vignettes scored per sparse product in a batch, bounding the dense score block
+BATCH_CHUNK = 2048
+
+_WORD = re.compile(r"[a-z]+")
+_STOPWORDS = {
+    "a", "an", "and", "or", "of", "on", "in", "to", "the", "by", "with", "without", "is", "are",
+    "be", "at", "for", "from", "as", "one", "side", "very", "may", "can", "no", "not", "my", "i",
+}
+
+
+def terms_of(text: str) -> List[str]:
+    """Lowercase words without stopwords and with plural and -ing endings removed"""
+    terms = []
+    for word in _WORD.findall(text.casefold()):
+        if word in _STOPWORDS:
+            continue
+        if word.endswith("ies") and len(word) > 4:
+            word = word[:-3] + "y"
+        elif word.endswith("ing") and len(word) > 5:
+            word = word[:-3]
+        elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+def condition_terms(condition: dict) -> Dict[str, float]:
+    """Raw term weights of one condition: counts, overridden by symptomWeights and absentSymptoms"""
+    criteria = condition.get("match_criteria") or {}
+    weights: Dict[str, float] = {}
+    texts = [condition.get("name", ""), condition.get("symptoms_text", "")]
+    for field in ("locations", "types", "triggers"):
+        texts.extend(criteria.get(field, []))
+    for term in terms_of(" ".join(texts)):
+        weights[term] = weights.get(term, 0.0) + 1.0
+    for phrase, spec in (criteria.get("symptomWeights") or {}).items():
+        weight = spec.get("weight", 1.0) if isinstance(spec, dict) else float(spec)
+        for term in terms_of(phrase):
+            weights[term] = max(weights.get(term, 0.0), weight)
+    for term in terms_of(" ".join(criteria.get("absentSymptoms", []))):
+        weights[term] = ABSENT_WEIGHT
+    return weights
+
+
+class ConditionEngine:
+    """TF-IDF condition x term matrix with log prevalence priors"""
+
+    def __init__(self, conditions: List[dict]):
+        self.conditions = conditions
+        raw = [condition_terms(condition) for condition in conditions]
+        self.vocabulary: Dict[str, int] = {}
+        for weights in raw:
+            for term in weights:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+
+        document_frequency = np.zeros(len(self.vocabulary))
+        for weights in raw:
+            document_frequency[[self.vocabulary[term] for term in weights]] += 1
+        idf = np.log((1 + len(conditions)) / (1 + document_frequency)) + 1
+
+        rows, cols, values = [], [], []
+        for row, weights in enumerate(raw):
+            for term, weight in weights.items():
+                rows.append(row)
+                cols.append(self.vocabulary[term])
+                values.append(weight * idf[self.vocabulary[term]])
+        matrix = sparse.csr_matrix((values, (rows, cols)), shape=(len(conditions), len(self.vocabulary)))
+        norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+        norms[norms == 0] = 1
+        self.matrix = sparse.csr_matrix(sparse.diags(1 / norms) @ matrix)
+        # Term x condition copy, so batches multiply CSR by CSR without a transpose per call
+        self._matrix_t = self.matrix.T.tocsr()
+        self.priors = np.array([
+            PRIOR_WEIGHT * math.log10(PREVALENCE_PRIORS.get(c.get("prevalence"), DEFAULT_PRIOR))
+            for c in conditions
+        ])
+
+    @classmethod
+    def load(cls, path: str) -> "ConditionEngine":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def vectorize(self, vignettes: Sequence[Iterable[str]]) -> sparse.csr_matrix:
+        """One L2-normalized binary term row per vignette (a list of symptom phrases)"""
+        indptr, indices = [0], []
+        for symptoms in vignettes:
+            ids = {self.vocabulary[t] for t in terms_of(" ".join(symptoms)) if t in self.vocabulary}
+            indices.extend(sorted(ids))
+            indptr.append(len(indices))
+        counts = np.diff(indptr)
+        values = np.repeat(1 / np.sqrt(np.maximum(counts, 1)), counts)
+        return sparse.csr_matrix((values, indices, indptr), shape=(len(vignettes), len(self.vocabulary)))
+
+    def scores(self, vignettes: Sequence[Iterable[str]]) -> np.ndarray:
+        """
+        Vignettes x conditions score matrix: cosine similarity plus log prior,
+        and -inf for conditions with no positive evidence in the vignette.
+        """
+        similarity = (self.vectorize(vignettes) @ self._matrix_t).toarray()
+        return np.where(similarity > 0, similarity + self.priors, -np.inf)
+
+    def rank_batch(self, vignettes: Sequence[Iterable[str]], limit: int = 5) -> List[List[Dict[str, object]]]:
+        """
+        Top conditions for each vignette, best first.
+
+        Returns:
+            list: Per vignette, up to `limit` {"code", "name", "score",
+            "severity", "prevalence"} dicts (only conditions with similarity > 0)
+        """
+        ranked = []
+        limit = min(limit, len(self.conditions))
+        for start in range(0, len(vignettes), BATCH_CHUNK):
+            block = self.scores(vignettes[start:start + BATCH_CHUNK])
+            if limit <= 0:
+                ranked.extend([] for _ in block)
+                continue
+            top = np.argpartition(-block, limit - 1, axis=1)[:, :limit]
+            for row, candidates in zip(block, top):
+                order = candidates[np.argsort(-row[candidates], kind="stable")]
+                ranked.append([self._result(i, row[i]) for i in order if row[i] > -np.inf])
+        return ranked
+
+    def rank(self, symptoms: Iterable[str], limit: int = 5) -> List[Dict[str, object]]:
+        return self.rank_batch([list(symptoms)], limit)[0]
+
+    def _result(self, index: int, score: float) -> Dict[str, object]:
+        condition = self.conditions[index]
+        return {
+            "code": condition["code"],
+            "name": condition["name"],
+            "score": round(float(score), 4),
+            "severity": condition.get("severity"),
+            "prevalence": condition.get("prevalence"),
+        }
@@ -0,0 +1,111 @@
+"""
+Drug -> drug class lookup for Healio.AI
+
+data/drug_classes_database.json (written by scripts/scrape_drug_classes.py)
+maps each class to its drugs, e.g. "ACE inhibitors with thiazides" ->
+["hydrochlorothiazide / lisinopril systemic", ...]. This inverts it once
+into a reverse index from normalized drug name to class ids, stored as two
+integer arrays (CSR: the classes of key k are class_ids[offsets[k]:offsets[k + 1]]),
+so resolving a medication is one dict lookup and an array slice instead of
+a scan over every class.
+
+Names are normalized to their active ingredients, sorted and joined with
+" / ", so "Lisinopril / Hydrochlorothiazide" and "hydrochlorothiazide +
+lisinopril" meet the same key; doses, dosage forms and the route
+("systemic", "ophthalmic", ...) are dropped. A route given in the query
+("timolol ophthalmic") narrows the match to that route.
+"""
+
+import json
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ROUTES = ("systemic", "topical", "ophthalmic", "nasal", "otic", "oral", "inhalation", "rectal", "vaginal",
+          "injectable", "intravenous", "transdermal")
+_FORMS = {"tablet", "tablets", "tab", "tabs", "capsule", "capsules", "cap", "caps", "syrup", "suspension",
+          "solution", "injection", "cream", "ointment", "gel", "drops", "drop", "spray", "inhaler", "patch",
+          "er", "xr", "sr", "cr", "la", "dr", "od"}
+_DOSE = re.compile(r"\b\d+(\.\d+)?\s*(mg|mcg|µg|g|ml|iu|units?|%)(\s*/\s*\d*(\.\d+)?\s*(ml|g|hr|h|dose))?\b")
+_COMBINATION = re.compile(r"\s*[/+]\s*")
+# Footer links of drugs.com that the scraper picked up as drugs in some classes
+_SITE_LINKS = {"about drugs.com", "advertising policy", "attribution & citations", "terms of use",
+               "editorial policy", "privacy policy", "help center", "sitemap", "contact us", "accessibility"}
+
+
+def normalize_drug(name: str) -> Tuple[str, Optional[str]]:
+    """("hydrochlorothiazide / lisinopril", "systemic") for "Lisinopril + Hydrochlorothiazide 20mg systemic" """
+    text = _DOSE.sub(" ", name.casefold())
+    route = None
+    ingredients = []
+    for part in _COMBINATION.split(text):
+        words = [w for w in part.replace(",", " ").split() if w not in _FORMS]
+        while words and words[-1] in ROUTES:
+            route = words.pop()
+        if words:
+            ingredients.append(" ".join(words))
+    return " / ".join(sorted(set(ingredients))), route
+
+
+def is_site_link(name: str) -> bool:
+    text = name.strip().casefold()
+    return text in _SITE_LINKS or "drugs.com" in text
+
+
+class DrugClassIndex:
+    """Reverse index: normalized drug name (with and without route) -> class ids"""
+
+    def __init__(self, classes: Dict[str, List[str]]):
+        self.class_names: List[str] = list(classes)
+        by_key: Dict[str, set] = {}
+        for class_id, drugs in enumerate(classes.values()):
+            for drug in drugs:
+                if is_site_link(drug):
+                    continue
+                ingredients, route = normalize_drug(drug)
+                if not ingredients:
+                    continue
+                by_key.setdefault(ingredients, set()).add(class_id)
+                if route:
+                    by_key.setdefault(f"{ingredients} {route}", set()).add(class_id)
+
+        self.keys: List[str] = sorted(by_key)
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+        self.offsets = array("I", [0])
+        self.class_ids = array("H")  # 65k classes is far beyond the ~500 drugs.com lists
+        for key in self.keys:
+            self.class_ids.extend(sorted(by_key[key]))
+            self.offsets.append(len(self.class_ids))
+
+    @classmethod
+    def load(cls, path: str) -> "DrugClassIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def class_ids_of(self, drug: str) -> array:
+        """Class ids of a drug name as typed by a user or prescriber (empty if unknown)"""
+        return self._lookup(*normalize_drug(drug))
+
+    def _lookup(self, ingredients: str, route: Optional[str]) -> array:
+        row = self._rows.get(f"{ingredients} {route}" if route else ingredients)
+        if row is None:
+            return array("H")
+        return self.class_ids[self.offsets[row]:self.offsets[row + 1]]
+
+    def classes_of(self, drug: str) -> List[str]:
+        return [self.class_names[class_id] for class_id in self.class_ids_of(drug)]
+
+    def resolve(self, medications: Iterable[str]) -> List[Dict[str, object]]:
+        """
+        Classes of every medication of a list, in order.
+
+        Returns:
+            list: {"medication", "normalized", "classes"} per medication;
+            "classes" is empty for drugs that are not in the database
+        """
+        results = []
+        for medication in medications:
+            ingredients, route = normalize_drug(medication)
+            results.append({"medication": medication, "normalized": ingredients,
+                            "classes": [self.class_names[c] for c in self._lookup(ingredients, route)]})
+        return results
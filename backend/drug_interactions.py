@@ -0,0 +1,169 @@
+"""
+Class-level drug interaction screening for Healio.AI
+
+data/drug_class_interactions.json lists interacting pairs of drug classes
+(class names as in drug_classes_database.json) with a severity and the
+clinical effect, e.g. "Statins" x "Macrolides": major, rhabdomyolysis. It
+is a screening aid built from standard interaction references, not an
+exhaustive interaction checker.
+
+The pairs are stored as a class x class matrix over the class ids of
+DrugClassIndex:
+
+  - one packed bitset per class (a Python int, bit b set when the class
+    interacts with class b), so screening a list of k medications costs
+    O(k^2) bit tests and needs no numpy;
+  - for cohorts, a numpy uint8 severity matrix (0 = no interaction) over
+    the classes that have interactions, so every pair of every patient is
+    one fancy-indexing lookup and classes without interactions cost
+    nothing. numpy is imported on the first cohort screen only.
+"""
+
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SEVERITIES = ("minor", "moderate", "major")  # severity code = position + 1; 0 is "no interaction"
+# Patients screened per numpy step; bounds the (patients x slot pairs) temporaries
+COHORT_CHUNK = 8192
+
+
+def severity_name(code: int) -> Optional[str]:
+    return SEVERITIES[code - 1] if code else None
+
+
+class InteractionMatrix:
+    """Interacting class pairs as packed bitsets, plus a numpy matrix for cohorts"""
+
+    def __init__(self, class_names: List[str], interactions: List[dict]):
+        self.class_names = class_names
+        ids = {name: class_id for class_id, name in enumerate(class_names)}
+        self.interactions = interactions
+        self._bits: List[int] = [0] * len(class_names)
+        self._rule_of: Dict[Tuple[int, int], int] = {}
+        self._severity_of: Dict[Tuple[int, int], int] = {}
+        for rule_id, interaction in enumerate(interactions):
+            first, second = interaction["classes"]
+            if first not in ids or second not in ids:
+                raise ValueError(f"Unknown drug class in interaction {first!r} x {second!r}")
+            if interaction["severity"] not in SEVERITIES:
+                raise ValueError(f"Unknown severity {interaction['severity']!r} for {first!r} x {second!r}")
+            a, b = ids[first], ids[second]
+            if a == b:
+                raise ValueError(f"Interaction of {first!r} with itself")
+            self._bits[a] |= 1 << b
+            self._bits[b] |= 1 << a
+            pair = (min(a, b), max(a, b))
+            self._rule_of[pair] = rule_id
+            self._severity_of[pair] = SEVERITIES.index(interaction["severity"]) + 1
+        self._matrix = None
+
+    @classmethod
+    def load(cls, path: str, classes_path: str) -> "InteractionMatrix":
+        """Interactions from path, with class ids in the order of drug_classes_database.json"""
+        with open(classes_path, encoding="utf-8") as f:
+            class_names = list(json.load(f))
+        with open(path, encoding="utf-8") as f:
+            return cls(class_names, json.load(f))
+
+    def screen(self, medications: Sequence[Sequence[int]]) -> List[dict]:
+        """
+        Interactions between the medications of one patient.
+
+        Args:
+            medications: class ids of each medication (DrugClassIndex.class_ids_of)
+
+        Returns:
+            list: {"medications": (i, j), "classes", "severity", "effect"} per
+            interacting class pair of two different medications, most severe first
+        """
+        found = []
+        for i in range(len(medications)):
+            for a in medications[i]:
+                bits = self._bits[a]
+                if not bits:
+                    continue
+                for j in range(i + 1, len(medications)):
+                    for b in medications[j]:
+                        if bits >> b & 1:
+                            interaction = self.interactions[self._rule_of[(min(a, b), max(a, b))]]
+                            found.append({"medications": (i, j),
+                                          "classes": (self.class_names[a], self.class_names[b]),
+                                          "severity": interaction["severity"],
+                                          "effect": interaction["effect"]})
+        found.sort(key=lambda hit: -SEVERITIES.index(hit["severity"]))
+        return found
+
+    def cohort_tables(self):
+        """
+        (compact, matrix) for cohort screens: compact maps a class id to its
+        row in matrix, a uint8 severity matrix over only the classes that have
+        interactions; every other class (and padding) maps to the last, empty row.
+        """
+        if self._matrix is None:
+            import numpy as np
+            members = sorted({class_id for pair in self._severity_of for class_id in pair})
+            compact = np.full(len(self.class_names) + 1, len(members), dtype=np.int32)
+            compact[members] = np.arange(len(members))
+            matrix = np.zeros((len(members) + 1,) * 2, dtype=np.uint8)
+            for (a, b), code in self._severity_of.items():
+                matrix[compact[a], compact[b]] = matrix[compact[b], compact[a]] = code
+            self._matrix = compact, matrix
+        return self._matrix
+
+    def pack_cohort(self, patients: Sequence[Sequence[Sequence[int]]]):
+        """
+        Patients' medications as two (patients x slots) int arrays: the compact
+        class in each slot and the medication it came from, so pairs within one
+        medication can be skipped. Classes without interactions are dropped, so
+        slots is the largest number of interacting classes of one patient.
+        """
+        import numpy as np
+        compact, matrix = self.cohort_tables()
+        padding = len(matrix) - 1
+        medication_counts = np.fromiter(map(len, patients), np.int64, len(patients))
+        class_counts = np.fromiter((len(classes) for medications in patients for classes in medications),
+                                   np.int64, int(medication_counts.sum()))
+        classes = compact[np.fromiter((c for medications in patients for classes in medications for c in classes),
+                                      np.int64, int(class_counts.sum()))]
+        medication_of = np.repeat(np.arange(len(class_counts)), class_counts)
+        patient_of = np.repeat(np.repeat(np.arange(len(patients)), medication_counts), class_counts)
+        keep = classes != padding
+        classes, medication_of, patient_of = classes[keep], medication_of[keep], patient_of[keep]
+
+        per_patient = np.bincount(patient_of, minlength=len(patients))
+        column = np.arange(len(classes)) - np.repeat(np.cumsum(per_patient) - per_patient, per_patient)
+        shape = (len(patients), max(int(per_patient.max(initial=0)), 1))
+        class_slots = np.full(shape, padding, dtype=np.int32)
+        medication_slots = np.full(shape, -1, dtype=np.int64)
+        class_slots[patient_of, column] = classes
+        medication_slots[patient_of, column] = medication_of
+        return class_slots, medication_slots
+
+    def screen_cohort(self, patients: Sequence[Sequence[Sequence[int]]]):
+        """
+        Screen many patients at once.
+
+        Args:
+            patients: per patient, the class ids of each medication (as for screen)
+
+        Returns:
+            tuple: numpy arrays (interacting pairs per patient, worst severity
+            code per patient); counts and severities match screen()
+        """
+        return self.screen_packed(*self.pack_cohort(patients))
+
+    def screen_packed(self, class_slots, medication_slots):
+        """screen_cohort on arrays from pack_cohort"""
+        import numpy as np
+        _, matrix = self.cohort_tables()
+        first, second = np.triu_indices(class_slots.shape[1], 1)
+        counts = np.zeros(len(class_slots), dtype=np.int32)
+        worst = np.zeros(len(class_slots), dtype=np.uint8)
+        for start in range(0, len(class_slots), COHORT_CHUNK):
+            classes = class_slots[start:start + COHORT_CHUNK]
+            medications = medication_slots[start:start + COHORT_CHUNK]
+            codes = matrix[classes[:, first], classes[:, second]]
+            codes[medications[:, first] == medications[:, second]] = 0
+            counts[start:start + COHORT_CHUNK] = np.count_nonzero(codes, axis=1)
+            worst[start:start + COHORT_CHUNK] = codes.max(axis=1, initial=0)
+        return counts, worst
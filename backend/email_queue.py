@@ -0,0 +1,274 @@
+"""
+Persistent Email Dispatch Queue for Healio.AI
+
+Email endpoints enqueue a message here and return immediately; a pool of
+asyncio workers drains the queue through EmailService. Messages live in a
+local SQLite file, so they survive restarts and can be shared by several
+worker processes on one host.
+
+Failed sends are retried with exponential backoff. Messages that exhaust
+their attempts are moved to a dead-letter table for inspection.
+
+SQLite calls can wait up to 30 s for another process's write lock, so the
+async API runs them on one dedicated thread and never on the event loop.
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# kind -> coroutine taking the payload as keyword arguments, returning success
+Sender = Callable[..., Awaitable[bool]]
+
+
+class EmailQueue:
+    """SQLite-backed email queue with retrying worker pool and dead-letter store"""
+
+    def __init__(
+        self,
+        path: str,
+        senders: Dict[str, Sender],
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 300.0,
+        lease_seconds: float = 60.0,
+    ):
+        self.senders = senders
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        # A claimed message whose lease expires (crashed worker) becomes claimable again
+        self.lease_seconds = lease_seconds
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        # One thread owns the writes: they are serialized by _lock anyway
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-queue")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS messages (
+                id              TEXT PRIMARY KEY,
+                kind            TEXT NOT NULL,
+                payload         TEXT NOT NULL,
+                status          TEXT NOT NULL,
+                attempts        INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error      TEXT,
+                created_at      REAL NOT NULL
+            )
+            """
+        )
+        # Partial index: sent messages stay around for status lookups but never slow down claiming
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS messages_due ON messages (next_attempt_at) "
+            "WHERE status IN ('pending', 'sending')"
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                id         TEXT PRIMARY KEY,
+                kind       TEXT NOT NULL,
+                payload    TEXT NOT NULL,
+                attempts   INTEGER NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                failed_at  REAL NOT NULL
+            )
+            """
+        )
+
+        # WAL readers never wait for writers, so depth() can answer metrics scrapes on the event loop
+        self._reader_lock = threading.Lock()
+        self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+
+    async def _run(self, fn, *args):
+        """Run a blocking database call on the queue's thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Persist a message and wake a worker. Returns the message id."""
+        if kind not in self.senders:
+            raise ValueError(f"Unknown email kind: {kind}")
+        message_id = uuid.uuid4().hex
+        await self._run(self._insert, message_id, kind, json.dumps(payload))
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return message_id
+
+    def _insert(self, message_id: str, kind: str, payload: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO messages (id, kind, payload, status, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, 'pending', ?, ?)",
+                (message_id, kind, payload, now, now),
+            )
+
+    async def status(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a message: pending, sending, sent or dead"""
+        return await self._run(self._status, message_id)
+
+    def _status(self, message_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, attempts, last_error FROM messages WHERE id = ?", (message_id,)
+            ).fetchone()
+            if row is None:
+                row = self._db.execute(
+                    "SELECT 'dead', attempts, last_error FROM dead_letters WHERE id = ?", (message_id,)
+                ).fetchone()
+        if row is None:
+            return None
+        return {"message_id": message_id, "status": row[0], "attempts": row[1], "last_error": row[2]}
+
+    def depth(self) -> int:
+        """Number of messages not yet sent or dead-lettered"""
+        with self._reader_lock:
+            return self._reader.execute(
+                "SELECT COUNT(*) FROM messages WHERE status IN ('pending', 'sending')"
+            ).fetchone()[0]
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent messages that exhausted their retries"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, kind, attempts, last_error, failed_at FROM dead_letters "
+                "ORDER BY failed_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"message_id": r[0], "kind": r[1], "attempts": r[2], "last_error": r[3], "failed_at": r[4]}
+            for r in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def _claim(self) -> Optional[tuple]:
+        """Atomically lease the next due message, across threads and processes"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id, kind, payload, attempts FROM messages "
+                    "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE messages SET status = 'sending', attempts = attempts + 1, "
+                        "next_attempt_at = ? WHERE id = ?",
+                        (now + self.lease_seconds, row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        message_id, kind, payload, attempts = row
+        return message_id, kind, json.loads(payload), attempts + 1
+
+    def _mark_sent(self, message_id: str):
+        with self._lock:
+            self._db.execute(
+                "UPDATE messages SET status = 'sent', last_error = NULL WHERE id = ?", (message_id,)
+            )
+
+    def _mark_failed(self, message_id: str, attempts: int, error: str):
+        """Schedule a retry with exponential backoff, or dead-letter the message"""
+        now = time.time()
+        with self._lock:
+            if attempts >= self.max_attempts:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO dead_letters "
+                        "SELECT id, kind, payload, ?, ?, created_at, ? FROM messages WHERE id = ?",
+                        (attempts, error, now, message_id),
+                    )
+                    self._db.execute("DELETE FROM messages WHERE id = ?", (message_id,))
+                    self._db.execute("COMMIT")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+                return
+            delay = min(self.retry_base_seconds * (2 ** (attempts - 1)), self.retry_max_seconds)
+            delay *= random.uniform(0.8, 1.2)  # jitter so bursts of failures don't retry in lockstep
+            self._db.execute(
+                "UPDATE messages SET status = 'pending', next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (now + delay, error, message_id),
+            )
+
+    async def _process(self, message_id: str, kind: str, payload: Dict[str, Any], attempts: int):
+        try:
+            ok = await self.senders[kind](**payload)
+            error = None if ok else "Provider rejected or failed the send"
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        if error is None:
+            await self._run(self._mark_sent, message_id)
+        else:
+            print(f"❌ Email {message_id} attempt {attempts} failed: {error}")
+            await self._run(self._mark_failed, message_id, attempts, error)
+
+    async def _worker(self):
+        while not self._stopping:
+            claimed = await self._run(self._claim)
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    # Poll periodically for retries coming due and messages from other processes
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process(*claimed)
+
+    def start(self):
+        """Start the worker pool on the running event loop"""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 30.0):
+        """
+        Stop taking new work and let in-flight sends finish.
+
+        Messages still pending stay in the database for the next start.
+        """
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._tasks:
+            done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        self._tasks = []
+
+    def close(self):
+        self._executor.shutdown()
+        with self._lock:
+            self._db.close()
+        with self._reader_lock:
+            self._reader.close()
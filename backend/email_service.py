@@ -6,23 +6,141 @@ Supports diagnosis results, reminders, and health tips.
 """
 
 import os
-from typing import Optional, Dict, Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from time import perf_counter
+from typing import Optional, Dict, Any, Iterable, List
 from datetime import datetime
 import resend
-from dotenv import load_dotenv
+from email_templates import (
+    SafeHTML, CONDITION_ITEM, DIAGNOSIS_COMPLETE, REMINDER, REMINDER_DETAILS, HEALTH_TIP
+)
+from metrics import EMAIL_SEND_DURATION, EMAIL_SENDS
 
-load_dotenv()
-
-# Configure Resend API
+# Configure Resend API (environment is loaded by main.py before this module is imported)
 resend.api_key = os.getenv("RESEND_API_KEY", "")
 
 # Email configuration
 FROM_EMAIL = os.getenv("FROM_EMAIL", "Healio.AI <notifications@healio.ai>")
 REPLY_TO_EMAIL = os.getenv("REPLY_TO_EMAIL", "support@healio.ai")
 
+# Resend's SDK is synchronous, so sends run on a bounded thread pool off the event loop
+EMAIL_MAX_WORKERS = int(os.getenv("EMAIL_MAX_WORKERS", "8"))
+EMAIL_SEND_TIMEOUT_SECONDS = int(os.getenv("EMAIL_SEND_TIMEOUT_SECONDS", "15"))
+# Resend accepts at most 100 emails per batch call
+EMAIL_BATCH_SIZE = min(int(os.getenv("EMAIL_BATCH_SIZE", "100")), 100)
+
+try:
+    import requests
+    from resend.http_client_requests import RequestsClient
+except ImportError:  # resend < 2.0 has no pluggable HTTP client
+    RequestsClient = None
+
+if RequestsClient is not None:
+    class PooledRequestsClient(RequestsClient):
+        """Resend HTTP client that reuses keep-alive connections instead of reconnecting per send"""
+
+        def __init__(self, timeout: int, pool_size: int):
+            super().__init__(timeout=timeout)
+            self._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+
+        def request(self, method, url, headers, json=None, files=None, data=None):
+            try:
+                resp = self._session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    json=json if data is None and files is None else None,
+                    files=files,
+                    data=data,
+                    timeout=self._timeout,
+                )
+                return resp.content, resp.status_code, resp.headers
+            except requests.RequestException as e:
+                raise RuntimeError(f"Request failed: {e}") from e
+
+    resend.default_http_client = PooledRequestsClient(EMAIL_SEND_TIMEOUT_SECONDS, EMAIL_MAX_WORKERS)
+
+_send_executor = ThreadPoolExecutor(max_workers=EMAIL_MAX_WORKERS, thread_name_prefix="resend")
+
 class EmailService:
     """Service for sending various types of email notifications"""
     
+    @staticmethod
+    async def _call(kind: str, fn, arg) -> Any:
+        """Run a blocking Resend call on the send pool, recording latency and outcome"""
+        loop = asyncio.get_running_loop()
+        start = perf_counter()
+        outcome = "failed"
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(_send_executor, fn, arg),
+                timeout=EMAIL_SEND_TIMEOUT_SECONDS
+            )
+            outcome = "sent"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            EMAIL_SEND_DURATION.observe(perf_counter() - start, kind)
+            EMAIL_SENDS.inc(kind, outcome)
+    
+    @staticmethod
+    async def _send(params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send through Resend without blocking the event loop
+        
+        Raises:
+            asyncio.TimeoutError: if the provider does not answer in EMAIL_SEND_TIMEOUT_SECONDS
+        """
+        return await EmailService._call("single", resend.Emails.send, params)
+    
+    @staticmethod
+    async def _send_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send up to 100 emails in one Resend batch call, off the event loop"""
+        response = await EmailService._call("batch", resend.Batch.send, batch)
+        return response["data"]
+    
+    @staticmethod
+    def build_diagnosis_complete(
+        to_email: str,
+        user_name: str,
+        diagnosis_summary: str,
+        top_conditions: list,
+        consultation_id: str
+    ) -> Dict[str, Any]:
+        """Build Resend params for the diagnosis completion email"""
+        conditions = [
+            CONDITION_ITEM.render(
+                name=cond.get('name', 'Unknown'),
+                confidence=f"{cond.get('confidence', 0):.0f}"
+            )
+            for cond in top_conditions[:3]
+        ]
+        now = datetime.now()
+        html_content, text_content = DIAGNOSIS_COMPLETE.render(
+            user_name=user_name,
+            diagnosis_summary=diagnosis_summary,
+            conditions_html=SafeHTML("".join(html for html, _ in conditions)),
+            conditions_text="".join(text for _, text in conditions),
+            consultation_id=consultation_id,
+            date=now.strftime("%B %d, %Y at %I:%M %p")
+        )
+        
+        return {
+            "from": FROM_EMAIL,
+            "to": [to_email],
+            "subject": f"Your Healio.AI Diagnosis Results - {now.strftime('%b %d, %Y')}",
+            "html": html_content,
+            "text": text_content,
+            "reply_to": REPLY_TO_EMAIL
+        }
+    
     @staticmethod
     async def send_diagnosis_complete(
         to_email: str,
@@ -45,107 +163,10 @@ class EmailService:
             bool: True if email sent successfully
         """
         try:
-            conditions_html = "".join([
-                f"<li style='margin: 8px 0;'><strong>{cond.get('name', 'Unknown')}</strong> "
-                f"({cond.get('confidence', 0):.0f}% match)</li>"
-                for cond in top_conditions[:3]
-            ])
-            
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            </head>
-            <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-                        line-height: 1.6; color: #334155; max-width: 600px; margin: 0 auto; padding: 20px;">
-                
-                <div style="background: linear-gradient(135deg, #0d9488 0%, #06b6d4 100%); 
-                            padding: 30px; border-radius: 12px; text-align: center; margin-bottom: 30px;">
-                    <h1 style="color: white; margin: 0; font-size: 28px;">Healio.AI</h1>
-                    <p style="color: rgba(255,255,255,0.9); margin:10px 0 0 0; font-size: 16px;">
-                        Your Health Diagnosis is Ready
-                    </p>
-                </div>
-                
-                <div style="background: white; padding: 30px; border-radius: 8px; 
-                            box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
-                    
-                    <p style="font-size: 16px; margin-bottom: 20px;">
-                        Hi <strong>{user_name}</strong>,
-                    </p>
-                    
-                    <p style="font-size: 16px; margin-bottom: 20px;">
-                        Your diagnosis consultation has been completed. Here's a summary of our findings:
-                    </p>
-                    
-                    <div style="background: #f8fafc; padding: 20px; border-radius: 8px; 
-                                border-left: 4px solid #0d9488; margin: 20px 0;">
-                        <p style="margin: 0 0 10px 0; font-size: 14px; color: #64748b; font-weight: 600;">
-                            DIAGNOSIS SUMMARY
-                        </p>
-                        <p style="margin: 0; font-size: 16px; color: #1e293b;">
-                            {diagnosis_summary}
-                        </p>
-                    </div>
-                    
-                    <h3 style="color: #1e293b; font-size: 18px; margin: 30px 0 15px 0;">
-                        Top Possible Conditions:
-                    </h3>
-                    <ul style="padding-left: 20px; margin: 0;">
-                        {conditions_html}
-                    </ul>
-                    
-                    <div style="background: #fef3c7; padding: 16px; border-radius: 8px; 
-                                margin: 30px 0; border-left: 4px solid #f59e0b;">
-                        <p style="margin: 0; font-size: 14px; color: #92400e;">
-                            <strong>⚠️ Important:</strong> This is an informational tool and not a substitute 
-                            for professional medical advice. Please consult a healthcare provider for a 
-                            definitive diagnosis and treatment plan.
-                        </p>
-                    </div>
-                    
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="https://healio.ai/dashboard/history" 
-                           style="display: inline-block; background: #0d9488; color: white; 
-                                  padding: 14px 32px; text-decoration: none; border-radius: 8px; 
-                                  font-weight: 600; font-size: 16px;">
-                            View Full Report
-                        </a>
-                    </div>
-                    
-                    <hr style="border: none; border-top: 1px solid #e2e8f0; margin: 30px 0;">
-                    
-                    <p style="font-size: 14px; color: #64748b; margin: 0;">
-                        Consultation ID: {consultation_id}<br>
-                        Date: {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
-                    </p>
-                </div>
-                
-                <div style="text-align: center; margin-top: 30px; padding: 20px; color: #64748b; font-size: 14px;">
-                    <p style="margin: 0 0 10px 0;">
-                        Stay healthy with Healio.AI 🌿
-                    </p>
-                    <p style="margin: 0;">
-                        <a href="https://healio.ai/unsubscribe" style="color: #0d9488;">Unsubscribe</a> | 
-                        <a href="https://healio.ai/help" style="color: #0d9488;">Help</a>
-                    </p>
-                </div>
-                
-            </body>
-            </html>
-            """
-            
-            params = {
-                "from": FROM_EMAIL,
-                "to": [to_email],
-                "subject": f"Your Healio.AI Diagnosis Results - {datetime.now().strftime('%b %d, %Y')}",
-                "html": html_content,
-                "reply_to": REPLY_TO_EMAIL
-            }
-            
-            email = resend.Emails.send(params)
+            params = EmailService.build_diagnosis_complete(
+                to_email, user_name, diagnosis_summary, top_conditions, consultation_id
+            )
+            email = await EmailService._send(params)
             print(f"✅ Diagnosis email sent to {to_email}: {email}")
             return True
             
@@ -153,6 +174,51 @@ class EmailService:
             print(f"❌ Failed to send diagnosis email: {str(e)}")
             return False
     
+    @staticmethod
+    def build_reminder(
+        to_email: str,
+        user_name: str,
+        reminder_type: str,
+        reminder_details: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build Resend params for a medication, appointment or general reminder"""
+        # Build reminder content based on type
+        if reminder_type == "medication":
+            title = "💊 Medication Reminder"
+            details = REMINDER_DETAILS["medication"].render(
+                medicine=reminder_details.get('medicine', 'N/A'),
+                dosage=reminder_details.get('dosage', 'N/A'),
+                time=reminder_details.get('time', 'N/A')
+            )
+        elif reminder_type == "appointment":
+            title = "📅 Appointment Reminder"
+            details = REMINDER_DETAILS["appointment"].render(
+                doctor=reminder_details.get('doctor', 'N/A'),
+                date=reminder_details.get('date', 'N/A'),
+                time=reminder_details.get('time', 'N/A'),
+                location=reminder_details.get('location', 'N/A')
+            )
+        else:
+            title = "🔔 Health Reminder"
+            details = REMINDER_DETAILS["general"].render(
+                message=reminder_details.get('message', 'You have a health reminder.')
+            )
+        
+        html_content, text_content = REMINDER.render(
+            title=title,
+            user_name=user_name,
+            details_html=SafeHTML(details[0]),
+            details_text=details[1]
+        )
+        
+        return {
+            "from": FROM_EMAIL,
+            "to": [to_email],
+            "subject": f"Healio.AI {title}",
+            "html": html_content,
+            "text": text_content
+        }
+    
     @staticmethod
     async def send_reminder(
         to_email: str,
@@ -173,67 +239,10 @@ class EmailService:
             bool: Success status
         """
         try:
-            # Build reminder content based on type
-            if reminder_type == "medication":
-                title = "💊 Medication Reminder"
-                details = f"""
-                <p style="font-size: 16px; margin-bottom: 15px;">
-                    Time to take your medication:
-                </p>
-                <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                    <p style="margin: 5px 0;"><strong>Medicine:</strong> {reminder_details.get('medicine', 'N/A')}</p>
-                    <p style="margin: 5px 0;"><strong>Dosage:</strong> {reminder_details.get('dosage', 'N/A')}</p>
-                    <p style="margin: 5px 0;"><strong>Time:</strong> {reminder_details.get('time', 'N/A')}</p>
-                </div>
-                """
-            elif reminder_type == "appointment":
-                title = "📅 Appointment Reminder"
-                details = f"""
-                <p style="font-size: 16px; margin-bottom: 15px;">
-                    You have an upcoming appointment:
-                </p>
-                <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                    <p style="margin: 5px 0;"><strong>Doctor:</strong> {reminder_details.get('doctor', 'N/A')}</p>
-                    <p style="margin: 5px 0;"><strong>Date:</strong> {reminder_details.get('date', 'N/A')}</p>
-                    <p style="margin: 5px 0;"><strong>Time:</strong> {reminder_details.get('time', 'N/A')}</p>
-                    <p style="margin: 5px 0;"><strong>Location:</strong> {reminder_details.get('location', 'N/A')}</p>
-                </div>
-                """
-            else:
-                title = "🔔 Health Reminder"
-                details = f"<p>{reminder_details.get('message', 'You have a health reminder.')}</p>"
-            
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-            </head>
-            <body style="font-family: sans-serif; line-height: 1.6; color: #334155; max-width: 600px; 
-                        margin: 0 auto; padding: 20px;">
-                <div style="background: #0d9488; padding: 25px; border-radius: 12px; text-align: center;">
-                    <h1 style="color: white; margin: 0; font-size: 24px;">{title}</h1>
-                </div>
-                
-                <div style="background: white; padding: 30px; border-radius: 8px; margin-top: 20px;">
-                    <p>Hi <strong>{user_name}</strong>,</p>
-                    {details}
-                    <p style="font-size: 14px; color: #64748b; margin-top: 30px;">
-                        Take care of your health! 💚
-                    </p>
-                </div>
-            </body>
-            </html>
-            """
-            
-            params = {
-                "from": FROM_EMAIL,
-                "to": [to_email],
-                "subject": f"Healio.AI {title}",
-                "html": html_content
-            }
-            
-            email = resend.Emails.send(params)
+            params = EmailService.build_reminder(
+                to_email, user_name, reminder_type, reminder_details
+            )
+            email = await EmailService._send(params)
             print(f"✅ Reminder email sent to {to_email}")
             return True
             
@@ -241,6 +250,28 @@ class EmailService:
             print(f"❌ Failed to send reminder email: {str(e)}")
             return False
     
+    @staticmethod
+    def build_health_tip(
+        to_email: str,
+        user_name: str,
+        tip_title: str,
+        tip_content: str
+    ) -> Dict[str, Any]:
+        """Build Resend params for the daily health tip email"""
+        html_content, text_content = HEALTH_TIP.render(
+            user_name=user_name,
+            tip_title=tip_title,
+            tip_content=tip_content
+        )
+        
+        return {
+            "from": FROM_EMAIL,
+            "to": [to_email],
+            "subject": f"Your Daily Health Tip: {tip_title}",
+            "html": html_content,
+            "text": text_content
+        }
+    
     @staticmethod
     async def send_health_tip(
         to_email: str,
@@ -250,42 +281,74 @@ class EmailService:
     ) -> bool:
         """Send daily health tip email"""
         try:
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head><meta charset="utf-8"></head>
-            <body style="font-family: sans-serif; line-height: 1.6; color: #334155; max-width: 600px; 
-                        margin: 0 auto; padding: 20px;">
-                <div style="background: linear-gradient(135deg, #10b981 0%, #059669 100%); 
-                            padding: 25px; border-radius: 12px; text-align: center;">
-                    <h1 style="color: white; margin: 0; font-size: 24px;">🌿 Daily Health Tip</h1>
-                </div>
-                
-                <div style="background: white; padding: 30px; border-radius: 8px; margin-top: 20px;">
-                    <p>Hi <strong>{user_name}</strong>,</p>
-                    <h2 style="color: #0d9488; font-size: 20px;">{tip_title}</h2>
-                    <p style="font-size: 16px; line-height: 1.8;">{tip_content}</p>
-                    
-                    <div style="text-align: center; margin-top: 30px;">
-                        <a href="https://healio.ai/tips" style="color: #0d9488; text-decoration: none; font-weight: 600;">
-                            Read More Health Tips →
-                        </a>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            
-            params = {
-                "from": FROM_EMAIL,
-                "to": [to_email],
-                "subject": f"Your Daily Health Tip: {tip_title}",
-                "html": html_content
-            }
-            
-            email = resend.Emails.send(params)
+            params = EmailService.build_health_tip(
+                to_email, user_name, tip_title, tip_content
+            )
+            email = await EmailService._send(params)
             return True
             
         except Exception as e:
             print(f"❌ Failed to send health tip: {str(e)}")
             return False
+    
+    @staticmethod
+    async def send_batch(template_id: str, recipients: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send one template to many recipients using Resend batch calls
+        
+        Recipients are rendered lazily and sent EMAIL_BATCH_SIZE at a time, so
+        only one batch of rendered HTML is held in memory.
+        
+        Args:
+            template_id: Key of BATCH_TEMPLATES (diagnosis, reminder, health_tip)
+            recipients: Keyword arguments for the template's build_* method, one dict per recipient
+            
+        Returns:
+            list: Per-recipient results, {"to_email", "status": "sent", "id"} or
+                  {"to_email", "status": "failed", "error"}, in input order
+        """
+        if template_id not in BATCH_TEMPLATES:
+            raise ValueError(f"Unknown email template: {template_id}")
+        build = BATCH_TEMPLATES[template_id]
+        results: List[Dict[str, Any]] = []
+        
+        async def flush(batch: List[Dict[str, Any]], slots: List[int]):
+            try:
+                sent = await EmailService._send_batch(batch)
+                for slot, email in zip(slots, sent):
+                    results[slot].update(status="sent", id=email.get("id"))
+                if len(sent) != len(slots):
+                    print(f"❌ Email batch of {len(batch)} returned {len(sent)} ids")
+                    for slot in slots[len(sent):]:
+                        results[slot].update(status="failed", error="No id returned for this email")
+            except Exception as e:
+                print(f"❌ Failed to send email batch of {len(batch)}: {str(e)}")
+                for slot in slots:
+                    results[slot].update(status="failed", error="Batch send failed")
+        
+        recipients = iter(recipients)
+        while True:
+            chunk = list(islice(recipients, EMAIL_BATCH_SIZE))
+            if not chunk:
+                break
+            batch, slots = [], []
+            for recipient in chunk:
+                result = {"to_email": recipient.get("to_email"), "status": "pending"}
+                try:
+                    batch.append(build(**recipient))
+                    slots.append(len(results))
+                except Exception as e:
+                    result.update(status="failed", error=f"Could not render email: {str(e)}")
+                results.append(result)
+            if batch:
+                await flush(batch, slots)
+        
+        print(f"✅ Batch '{template_id}': {sum(r['status'] == 'sent' for r in results)}/{len(results)} sent")
+        return results
+
+# Templates available to EmailService.send_batch
+BATCH_TEMPLATES = {
+    "diagnosis": EmailService.build_diagnosis_complete,
+    "reminder": EmailService.build_reminder,
+    "health_tip": EmailService.build_health_tip,
+}
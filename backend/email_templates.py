@@ -0,0 +1,323 @@
+"""
+Email Templates for Healio.AI
+
+Templates are compiled once at import into render functions that join
+static chunks with field values. Every field is HTML-escaped unless
+it is passed as SafeHTML (markup this module rendered itself). Each email
+has a plain-text alternative compiled the same way.
+
+Placeholders use {{ field_name }}.
+"""
+
+import html
+import re
+from typing import Tuple
+
+_FIELD = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+
+
+class SafeHTML(str):
+    """Already-escaped markup that templates insert verbatim"""
+
+
+_NEEDS_ESCAPE = re.compile(r"[&<>\"']")
+
+
+def _escape(value) -> str:
+    if isinstance(value, SafeHTML):
+        return value
+    value = str(value)
+    # Most fields (names, doses, times) contain nothing to escape; skip the five replace passes
+    return html.escape(value) if _NEEDS_ESCAPE.search(value) else value
+
+
+class CompiledTemplate:
+    """
+    A template compiled once into a Python function.
+
+    The source is split into static chunks and field slots, and a render
+    function joining them is generated with exec, so rendering costs about
+    the same as a hand-written f-string plus escaping.
+    """
+
+    __slots__ = ("fields", "render")
+
+    def __init__(self, source: str, escape: bool = True):
+        if escape:
+            # Static HTML as pure ASCII (emoji become character references) keeps the
+            # final join in CPython's compact 1-byte string form for ASCII user data
+            source = source.encode("ascii", "xmlcharrefreplace").decode("ascii")
+        namespace = {"_convert": _escape if escape else str}
+        pieces = []
+        fields = []
+        position = 0
+        for match in _FIELD.finditer(source):
+            namespace[f"_p{len(pieces)}"] = source[position:match.start()]
+            pieces.append(f"_p{len(pieces)}")
+            pieces.append(f"_convert({match.group(1)})")
+            if match.group(1) not in fields:
+                fields.append(match.group(1))
+            position = match.end()
+        namespace[f"_p{len(pieces)}"] = source[position:]
+        pieces.append(f"_p{len(pieces)}")
+
+        params = "".join(f"{name}, " for name in fields)
+        exec(f"def render(*, {params}**_):\n    return ''.join(({', '.join(pieces)},))", namespace)
+        self.fields = frozenset(fields)
+        # render(**fields) -> str; extra fields are ignored, missing ones raise TypeError
+        self.render = namespace["render"]
+
+
+class EmailTemplate:
+    """HTML body and plain-text alternative of one email"""
+
+    __slots__ = ("html", "text")
+
+    def __init__(self, html_source: str, text_source: str):
+        self.html = CompiledTemplate(html_source)
+        self.text = CompiledTemplate(text_source, escape=False)
+
+    def render(self, **fields) -> Tuple[str, str]:
+        """Returns (html, text)"""
+        return self.html.render(**fields), self.text.render(**fields)
+
+
+# ---------------------------------------------------------------------------
+# Shared static fragments
+# ---------------------------------------------------------------------------
+
+_DOCUMENT_START = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+"""
+
+_BODY_START = """<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6; color: #334155; max-width: 600px; margin: 0 auto; padding: 20px;">
+"""
+
+_FOOTER = """
+    <div style="text-align: center; margin-top: 30px; padding: 20px; color: #64748b; font-size: 14px;">
+        <p style="margin: 0 0 10px 0;">
+            Stay healthy with Healio.AI 🌿
+        </p>
+        <p style="margin: 0;">
+            <a href="https://healio.ai/unsubscribe" style="color: #0d9488;">Unsubscribe</a> |
+            <a href="https://healio.ai/help" style="color: #0d9488;">Help</a>
+        </p>
+    </div>
+"""
+
+_DOCUMENT_END = """
+</body>
+</html>
+"""
+
+_TEXT_FOOTER = """
+--
+Stay healthy with Healio.AI
+Unsubscribe: https://healio.ai/unsubscribe
+Help: https://healio.ai/help
+"""
+
+# ---------------------------------------------------------------------------
+# Diagnosis complete
+# ---------------------------------------------------------------------------
+
+CONDITION_ITEM = EmailTemplate(
+    "<li style='margin: 8px 0;'><strong>{{ name }}</strong> ({{ confidence }}% match)</li>",
+    "- {{ name }} ({{ confidence }}% match)\n",
+)
+
+DIAGNOSIS_COMPLETE = EmailTemplate(
+    _DOCUMENT_START + _BODY_START + """
+    <div style="background: linear-gradient(135deg, #0d9488 0%, #06b6d4 100%);
+                padding: 30px; border-radius: 12px; text-align: center; margin-bottom: 30px;">
+        <h1 style="color: white; margin: 0; font-size: 28px;">Healio.AI</h1>
+        <p style="color: rgba(255,255,255,0.9); margin:10px 0 0 0; font-size: 16px;">
+            Your Health Diagnosis is Ready
+        </p>
+    </div>
+
+    <div style="background: white; padding: 30px; border-radius: 8px;
+                box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
+
+        <p style="font-size: 16px; margin-bottom: 20px;">
+            Hi <strong>{{ user_name }}</strong>,
+        </p>
+
+        <p style="font-size: 16px; margin-bottom: 20px;">
+            Your diagnosis consultation has been completed. Here's a summary of our findings:
+        </p>
+
+        <div style="background: #f8fafc; padding: 20px; border-radius: 8px;
+                    border-left: 4px solid #0d9488; margin: 20px 0;">
+            <p style="margin: 0 0 10px 0; font-size: 14px; color: #64748b; font-weight: 600;">
+                DIAGNOSIS SUMMARY
+            </p>
+            <p style="margin: 0; font-size: 16px; color: #1e293b;">
+                {{ diagnosis_summary }}
+            </p>
+        </div>
+
+        <h3 style="color: #1e293b; font-size: 18px; margin: 30px 0 15px 0;">
+            Top Possible Conditions:
+        </h3>
+        <ul style="padding-left: 20px; margin: 0;">
+            {{ conditions_html }}
+        </ul>
+
+        <div style="background: #fef3c7; padding: 16px; border-radius: 8px;
+                    margin: 30px 0; border-left: 4px solid #f59e0b;">
+            <p style="margin: 0; font-size: 14px; color: #92400e;">
+                <strong>⚠️ Important:</strong> This is an informational tool and not a substitute
+                for professional medical advice. Please consult a healthcare provider for a
+                definitive diagnosis and treatment plan.
+            </p>
+        </div>
+
+        <div style="text-align: center; margin: 30px 0;">
+            <a href="https://healio.ai/dashboard/history"
+               style="display: inline-block; background: #0d9488; color: white;
+                      padding: 14px 32px; text-decoration: none; border-radius: 8px;
+                      font-weight: 600; font-size: 16px;">
+                View Full Report
+            </a>
+        </div>
+
+        <hr style="border: none; border-top: 1px solid #e2e8f0; margin: 30px 0;">
+
+        <p style="font-size: 14px; color: #64748b; margin: 0;">
+            Consultation ID: {{ consultation_id }}<br>
+            Date: {{ date }}
+        </p>
+    </div>
+""" + _FOOTER + _DOCUMENT_END,
+    """Hi {{ user_name }},
+
+Your diagnosis consultation has been completed. Here's a summary of our findings:
+
+DIAGNOSIS SUMMARY
+{{ diagnosis_summary }}
+
+Top Possible Conditions:
+{{ conditions_text }}
+Important: This is an informational tool and not a substitute for professional
+medical advice. Please consult a healthcare provider for a definitive diagnosis
+and treatment plan.
+
+View Full Report: https://healio.ai/dashboard/history
+
+Consultation ID: {{ consultation_id }}
+Date: {{ date }}
+""" + _TEXT_FOOTER,
+)
+
+# ---------------------------------------------------------------------------
+# Reminders
+# ---------------------------------------------------------------------------
+
+REMINDER_DETAILS = {
+    "medication": EmailTemplate(
+        """
+        <p style="font-size: 16px; margin-bottom: 15px;">
+            Time to take your medication:
+        </p>
+        <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
+            <p style="margin: 5px 0;"><strong>Medicine:</strong> {{ medicine }}</p>
+            <p style="margin: 5px 0;"><strong>Dosage:</strong> {{ dosage }}</p>
+            <p style="margin: 5px 0;"><strong>Time:</strong> {{ time }}</p>
+        </div>
+        """,
+        """Time to take your medication:
+
+Medicine: {{ medicine }}
+Dosage: {{ dosage }}
+Time: {{ time }}
+""",
+    ),
+    "appointment": EmailTemplate(
+        """
+        <p style="font-size: 16px; margin-bottom: 15px;">
+            You have an upcoming appointment:
+        </p>
+        <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin: 15px 0;">
+            <p style="margin: 5px 0;"><strong>Doctor:</strong> {{ doctor }}</p>
+            <p style="margin: 5px 0;"><strong>Date:</strong> {{ date }}</p>
+            <p style="margin: 5px 0;"><strong>Time:</strong> {{ time }}</p>
+            <p style="margin: 5px 0;"><strong>Location:</strong> {{ location }}</p>
+        </div>
+        """,
+        """You have an upcoming appointment:
+
+Doctor: {{ doctor }}
+Date: {{ date }}
+Time: {{ time }}
+Location: {{ location }}
+""",
+    ),
+    "general": EmailTemplate(
+        "<p>{{ message }}</p>",
+        "{{ message }}\n",
+    ),
+}
+
+REMINDER = EmailTemplate(
+    _DOCUMENT_START + _BODY_START + """
+    <div style="background: #0d9488; padding: 25px; border-radius: 12px; text-align: center;">
+        <h1 style="color: white; margin: 0; font-size: 24px;">{{ title }}</h1>
+    </div>
+
+    <div style="background: white; padding: 30px; border-radius: 8px; margin-top: 20px;">
+        <p>Hi <strong>{{ user_name }}</strong>,</p>
+        {{ details_html }}
+        <p style="font-size: 14px; color: #64748b; margin-top: 30px;">
+            Take care of your health! 💚
+        </p>
+    </div>
+""" + _DOCUMENT_END,
+    """{{ title }}
+
+Hi {{ user_name }},
+
+{{ details_text }}
+Take care of your health!
+""",
+)
+
+# ---------------------------------------------------------------------------
+# Health tip
+# ---------------------------------------------------------------------------
+
+HEALTH_TIP = EmailTemplate(
+    _DOCUMENT_START + _BODY_START + """
+    <div style="background: linear-gradient(135deg, #10b981 0%, #059669 100%);
+                padding: 25px; border-radius: 12px; text-align: center;">
+        <h1 style="color: white; margin: 0; font-size: 24px;">🌿 Daily Health Tip</h1>
+    </div>
+
+    <div style="background: white; padding: 30px; border-radius: 8px; margin-top: 20px;">
+        <p>Hi <strong>{{ user_name }}</strong>,</p>
+        <h2 style="color: #0d9488; font-size: 20px;">{{ tip_title }}</h2>
+        <p style="font-size: 16px; line-height: 1.8;">{{ tip_content }}</p>
+
+        <div style="text-align: center; margin-top: 30px;">
+            <a href="https://healio.ai/tips" style="color: #0d9488; text-decoration: none; font-weight: 600;">
+                Read More Health Tips →
+            </a>
+        </div>
+    </div>
+""" + _DOCUMENT_END,
+    """Daily Health Tip
+
+Hi {{ user_name }},
+
+{{ tip_title }}
+
+{{ tip_content }}
+
+Read More Health Tips: https://healio.ai/tips
+""",
+)
@@ -0,0 +1,320 @@
+"""
+Typo-tolerant medicine name search for Healio.AI
+
+Query words are matched against the vocabulary of words used in medicine
+names: a trigram inverted index proposes candidate words, and a bounded
+Damerau-Levenshtein distance confirms them. Names containing a match for
+every query word are ranked by total edit distance, then by length.
+
+The index is built by scripts/build_unified_database.py and saved next to
+the database as JSON with base64-encoded integer arrays. The server only
+decodes it at startup and never tokenizes the 250k names itself.
+"""
+
+import base64
+import heapq
+import json
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FORMAT_VERSION = 1
+
+# Letters and digits; punctuation, spaces and "_" separate words
+_WORD = re.compile(r"[^\W_]+")
+
+# Proposals per query word that are checked with the edit distance
+MAX_VERIFIED_CANDIDATES = 200
+
+
+def words_of(text: str) -> List[str]:
+    return _WORD.findall(text.casefold())
+
+
+def max_distance(word: str) -> int:
+    """Edits tolerated for a query word: none for short words and numbers (doses)"""
+    if len(word) <= 3 or any(c.isdigit() for c in word):
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+
+def trigrams(word: str) -> List[str]:
+    padded = f"${word}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def bounded_distance(a: str, b: str, bound: int) -> int:
+    """
+    Optimal string alignment distance, or bound + 1 once it must exceed bound.
+
+    Shared prefixes and suffixes are trimmed first and only the diagonal band
+    of width 2 * bound + 1 is computed, so typical typo checks touch a few
+    dozen cells.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    start = 0
+    shortest = min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return max(len(a), len(b))
+
+    over = bound + 1
+    width = len(b)
+    previous2: List[int] = []
+    previous = [j if j <= bound else over for j in range(width + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (width + 1)
+        if i <= bound:
+            current[0] = i
+        row_min = current[0]
+        ai = a[i - 1]
+        for j in range(max(1, i - bound), min(width, i + bound) + 1):
+            value = previous[j - 1] + (ai != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and ai == b[j - 2] and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > bound:
+            return over
+        previous2, previous = previous, current
+    return min(previous[width], over)
+
+
+def _encode(values: array) -> str:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(text: str, typecode: str = "I") -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def _csr(postings: Iterable[Iterable[int]]) -> Tuple[array, array]:
+    """Posting lists as (offsets, ids): list k is ids[offsets[k]:offsets[k + 1]]"""
+    offsets = array("I", [0])
+    ids = array("I")
+    for posting in postings:
+        ids.extend(posting)
+        offsets.append(len(ids))
+    return offsets, ids
+
+
+class FuzzyIndex:
+    """
+    Word-level trigram index over every medicine name.
+
+    Name ids are assigned in rank order (shorter names first, then
+    alphabetical), so every posting list is already sorted by rank and a
+    search can stop after the first `limit` names at the best distance.
+    Word ids are assigned by word length, so the part of a trigram posting
+    list with usable lengths is found by binary search before counting.
+    """
+
+    def __init__(self, categories: List[str], names: List[str], name_categories: array,
+                 words: List[str], word_offsets: array, word_names: array,
+                 trigram_keys: List[str], trigram_offsets: array, trigram_words: array):
+        self.categories = categories
+        self.names = names
+        self.name_categories = name_categories
+        self.words = words
+        self.word_offsets = word_offsets
+        self.word_names = word_names
+        self.trigram_offsets = trigram_offsets
+        self.trigram_words = trigram_words
+        self._word_ids = {word: i for i, word in enumerate(words)}
+        # _length_starts[n] = first word id with at least n characters
+        self._length_starts = array("I")
+        for word_id, word in enumerate(words):
+            while len(self._length_starts) <= len(word):
+                self._length_starts.append(word_id)
+        self._trigram_ids = {trigram: i for i, trigram in enumerate(trigram_keys)}
+        self._trigram_keys = trigram_keys
+
+    # -- building and storage ------------------------------------------------
+
+    @classmethod
+    def build(cls, database: Dict[str, Dict[str, List[str]]]) -> "FuzzyIndex":
+        """Build from the {category: {letter: [names]}} layout of the unified database"""
+        categories = list(database)
+        entries = sorted(
+            {(len(name.strip()), name.strip().casefold(), name.strip(), c)
+             for c, letters in enumerate(database.values())
+             for bucket in letters.values() for name in bucket if name.strip()}
+        )
+        names = [name for _, _, name, _ in entries]
+        name_categories = array("B", (c for _, _, _, c in entries))
+
+        word_postings: Dict[str, List[int]] = {}
+        for name_id, name in enumerate(names):
+            for word in set(words_of(name)):
+                word_postings.setdefault(word, []).append(name_id)
+        words = sorted(word_postings, key=lambda word: (len(word), word))
+        word_offsets, word_names = _csr(word_postings[word] for word in words)
+
+        trigram_postings: Dict[str, List[int]] = {}
+        for word_id, word in enumerate(words):
+            for trigram in set(trigrams(word)):
+                trigram_postings.setdefault(trigram, []).append(word_id)
+        trigram_keys = sorted(trigram_postings)
+        trigram_offsets, trigram_words = _csr(trigram_postings[t] for t in trigram_keys)
+
+        return cls(categories, names, name_categories, words, word_offsets, word_names,
+                   trigram_keys, trigram_offsets, trigram_words)
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "format": FORMAT_VERSION,
+                "categories": self.categories,
+                "names": self.names,
+                "name_categories": _encode(self.name_categories),
+                "words": self.words,
+                "word_offsets": _encode(self.word_offsets),
+                "word_names": _encode(self.word_names),
+                "trigrams": self._trigram_keys,
+                "trigram_offsets": _encode(self.trigram_offsets),
+                "trigram_words": _encode(self.trigram_words),
+            }, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "FuzzyIndex":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported fuzzy index format {data.get('format')}; rebuild it")
+        return cls(
+            data["categories"], data["names"], _decode(data["name_categories"], "B"),
+            data["words"], _decode(data["word_offsets"]), _decode(data["word_names"]),
+            data["trigrams"], _decode(data["trigram_offsets"]), _decode(data["trigram_words"]),
+        )
+
+    # -- querying ------------------------------------------------------------
+
+    def match_word(self, query_word: str) -> Dict[int, int]:
+        """Vocabulary word ids within max_distance of query_word -> their distance"""
+        bound = max_distance(query_word)
+        exact = self._word_ids.get(query_word)
+        if bound == 0:
+            return {} if exact is None else {exact: 0}
+
+        grams = set(trigrams(query_word))
+        shortest = self._word_id_at_length(len(query_word) - bound)
+        past_longest = self._word_id_at_length(len(query_word) + bound + 1)
+        ids, offsets = self.trigram_words, self.trigram_offsets
+        postings = []
+        for trigram in grams:
+            slot = self._trigram_ids.get(trigram)
+            if slot is not None:
+                start = bisect_left(ids, shortest, offsets[slot], offsets[slot + 1])
+                postings.append(ids[start:bisect_left(ids, past_longest, start, offsets[slot + 1])])
+        # Each edit changes at most 3 trigrams; always require at least one shared trigram
+        needed = max(1, len(grams) - 3 * bound)
+        shared = Counter(chain.from_iterable(postings))
+        candidates = [word_id for word_id, count in shared.items() if count >= needed]
+        if len(candidates) > MAX_VERIFIED_CANDIDATES:
+            candidates.sort(key=shared.__getitem__, reverse=True)
+            del candidates[MAX_VERIFIED_CANDIDATES:]
+        matches = {} if exact is None else {exact: 0}
+        words = self.words
+        for word_id in candidates:
+            if word_id != exact:
+                distance = bounded_distance(query_word, words[word_id], bound)
+                if distance <= bound:
+                    matches[word_id] = distance
+        return matches
+
+    def _word_id_at_length(self, length: int) -> int:
+        if length < 0:
+            return 0
+        if length >= len(self._length_starts):
+            return len(self.words)
+        return self._length_starts[length]
+
+    def _names_of(self, word_id: int) -> array:
+        return self.word_names[self.word_offsets[word_id]:self.word_offsets[word_id + 1]]
+
+    def _other_words_distance(self, name_id: int, others: List[Dict[int, int]]) -> Optional[int]:
+        """Summed best distance of the remaining query words within one name, None if one is missing"""
+        name_words = [self._word_ids.get(word) for word in words_of(self.names[name_id])]
+        total = 0
+        for match in others:
+            found = [match[w] for w in name_words if w in match]
+            if not found:
+                return None
+            total += min(found)
+        return total
+
+    def search(self, query: str, category: Optional[str] = None,
+               limit: int = 10) -> List[Dict[str, object]]:
+        """
+        Names matching every word of `query` within a small edit distance.
+
+        Returns:
+            list: Up to `limit` {"name", "category", "distance"} dicts, best first
+
+        Raises:
+            KeyError: if category is not in the index
+        """
+        query_words = words_of(query)
+        if not query_words or limit <= 0:
+            return []
+        if category is not None and category not in self.categories:
+            raise KeyError(category)
+        category_id = self.categories.index(category) if category else None
+
+        matches = [self.match_word(word) for word in query_words]
+        if not all(matches):
+            return []
+        # Drive the scan from the query word whose matches cover the fewest names
+        order = sorted(range(len(matches)), key=lambda k: sum(
+            self.word_offsets[w + 1] - self.word_offsets[w] for w in matches[k]))
+        driver, others = matches[order[0]], [matches[k] for k in order[1:]]
+
+        best: List[Tuple[int, int]] = []  # max-heap of (-distance, -name_id), at most limit entries
+        seen = set()
+        for distance in sorted(set(driver.values())):
+            if len(best) == limit and -best[0][0] < distance:
+                break  # remaining names can't rank higher
+            postings = [self._names_of(w) for w, d in driver.items() if d == distance]
+            for name_id in heapq.merge(*postings):
+                if len(best) == limit and (-best[0][0], -best[0][1]) < (distance, name_id):
+                    break  # ids ascend within this distance, so the rest rank lower
+                if name_id in seen or (category_id is not None and self.name_categories[name_id] != category_id):
+                    continue
+                seen.add(name_id)
+                extra = self._other_words_distance(name_id, others) if others else 0
+                if extra is None:
+                    continue
+                entry = (-(distance + extra), -name_id)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+
+        return [
+            {"name": self.names[-neg_id], "category": self.categories[self.name_categories[-neg_id]],
+             "distance": -neg_total}
+            for neg_total, neg_id in sorted(best, reverse=True)
+        ]
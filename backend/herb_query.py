@@ -0,0 +1,224 @@
+"""
+Ayurvedic herb property filters for Healio.AI
+
+The categorical fields of data/ayurvedic/herbs.json (rasa, guna, virya,
+vipaka, dosha_effect, parts_used) are free text such as "Ushna (Hot
+potency)" or "Reduces Vata and Kapha; increases Pitta". They are parsed
+into canonical values once, and every value becomes a bitset over herb ids
+(a Python int, bit i = herb i). A filter like "Ushna virya AND Tikta rasa
+AND balances Kapha" is then a few big-integer ANDs/ORs, and a facet count
+is a popcount, no matter how many thousands of herbs are loaded.
+"""
+
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+FACETS = ("rasa", "guna", "virya", "vipaka", "dosha_effect", "parts_used")
+
+try:
+    popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def popcount(bits: int) -> int:
+        return bin(bits).count("1")
+
+_NOTE = re.compile(r"\s[—–-]\s")
+
+
+class _Vocabulary:
+    """Canonical values and the words that name them, matched by one compiled regex"""
+
+    def __init__(self, names: Dict[str, tuple]):
+        self.values = list(names)
+        self._words = {word: value for value, words in names.items() for word in words}
+        self._pattern = re.compile(
+            r"\b(" + "|".join(sorted(map(re.escape, self._words), key=len, reverse=True)) + r")\b")
+
+    def mentions(self, text: str) -> List[str]:
+        """Canonical values whose words appear in text, outside notes after a dash"""
+        found = {self._words[word] for word in self._pattern.findall(_NOTE.split(text.casefold())[0])}
+        return [value for value in self.values if value in found]
+
+
+# Canonical value -> words that name it (Sanskrit first, then English)
+RASAS = _Vocabulary({
+    "Madhura": ("madhura", "sweet"), "Amla": ("amla", "sour"), "Lavana": ("lavana", "salt", "salty"),
+    "Katu": ("katu", "pungent"), "Tikta": ("tikta", "bitter"), "Kashaya": ("kashaya", "astringent"),
+})
+GUNAS = _Vocabulary({
+    "Guru": ("guru", "heavy"), "Laghu": ("laghu", "light"), "Snigdha": ("snigdha", "unctuous", "oily"),
+    "Ruksha": ("ruksha", "dry"), "Sheeta": ("sheeta", "cool", "cold"), "Ushna": ("ushna", "hot"),
+    "Tikshna": ("tikshna", "sharp"), "Manda": ("manda", "dull", "slow"), "Mridu": ("mridu", "soft"),
+    "Kathina": ("kathina", "hard"), "Sthira": ("sthira", "stable"), "Sara": ("sara", "mobile"),
+    "Sukshma": ("sukshma", "subtle"), "Sthula": ("sthula", "gross"), "Vishada": ("vishada", "clear"),
+    "Picchila": ("picchila", "slimy"), "Shlakshna": ("shlakshna", "smooth"), "Khara": ("khara", "rough"),
+})
+VIRYAS = _Vocabulary({"Ushna": ("ushna", "hot", "heating"), "Sheeta": ("sheeta", "cold", "cool", "cooling")})
+VIPAKAS = _Vocabulary({"Madhura": ("madhura", "sweet"), "Amla": ("amla", "sour"), "Katu": ("katu", "pungent")})
+DOSHAS = ("Vata", "Pitta", "Kapha")
+PARTS = _Vocabulary({
+    "Root": ("root", "roots"), "Rhizome": ("rhizome", "rhizomes"), "Tuber": ("tuber", "tubers"),
+    "Leaf": ("leaf", "leaves"), "Seed": ("seed", "seeds"), "Fruit": ("fruit", "fruits"),
+    "Bark": ("bark",), "Flower": ("flower", "flowers"), "Stem": ("stem", "stems"),
+    "Whole plant": ("whole plant",), "Oil": ("oil",), "Gum": ("gum", "resin"), "Latex": ("latex",),
+})
+
+_BALANCES = re.compile(r"\b(balanc|reduc|pacif|alleviat|decreas|calm)")
+_AGGRAVATES = re.compile(r"\b(increas|aggravat|provok|vitiat)")
+
+
+def parse_rasa(values: Iterable[str]) -> List[str]:
+    found = set()
+    for text in values:
+        if re.search(r"\ball (6|six)\b", text.casefold()):
+            excluded = RASAS.mentions(text.casefold().partition("except")[2])
+            found.update(rasa for rasa in RASAS.values if rasa not in excluded)
+        else:
+            found.update(RASAS.mentions(text))
+    return [rasa for rasa in RASAS.values if rasa in found]
+
+
+def parse_dosha_effect(text: str) -> List[str]:
+    """"Reduces Vata and Kapha; may increase Pitta" -> ["Balances Vata", "Balances Kapha", "Aggravates Pitta"]"""
+    effects = []
+    for clause in re.split(r"[;—–]", text.casefold()):
+        verb = "Balances" if _BALANCES.search(clause) else "Aggravates" if _AGGRAVATES.search(clause) else None
+        if verb is None:
+            continue  # e.g. "especially good for Pitta"
+        named = [dosha for dosha in DOSHAS if dosha.casefold() in clause]
+        if "all three" in clause or "tridosh" in clause:
+            named = list(DOSHAS)
+        effects.extend(f"{verb} {dosha}" for dosha in named if f"{verb} {dosha}" not in effects)
+    return effects
+
+
+def parse_parts(values: Iterable[str]) -> List[str]:
+    found = []
+    for text in values:
+        outside_brackets = re.sub(r"\(.*?\)", "", text)
+        matched = PARTS.mentions(outside_brackets) or [outside_brackets.strip().capitalize()]
+        found.extend(part for part in matched if part and part not in found)
+    return found
+
+
+def _as_list(value) -> List[str]:
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def herb_facets(herb: dict) -> Dict[str, List[str]]:
+    """Canonical values of every facet of one herb record"""
+    return {
+        "rasa": parse_rasa(_as_list(herb.get("rasa"))),
+        "guna": [g for text in _as_list(herb.get("guna")) for g in GUNAS.mentions(text)],
+        "virya": [v for text in _as_list(herb.get("virya")) for v in VIRYAS.mentions(text)],
+        "vipaka": [v for text in _as_list(herb.get("vipaka")) for v in VIPAKAS.mentions(text)],
+        "dosha_effect": [e for text in _as_list(herb.get("dosha_effect")) for e in parse_dosha_effect(text)],
+        "parts_used": parse_parts(_as_list(herb.get("parts_used"))),
+    }
+
+
+class HerbQueryEngine:
+    """Per-facet, per-value bitsets over the herbs of herbs.json"""
+
+    def __init__(self, herbs: List[dict]):
+        self.herbs = herbs
+        self.all = (1 << len(herbs)) - 1
+        # Set bits in bytearrays and convert each to an int once, instead of growing ints herb by herb
+        bitmaps: Dict[str, Dict[str, bytearray]] = {facet: {} for facet in FACETS}
+        for herb_id, herb in enumerate(herbs):
+            for facet, values in herb_facets(herb).items():
+                for value in values:
+                    bitmap = bitmaps[facet].get(value)
+                    if bitmap is None:
+                        bitmap = bitmaps[facet][value] = bytearray(len(herbs) // 8 + 1)
+                    bitmap[herb_id >> 3] |= 1 << (herb_id & 7)
+        self.bitsets: Dict[str, Dict[str, int]] = {
+            facet: {value: int.from_bytes(bitmap, "little") for value, bitmap in values.items()}
+            for facet, values in bitmaps.items()
+        }
+        # Case-insensitive lookup of the canonical values ("tikta" -> "Tikta")
+        self._values = {facet: {value.casefold(): value for value in values}
+                        for facet, values in self.bitsets.items()}
+
+    @classmethod
+    def load(cls, path: str) -> "HerbQueryEngine":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def value_bits(self, facet: str, value: str) -> int:
+        """
+        Raises:
+            KeyError: if facet is not one of FACETS
+        """
+        canonical = self._values[facet].get(value.strip().casefold())
+        return self.bitsets[facet][canonical] if canonical else 0
+
+    def select(self, filters: Dict[str, List[str]], match: str = "any",
+               skip: Optional[str] = None) -> int:
+        """
+        Bitset of the herbs passing every facet filter (facets are ANDed).
+
+        Within one facet the values are ORed (match="any") or ANDed
+        (match="all"). `skip` leaves one facet out, for its facet counts.
+        """
+        selected = self.all
+        for facet, values in filters.items():
+            if facet == skip or not values:
+                continue
+            bits = [self.value_bits(facet, value) for value in values]
+            if match == "all":
+                for value_bits in bits:
+                    selected &= value_bits
+            else:
+                union = 0
+                for value_bits in bits:
+                    union |= value_bits
+                selected &= union
+        return selected
+
+    def facet_counts(self, filters: Dict[str, List[str]], match: str = "any") -> Dict[str, Dict[str, int]]:
+        """
+        For every facet value, how many herbs the filters would return with it selected.
+
+        A facet's own filter is left out of its counts (when match="any"), so
+        a UI can show how many herbs each alternative value would add.
+        """
+        counts = {}
+        for facet, values in self.bitsets.items():
+            base = self.select(filters, match, skip=facet if match == "any" else None)
+            counts[facet] = {value: popcount(bits & base) for value, bits in sorted(values.items())}
+        return counts
+
+    def query(self, filters: Dict[str, List[str]], match: str = "any",
+              offset: int = 0, limit: int = 50) -> Dict[str, object]:
+        """
+        Herbs matching the filters, their total, and facet counts.
+
+        Args:
+            filters: {facet: [values]}; values are case-insensitive canonical
+                names such as "Tikta", "Ushna" or "Balances Kapha"
+            match: "any" (OR) or "all" (AND) between the values of one facet
+            offset, limit: Page of matching herbs, in herbs.json order
+
+        Raises:
+            KeyError: for a facet not in FACETS
+            ValueError: for a match other than "any" or "all"
+        """
+        if match not in ("any", "all"):
+            raise ValueError(f"match must be 'any' or 'all', not {match!r}")
+        for facet in filters:
+            if facet not in self.bitsets:
+                raise KeyError(facet)
+        selected = self.select(filters, match)
+        herbs = []
+        remaining = selected
+        position = 0
+        while remaining and len(herbs) < limit:
+            lowest = remaining & -remaining
+            if position >= offset:
+                herbs.append(self.herbs[lowest.bit_length() - 1])
+            position += 1
+            remaining ^= lowest
+        return {"total": popcount(selected), "herbs": herbs, "facets": self.facet_counts(filters, match)}
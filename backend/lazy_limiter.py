@@ -0,0 +1,57 @@
+"""
+Deferred rate limiter for serverless cold starts
+
+slowapi and limits take tens of milliseconds to import, paid by every cold
+start even when the invocation never reaches a rate-limited route.
+LazyLimiter accepts the same limit() decorations at import time and builds
+the real slowapi.Limiter on the first rate-limited request.
+"""
+
+import functools
+from typing import Any, Awaitable, Callable, Optional
+
+
+class LazyLimiter:
+    """
+    Stand-in for slowapi.Limiter with the same limit() decorator.
+
+    Exceptions are registered on the app by class, which would force the
+    import, so RateLimitExceeded is caught here and passed to on_exceeded.
+    """
+
+    def __init__(self, on_exceeded: Optional[Callable[..., Awaitable[Any]]] = None, **limiter_kwargs):
+        self.on_exceeded = on_exceeded  # async (request, exc) -> Response
+        self._kwargs = limiter_kwargs
+        self._limiter = None
+
+    def get(self):
+        """The real slowapi.Limiter, created on first use"""
+        if self._limiter is None:
+            import rate_limit_storage  # noqa: F401  (registers sqlite:// and resp://)
+            from slowapi import Limiter
+            from slowapi.util import get_remote_address
+
+            self._limiter = Limiter(**{"key_func": get_remote_address, **self._kwargs})
+        return self._limiter
+
+    def limit(self, limit_value: str):
+        def decorator(func):
+            limited = None
+
+            @functools.wraps(func)  # FastAPI reads the endpoint signature through __wrapped__
+            async def wrapper(*args, **kwargs):
+                nonlocal limited
+                if limited is None:
+                    limited = self.get().limit(limit_value)(func)
+                from slowapi.errors import RateLimitExceeded
+
+                try:
+                    return await limited(*args, **kwargs)
+                except RateLimitExceeded as exc:
+                    if self.on_exceeded is None:
+                        raise
+                    return await self.on_exceeded(kwargs["request"], exc)
+
+            return wrapper
+
+        return decorator
@@ -1,26 +1,47 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Depends, Header
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Depends, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field, EmailStr
 from typing import Optional, List, Dict, Any
 import shutil
 import os
 import re
+import tempfile
+import asyncio
+import hmac
+import importlib
+from contextlib import asynccontextmanager
 from pathlib import Path
-from dotenv import load_dotenv
-from email_service import EmailService
+import metrics
+from upload_store import UploadStore, UploadTooLargeError
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (Vercel injects them and ships no .env file)
+if not os.getenv("VERCEL"):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+# Serverless cold starts defer slowapi, resend and service setup until a request needs them
+LAZY_INIT = os.getenv("LAZY_INIT", "true" if os.getenv("VERCEL") else "false").lower() == "true"
+
+if LAZY_INIT:
+    from lazy_limiter import LazyLimiter
+else:
+    from slowapi import Limiter
+    from slowapi.util import get_remote_address
+    from slowapi.errors import RateLimitExceeded
+    import rate_limit_storage  # registers the sqlite:// and resp:// limiter storages
+    import email_service  # noqa: F401  (endpoints import it on use; load it before the first request)
 
 # Configuration from environment variables with secure defaults
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
 RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "100"))
 UPLOAD_RATE_LIMIT_PER_MINUTE = int(os.getenv("UPLOAD_RATE_LIMIT_PER_MINUTE", "20"))
 MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
+# "streaming" copies uploads to disk chunk by chunk; "buffered" reads the whole file into memory first
+UPLOAD_MODE = os.getenv("UPLOAD_MODE", "streaming").lower()
+UPLOAD_CHUNK_SIZE_KB = int(os.getenv("UPLOAD_CHUNK_SIZE_KB", "256"))
+# "flat" keeps uploads/<name>; "sharded" stores deduplicated blobs under uploads/blobs/ab/cd/<sha256>
+UPLOAD_STORE = os.getenv("UPLOAD_STORE", "flat").lower()
 ALLOWED_FILE_EXTENSIONS = set(os.getenv("ALLOWED_FILE_EXTENSIONS", "jpg,jpeg,png,gif,pdf,doc,docx,txt").split(","))
 ALLOWED_MIME_TYPES = set(os.getenv("ALLOWED_MIME_TYPES", 
     "image/jpeg,image/png,image/gif,application/pdf,application/msword,"
@@ -28,6 +49,57 @@ ALLOWED_MIME_TYPES = set(os.getenv("ALLOWED_MIME_TYPES",
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
 BACKEND_API_KEY = os.getenv("BACKEND_API_KEY", "")
+# memory:// is per process; use sqlite:///ratelimit.sqlite3 (one host) or resp://host:6379 (many nodes)
+# so that all workers share one set of counters
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "fixed-window")  # or sliding-window-counter
+# "sync" waits for the provider; "queue" persists the email, returns 202 and sends in the background
+EMAIL_DISPATCH_MODE = os.getenv("EMAIL_DISPATCH_MODE", "sync").lower()
+EMAIL_QUEUE_PATH = os.getenv("EMAIL_QUEUE_PATH", "email_queue.sqlite3")
+EMAIL_QUEUE_WORKERS = int(os.getenv("EMAIL_QUEUE_WORKERS", "4"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "2"))
+# Bulk sends run inside the request: one provider batch call per 100 recipients, in turn, each
+# up to EMAIL_SEND_TIMEOUT_SECONDS. Keep it to a few calls so proxies do not time the request out
+# (and a client retry resend emails that went out)
+BULK_EMAIL_MAX_RECIPIENTS = int(os.getenv("BULK_EMAIL_MAX_RECIPIENTS", "300"))
+# "production" runs WEB_CONCURRENCY uvicorn worker processes with uvloop/httptools when installed
+SERVER_MODE = os.getenv("SERVER_MODE", "development").lower()
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))  # 0 = one worker per usable CPU core
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+# Longer than the usual 60s load balancer idle timeout, so the proxy closes idle connections first
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "65"))
+# How long shutdown waits for in-flight requests (uploads) and email sends before cancelling them
+SERVER_GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", "30"))
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Shared directory where each worker publishes its metrics so /metrics can sum them (multi-worker)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# Bearer token Prometheus must send to scrape /metrics (authorization: {credentials: ...}).
+# Empty = open: only then keep /metrics off the public internet (private network or proxy rule)
+METRICS_API_KEY = os.getenv("METRICS_API_KEY", "")
+# Knowledge base JSON files (repo's data/ by default; mount or copy them in containers)
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+MEDICINE_DB_PATH = os.getenv("MEDICINE_DB_PATH", os.path.join(DATA_DIR, "unified_medicines_database.json"))
+# Written by scripts/build_unified_database.py next to the database
+MEDICINE_FUZZY_INDEX_PATH = os.getenv("MEDICINE_FUZZY_INDEX_PATH", os.path.join(DATA_DIR, "unified_medicines_fuzzy_index.json"))
+# Written by scripts/build_unified_database.py --sqlite; substring search is unavailable (503) without it
+MEDICINE_FTS_PATH = os.getenv("MEDICINE_FTS_PATH", os.path.join(DATA_DIR, "unified_medicines.sqlite3"))
+PILOT_CONDITIONS_PATH = os.getenv("PILOT_CONDITIONS_PATH", os.path.join(DATA_DIR, "pilot_conditions.json"))
+# Vignettes per /api/conditions/match/batch request (offline evaluation runs)
+CONDITION_BATCH_MAX = int(os.getenv("CONDITION_BATCH_MAX", "5000"))
+DRUG_CLASSES_PATH = os.getenv("DRUG_CLASSES_PATH", os.path.join(DATA_DIR, "drug_classes_database.json"))
+DRUG_INTERACTIONS_PATH = os.getenv("DRUG_INTERACTIONS_PATH", os.path.join(DATA_DIR, "drug_class_interactions.json"))
+# Patients per /api/drugs/interactions/batch request (cohort screening)
+DRUG_INTERACTION_BATCH_MAX = int(os.getenv("DRUG_INTERACTION_BATCH_MAX", "5000"))
+# Written by scripts/build_repertory.py from the repertory tables in sql_chunks/
+REPERTORY_PATH = os.getenv("REPERTORY_PATH", os.path.join(DATA_DIR, "repertory.npz"))
+# Written by scripts/build_materia_medica.py from the OCR text of Boericke's Materia Medica
+MATERIA_MEDICA_PATH = os.getenv("MATERIA_MEDICA_PATH", os.path.join(DATA_DIR, "materia_medica.json"))
+HERBS_PATH = os.getenv("HERBS_PATH", os.path.join(DATA_DIR, "ayurvedic", "herbs.json"))
+NUSKHE_PATH = os.getenv("NUSKHE_PATH", os.path.join(DATA_DIR, "home_remedies", "nuskhe.json"))
+# Autocomplete fires on every keystroke, so it gets its own, higher limit
+AUTOCOMPLETE_RATE_LIMIT_PER_MINUTE = int(os.getenv("AUTOCOMPLETE_RATE_LIMIT_PER_MINUTE", "600"))
 
 # API Key authentication dependency
 async def verify_api_key(x_api_key: str = Header(default="")):
@@ -38,7 +110,132 @@ async def verify_api_key(x_api_key: str = Header(default="")):
         raise HTTPException(status_code=401, detail="Invalid or missing API key")
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+if LAZY_INIT:
+    limiter = LazyLimiter(
+        storage_uri=RATE_LIMIT_STORAGE_URI,
+        strategy=RATE_LIMIT_STRATEGY
+    )
+else:
+    limiter = Limiter(
+        key_func=get_remote_address,
+        storage_uri=RATE_LIMIT_STORAGE_URI,
+        strategy=RATE_LIMIT_STRATEGY
+    )
+
+# Opened by get_email_queue: at startup, or on the first email request with LAZY_INIT
+email_queue = None
+
+def get_email_queue():
+    """The email queue (EMAIL_DISPATCH_MODE=queue), opened and started on first use; must run on the event loop"""
+    global email_queue
+    if email_queue is None:
+        from email_queue import EmailQueue
+        from email_service import EmailService
+
+        email_queue = EmailQueue(
+            EMAIL_QUEUE_PATH,
+            senders={
+                "diagnosis": EmailService.send_diagnosis_complete,
+                "reminder": EmailService.send_reminder,
+                "health_tip": EmailService.send_health_tip,
+            },
+            workers=EMAIL_QUEUE_WORKERS,
+            max_attempts=EMAIL_MAX_ATTEMPTS,
+            retry_base_seconds=EMAIL_RETRY_BASE_SECONDS,
+        )
+        email_queue.start()
+    return email_queue
+
+if EMAIL_DISPATCH_MODE == "queue":
+    metrics.Gauge("email_queue_depth", "Emails waiting to be sent or retried",
+                  collect=lambda: email_queue.depth() if email_queue is not None else 0)
+
+async def publish_metrics():
+    """Write this worker's metrics to METRICS_DIR every METRICS_FLUSH_SECONDS"""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            metrics.write_snapshot(METRICS_DIR)
+        except OSError as e:
+            print(f"Metrics error: {str(e)}")
+
+def index_loader(module: str, class_name: str, *extra_paths: str):
+    """
+    Loader for DATA_INDEXES that imports the index module on first use.
+    
+    Keeps index code (and numpy/scipy, optional and only in the Docker
+    image) out of cold starts; a missing optional dependency becomes a 503.
+    """
+    def load(path: str) -> Any:
+        try:
+            index_class = getattr(importlib.import_module(module), class_name)
+        except ImportError as e:
+            raise HTTPException(status_code=503, detail=f"The {module} index needs {e.name}, which is not installed")
+        return index_class.load(path, *extra_paths)
+    return load
+
+# Search indexes over the data files: name -> (loader, source path), built once per process
+DATA_INDEXES: Dict[str, tuple] = {
+    "medicines": (index_loader("medicine_index", "MedicineIndex"), MEDICINE_DB_PATH),
+    "medicines_fuzzy": (index_loader("fuzzy_index", "FuzzyIndex"), MEDICINE_FUZZY_INDEX_PATH),
+    "medicines_fts": (index_loader("medicine_fts", "MedicineFTS"), MEDICINE_FTS_PATH),
+    "remedies": (index_loader("symptom_index", "SymptomIndex"), NUSKHE_PATH),
+    "herbs": (index_loader("herb_query", "HerbQueryEngine"), HERBS_PATH),
+    "conditions": (index_loader("condition_engine", "ConditionEngine"), PILOT_CONDITIONS_PATH),
+    "drug_classes": (index_loader("drug_classes", "DrugClassIndex"), DRUG_CLASSES_PATH),
+    # Class ids follow drug_classes_database.json, so it reads DRUG_CLASSES_PATH too
+    "drug_interactions": (index_loader("drug_interactions", "InteractionMatrix", DRUG_CLASSES_PATH),
+                          DRUG_INTERACTIONS_PATH),
+    "repertory": (index_loader("repertory", "RepertoryEngine"), REPERTORY_PATH),
+    "materia_medica": (index_loader("materia_medica", "MateriaMedica"), MATERIA_MEDICA_PATH),
+    # Also reads NUSKHE_PATH; herbs.json is the file whose absence disables it
+    "names": (index_loader("transliteration", "TransliterationIndex", NUSKHE_PATH), HERBS_PATH),
+}
+_loaded_indexes: Dict[str, Any] = {}
+
+def get_data_index(name: str) -> Any:
+    """
+    Return a data index, building it on first use.
+    
+    Raises HTTPException 503 when its source file is missing.
+    """
+    index = _loaded_indexes.get(name)
+    if index is None:
+        loader, path = DATA_INDEXES[name]
+        if not os.path.exists(path):
+            raise HTTPException(status_code=503, detail=f"The {name} database is not available")
+        index = _loaded_indexes[name] = loader(path)
+    return index
+
+def preload_data_indexes():
+    """Build every index whose source file exists, so the first request doesn't pay for it"""
+    for name, (_, path) in DATA_INDEXES.items():
+        if not os.path.exists(path):
+            print(f"⚠️ {name} index unavailable: {path} not found")
+            continue
+        try:
+            get_data_index(name)
+            print(f"✅ Loaded {name} index from {path}")
+        except HTTPException as e:
+            print(f"⚠️ {name} index unavailable: {e.detail}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers with the app and let them finish in-flight work on shutdown"""
+    if not LAZY_INIT:
+        preload_data_indexes()
+    if EMAIL_DISPATCH_MODE == "queue" and not LAZY_INIT:
+        get_email_queue()  # sends what the last run left pending without waiting for a request
+    publisher = None
+    if METRICS_ENABLED and METRICS_DIR:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        publisher = asyncio.create_task(publish_metrics())
+    yield
+    if email_queue is not None:
+        await email_queue.stop(timeout=SERVER_GRACEFUL_TIMEOUT_SECONDS)
+    if publisher is not None:
+        publisher.cancel()
+        metrics.write_snapshot(METRICS_DIR)  # final counts outlive this worker
 
 # Determine root path for Vercel
 # Vercel rewrites /api/py/... to this app, so we need to tell FastAPI about the prefix
@@ -47,10 +244,10 @@ root_path = "/api/py" if os.getenv("VERCEL") else ""
 app = FastAPI(
     title="Healio.AI Backend API", 
     version="1.0.0",
-    root_path=root_path
+    root_path=root_path,
+    lifespan=lifespan
 )
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # Configure CORS with environment-based origins
 app.add_middleware(
@@ -61,8 +258,22 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization", "X-API-Key"],  # Explicit headers
 )
 
+if METRICS_ENABLED:
+    # Added last so it is outermost and times CORS and error handling too
+    app.add_middleware(metrics.MetricsMiddleware)
+
 UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+if not LAZY_INIT:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)  # lazy mode creates it on the first upload
+# Opens its SQLite index and creates uploads/blobs; lazy mode waits for the first upload
+upload_store = UploadStore(UPLOAD_DIR) if UPLOAD_STORE == "sharded" and not LAZY_INIT else None
+
+def get_upload_store() -> UploadStore:
+    """The sharded upload store, opened on first use"""
+    global upload_store
+    if upload_store is None:
+        upload_store = UploadStore(UPLOAD_DIR)
+    return upload_store
 
 # Pydantic models for request validation
 class FileUploadResponse(BaseModel):
@@ -71,6 +282,7 @@ class FileUploadResponse(BaseModel):
     status: str
     message: str
     size_bytes: Optional[int] = None
+    sha256: Optional[str] = None
 
 # Email models
 class DiagnosisEmailRequest(BaseModel):
@@ -96,6 +308,174 @@ class HealthTipEmailRequest(BaseModel):
     tip_content: str
     size_bytes: Optional[int] = None
 
+class BulkEmailRecipient(BaseModel):
+    """One personalization of a bulk email"""
+    to_email: EmailStr
+    user_name: str
+    data: Dict[str, Any] = Field(default_factory=dict)  # Remaining template fields, e.g. reminder_type
+
+class MedicineSuggestion(BaseModel):
+    """One autocomplete candidate"""
+    name: str
+    category: str
+
+class MedicineAutocompleteResponse(BaseModel):
+    """Response model for medicine autocomplete"""
+    query: str
+    results: List[MedicineSuggestion]
+    total: int  # All names matching the prefix, of which `results` is the first page
+
+class MedicineMatch(BaseModel):
+    """One fuzzy search hit"""
+    name: str
+    category: str
+    distance: int  # Total edits between the query words and the name's words
+
+class MedicineSearchResponse(BaseModel):
+    """Response model for fuzzy medicine search"""
+    query: str
+    results: List[MedicineMatch]
+
+class MedicineSubstringMatch(BaseModel):
+    """One name containing the query"""
+    name: str
+    category: str
+    source: Optional[str] = None  # Build input the name came from, e.g. 'csv' or 'ayurvedic_curated'
+
+class MedicineSubstringResponse(BaseModel):
+    """Response model for substring medicine search"""
+    query: str
+    results: List[MedicineSubstringMatch]
+    total: int  # All names containing the query, of which `results` is the first page
+
+class NameMatch(BaseModel):
+    """One herb, ailment or remedy found by name"""
+    kind: str  # 'herb', 'ailment' or 'remedy'
+    id: str  # herbs.json id, or the nuskhe.json ailment id (for remedies, the ailment they treat)
+    name: str
+    hindi_name: Optional[str] = None
+    ailment: Optional[str] = None  # Remedies only
+    matched: str  # The name variant (any script) that matched the query
+
+class NameSearchResponse(BaseModel):
+    """Response model for script-independent name search"""
+    query: str
+    results: List[NameMatch]
+
+class AilmentMatch(BaseModel):
+    """One ailment found by symptoms, with its home remedies"""
+    id: str
+    ailment: str
+    ailment_hindi: Optional[str] = None
+    score: float  # BM25 relevance to the symptoms
+    remedies: List[Dict[str, Any]]  # As stored in nuskhe.json, named remedies first
+
+class RemedySearchResponse(BaseModel):
+    """Response model for symptom-based remedy search"""
+    symptoms: List[str]
+    results: List[AilmentMatch]
+
+class HerbQueryResponse(BaseModel):
+    """Response model for herb property filters"""
+    total: int  # All matching herbs, of which `herbs` is one page
+    herbs: List[Dict[str, Any]]  # Records as stored in herbs.json
+    facets: Dict[str, Dict[str, int]]  # facet -> value -> matching herbs if that value were selected
+
+class ConditionMatchRequest(BaseModel):
+    """Request model for ranking conditions by symptoms"""
+    symptoms: List[str] = Field(..., min_length=1, max_length=50)
+    limit: int = Field(5, ge=1, le=50)
+
+class ConditionBatchRequest(BaseModel):
+    """Request model for ranking conditions for many patient vignettes at once"""
+    vignettes: List[List[str]] = Field(..., min_length=1)  # Each vignette is a list of symptoms
+    limit: int = Field(5, ge=1, le=50)
+
+class ConditionMatch(BaseModel):
+    """One ranked condition"""
+    code: str  # ICD-10
+    name: str
+    score: float  # Cosine similarity to the symptoms plus the prevalence prior
+    severity: Optional[str] = None
+    prevalence: Optional[str] = None
+
+class ConditionMatchResponse(BaseModel):
+    """Response model for condition matching"""
+    results: List[ConditionMatch]
+
+class ConditionBatchResponse(BaseModel):
+    """Response model for batch condition matching, in vignette order"""
+    results: List[List[ConditionMatch]]
+
+class DrugClassRequest(BaseModel):
+    """Request model for resolving a medication list to drug classes"""
+    medications: List[str] = Field(..., min_length=1, max_length=100)
+
+class DrugClassResult(BaseModel):
+    """Drug classes of one medication"""
+    medication: str
+    normalized: str  # Active ingredients the lookup used, e.g. 'hydrochlorothiazide / lisinopril'
+    classes: List[str]  # Empty when the drug is not in the database
+
+class DrugClassResponse(BaseModel):
+    """Response model for drug class resolution, in medication order"""
+    results: List[DrugClassResult]
+
+class DrugInteraction(BaseModel):
+    """An interacting pair of medications, by drug class"""
+    medications: List[str]  # The two medications as given
+    classes: List[str]  # Their interacting classes, in the same order
+    severity: str  # 'major', 'moderate' or 'minor'
+    effect: str
+
+class DrugInteractionResponse(BaseModel):
+    """Response model for screening one medication list, most severe first"""
+    interactions: List[DrugInteraction]
+    unresolved: List[str]  # Medications not in the drug class database, so not screened
+
+class DrugInteractionBatchRequest(BaseModel):
+    """Request model for screening a cohort of patients"""
+    patients: List[List[str]] = Field(..., min_length=1)  # Each patient's medication list
+
+class PatientScreening(BaseModel):
+    """Screening summary of one patient"""
+    interactions: int  # Interacting class pairs between the patient's medications
+    worst_severity: Optional[str] = None
+
+class DrugInteractionBatchResponse(BaseModel):
+    """Response model for cohort screening, in patient order"""
+    results: List[PatientScreening]
+
+class RepertorizationRequest(BaseModel):
+    """Request model for repertorizing a homeopathic case"""
+    symptom_ids: List[int] = Field(..., min_length=1, max_length=200)  # Repertory rubrics (sym_id)
+    weights: Optional[List[float]] = None  # Intensity of each rubric in the case, 1-4 (default 1)
+    limit: int = Field(20, ge=1, le=100)
+
+class RemedyScore(BaseModel):
+    """One remedy of a repertorization"""
+    abbreviation: str  # e.g. 'Bell.'
+    name: str
+    score: float  # Sum of its grades (1-5) in the case's rubrics, times the rubric weights
+    rubrics: int  # How many of the case's rubrics list it
+
+class RepertorizationResponse(BaseModel):
+    """Response model for repertorization, best remedy first"""
+    results: List[RemedyScore]
+    unknown_symptoms: List[int]  # Ids not in the repertory, left out of the analysis
+
+class MateriaMedicaResponse(BaseModel):
+    """A remedy of Boericke's Materia Medica"""
+    name: str  # Curated remedy name when the heading matched one, else the heading
+    heading: str  # Heading as scanned, e.g. 'Aconitum Napellus'
+    common_name: Optional[str] = None  # e.g. 'Monkshood'
+    sections: Dict[str, str]  # 'General', 'Mind', 'Head', ... 'Modalities', 'Relationship', 'Dose'
+
+class BulkEmailRequest(BaseModel):
+    """Request model for sending one template to many recipients"""
+    template_id: str  # 'diagnosis', 'reminder' or 'health_tip'
+    recipients: List[BulkEmailRecipient]
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename to prevent path traversal attacks and other security issues.
@@ -148,6 +528,60 @@ def validate_file_upload(file: UploadFile) -> tuple[bool, str]:
     
     return True, ""
 
+def claim_upload_path(safe_filename: str, temp_path: str) -> str:
+    """
+    Atomically move a finished temp file into UPLOAD_DIR without overwriting.
+
+    os.link fails if the target exists, so two concurrent uploads with the
+    same name can never clobber each other. Returns the final file path.
+    """
+    base, ext = os.path.splitext(safe_filename)
+    file_location = os.path.join(UPLOAD_DIR, safe_filename)
+    counter = 1
+    while True:
+        try:
+            os.link(temp_path, file_location)
+            break
+        except FileExistsError:
+            file_location = os.path.join(UPLOAD_DIR, f"{base}_{counter}{ext}")
+            counter += 1
+    os.unlink(temp_path)
+    return file_location
+
+async def stream_upload_to_disk(file: UploadFile, safe_filename: str, max_bytes: int) -> tuple[str, int]:
+    """
+    Copy an upload into UPLOAD_DIR in fixed-size chunks.
+
+    Memory use per upload is bounded by UPLOAD_CHUNK_SIZE_KB regardless of
+    file size. The size limit is enforced while streaming, and the partial
+    temp file is removed if the upload is rejected or fails. Disk writes
+    run in worker threads, as in UploadStore.save.
+
+    Returns: (file_location, size_bytes)
+    """
+    chunk_size = UPLOAD_CHUNK_SIZE_KB * 1024
+    fd, temp_path = await asyncio.to_thread(tempfile.mkstemp, dir=UPLOAD_DIR, prefix=".upload-", suffix=".part")
+    os.chmod(temp_path, 0o644)  # mkstemp creates 0600; match files written by open()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File size exceeds maximum allowed size of {MAX_UPLOAD_SIZE_MB}MB"
+                    )
+                await asyncio.to_thread(buffer.write, chunk)
+        return await asyncio.to_thread(claim_upload_path, safe_filename, temp_path), size
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
 @app.get("/")
 @limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
 async def read_root(request: Request):
@@ -173,6 +607,8 @@ async def upload_file(request: Request, file: UploadFile = File(...)):
     - File type validation (extension + MIME type)
     - Filename sanitization (prevents path traversal)
     - File size limits (default: 10MB max)
+    - Streaming writes with bounded memory (UPLOAD_MODE=streaming, the default)
+    - Optional deduplicating content-addressed storage (UPLOAD_STORE=sharded)
     
     Rate limit: Configurable via environment (default: 20/minute)
     """
@@ -195,36 +631,59 @@ async def upload_file(request: Request, file: UploadFile = File(...)):
         # Sanitize filename to prevent path traversal and injection attacks
         safe_filename = sanitize_filename(file.filename)
         
-        # Read file content with size limit enforcement
         max_bytes = MAX_UPLOAD_SIZE_MB * 1024 * 1024
-        file_content = await file.read(max_bytes + 1)  # Read one extra byte to detect oversized files
+        if LAZY_INIT:
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+        sha256 = None
         
-        if len(file_content) > max_bytes:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File size exceeds maximum allowed size of {MAX_UPLOAD_SIZE_MB}MB"
-            )
-        
-        # Save file with sanitized name
-        file_location = os.path.join(UPLOAD_DIR, safe_filename)
-        
-        # Prevent overwriting existing files (optional - add timestamp if needed)
-        if os.path.exists(file_location):
-            base, ext = os.path.splitext(safe_filename)
-            counter = 1
-            while os.path.exists(file_location):
-                file_location = os.path.join(UPLOAD_DIR, f"{base}_{counter}{ext}")
-                counter += 1
+        if UPLOAD_STORE == "sharded":
+            # Content-addressed store: hashes while streaming, stores each blob once
+            try:
+                stored = await get_upload_store().save(file, safe_filename, max_bytes, UPLOAD_CHUNK_SIZE_KB * 1024)
+            except UploadTooLargeError:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File size exceeds maximum allowed size of {MAX_UPLOAD_SIZE_MB}MB"
+                )
+            size_bytes = stored.size_bytes
+            sha256 = stored.sha256
+        elif UPLOAD_MODE == "streaming":
+            # Stream to a temp file and rename into place; never holds the whole file in memory
+            file_location, size_bytes = await stream_upload_to_disk(file, safe_filename, max_bytes)
+        else:
+            # Read file content with size limit enforcement
+            file_content = await file.read(max_bytes + 1)  # Read one extra byte to detect oversized files
+            
+            if len(file_content) > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File size exceeds maximum allowed size of {MAX_UPLOAD_SIZE_MB}MB"
+                )
+            
+            # Save file with sanitized name
+            file_location = os.path.join(UPLOAD_DIR, safe_filename)
+            
+            # Prevent overwriting existing files (optional - add timestamp if needed)
+            if os.path.exists(file_location):
+                base, ext = os.path.splitext(safe_filename)
+                counter = 1
+                while os.path.exists(file_location):
+                    file_location = os.path.join(UPLOAD_DIR, f"{base}_{counter}{ext}")
+                    counter += 1
+            
+            # Write file securely
+            with open(file_location, "wb") as buffer:
+                buffer.write(file_content)
+            size_bytes = len(file_content)
         
-        # Write file securely
-        with open(file_location, "wb") as buffer:
-            buffer.write(file_content)
+        metrics.UPLOAD_BYTES.inc("sharded" if UPLOAD_STORE == "sharded" else UPLOAD_MODE, amount=size_bytes)
         
         return FileUploadResponse(
             filename=safe_filename,
             status="success",
             message="File uploaded successfully",
-            size_bytes=len(file_content)
+            size_bytes=size_bytes,
+            sha256=sha256
         )
         
     except HTTPException:
@@ -242,13 +701,14 @@ async def upload_file(request: Request, file: UploadFile = File(...)):
         # Always close the file
         await file.close()
 
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+async def rate_limit_handler(request: Request, exc: "RateLimitExceeded"):
     """
     Custom rate limit exceeded handler with graceful 429 response.
     
     OWASP Security: Provides clear feedback without exposing system details.
     """
+    route = request.scope.get("route")
+    metrics.HTTP_RATE_LIMITED.inc(route.path if route is not None else request.url.path)
     return JSONResponse(
         status_code=429,
         content={
@@ -261,6 +721,338 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         }
     )
 
+if LAZY_INIT:
+    limiter.on_exceeded = rate_limit_handler
+else:
+    app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+
+async def verify_metrics_key(authorization: str = Header(default="")):
+    """Verify the METRICS_API_KEY bearer token sent by the Prometheus scraper."""
+    if not METRICS_API_KEY:
+        return  # No key configured = open; keep /metrics private at the network level
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {METRICS_API_KEY}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing metrics token")
+
+
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_key)])
+    async def metrics_endpoint():
+        """
+        Prometheus scrape endpoint.
+        
+        Not rate limited so scrapes never fail; summed over all workers when METRICS_DIR is set.
+        Requires the METRICS_API_KEY bearer token when one is configured.
+        """
+        return PlainTextResponse(
+            metrics.render(METRICS_DIR or None),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+# ======================
+# Medicine Search Endpoints
+# ======================
+
+@app.get("/api/medicines/autocomplete", response_model=MedicineAutocompleteResponse)
+@limiter.limit(f"{AUTOCOMPLETE_RATE_LIMIT_PER_MINUTE}/minute")
+async def autocomplete_medicines(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    category: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Medicine names starting with `q`, from the unified medicines database.
+    
+    Answered from an in-memory sorted index (binary search), optionally
+    restricted to one category: Allopathic, Ayurvedic or Homeopathic.
+    
+    Rate limit: Configurable via environment (default: 600/minute)
+    """
+    index = get_data_index("medicines")
+    if category is not None and category not in index.categories:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown category '{category}'. Use one of: {', '.join(index.categories)}"
+        )
+    results, total = index.autocomplete(q, category, limit)
+    return MedicineAutocompleteResponse(query=q, results=results, total=total)
+
+@app.get("/api/medicines/search", response_model=MedicineSearchResponse)
+@limiter.limit(f"{AUTOCOMPLETE_RATE_LIMIT_PER_MINUTE}/minute")
+async def search_medicines(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    category: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Typo-tolerant medicine search ("amoxicilin", "ashwaganda").
+    
+    Every query word must match a word of the name within 1 edit (4-5
+    letters) or 2 edits (6+ letters); shorter words and doses match exactly.
+    Results are ranked by total edits, then shorter names first.
+    
+    Rate limit: Configurable via environment (default: 600/minute)
+    """
+    index = get_data_index("medicines_fuzzy")
+    if category is not None and category not in index.categories:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown category '{category}'. Use one of: {', '.join(index.categories)}"
+        )
+    return MedicineSearchResponse(query=q, results=index.search(q, category, limit))
+
+@app.get("/api/medicines/contains", response_model=MedicineSubstringResponse)
+@limiter.limit(f"{AUTOCOMPLETE_RATE_LIMIT_PER_MINUTE}/minute")
+async def medicines_containing(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=100),
+    category: Optional[str] = None,
+    limit: int = Query(40, ge=1, le=100)
+):
+    """
+    Medicine names containing `q` anywhere ("moxi" -> Amoxicillin), ignoring case.
+    
+    Answered from the SQLite FTS5 trigram index of the unified medicines
+    database; names starting with `q` come first, then alphabetical order.
+    
+    Rate limit: Configurable via environment (default: 600/minute)
+    """
+    index = get_data_index("medicines_fts")
+    if category is not None and category not in index.categories:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown category '{category}'. Use one of: {', '.join(index.categories)}"
+        )
+    # SQLite releases the GIL while it searches; each concurrent search gets its own pooled connection
+    results, total = await asyncio.to_thread(index.search, q, category, limit)
+    return MedicineSubstringResponse(query=q, results=results, total=total)
+
+@app.get("/api/names/search", response_model=NameSearchResponse)
+@limiter.limit(f"{AUTOCOMPLETE_RATE_LIMIT_PER_MINUTE}/minute")
+async def search_names(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    kind: Optional[str] = Query(None, pattern="^(herb|ailment|remedy)$"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Herbs, ailments and home remedies by name in Devanagari, Hinglish or English.
+    
+    "adrak", "adraka", "अदरक" and "ginger" all find Adraka; a query also
+    matches names that continue it ("ashwa" -> Ashwagandha). Optionally
+    restricted to one kind: herb, ailment or remedy.
+    
+    Rate limit: Configurable via environment (default: 600/minute)
+    """
+    index = get_data_index("names")
+    return NameSearchResponse(query=q, results=index.search(q, kind, limit))
+
+@app.get("/api/remedies/search", response_model=RemedySearchResponse)
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def search_remedies(
+    request: Request,
+    symptoms: List[str] = Query(..., min_length=1, max_length=20),
+    limit: int = Query(5, ge=1, le=20),
+    remedies: int = Query(5, ge=0, le=50)
+):
+    """
+    Home remedies for a set of symptoms (?symptoms=runny+nose&symptoms=sneezing).
+    
+    Ailments are ranked by BM25 over their symptom keywords and names;
+    Hinglish and Devanagari symptoms ("zukam", "खाँसी") are understood.
+    `remedies` caps the remedies returned per ailment.
+    
+    Rate limit: Configurable via environment (default: 100/minute)
+    """
+    if any(len(symptom) > 100 for symptom in symptoms):
+        raise HTTPException(status_code=400, detail="Each symptom must be at most 100 characters")
+    index = get_data_index("remedies")
+    return RemedySearchResponse(symptoms=symptoms, results=index.search(symptoms, limit, remedies))
+
+@app.get("/api/herbs/query", response_model=HerbQueryResponse)
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def query_herbs(
+    request: Request,
+    rasa: List[str] = Query([]),
+    guna: List[str] = Query([]),
+    virya: List[str] = Query([]),
+    vipaka: List[str] = Query([]),
+    dosha_effect: List[str] = Query([]),
+    parts_used: List[str] = Query([]),
+    match: str = Query("any", pattern="^(any|all)$"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    Herbs filtered by Ayurvedic properties, with facet counts for filter UIs.
+    
+    Facets are ANDed: ?virya=Ushna&rasa=Tikta&dosha_effect=Balances+Kapha.
+    Repeated values of one facet are ORed, or ANDed with match=all.
+    Values are case-insensitive: Madhura/Amla/Lavana/Katu/Tikta/Kashaya,
+    Ushna/Sheeta, "Balances Vata", "Aggravates Pitta", Root, Leaf, ...
+    
+    Rate limit: Configurable via environment (default: 100/minute)
+    """
+    engine = get_data_index("herbs")
+    filters = {"rasa": rasa, "guna": guna, "virya": virya, "vipaka": vipaka,
+               "dosha_effect": dosha_effect, "parts_used": parts_used}
+    return HerbQueryResponse(**engine.query(filters, match, offset, limit))
+
+@app.post("/api/conditions/match", response_model=ConditionMatchResponse)
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def match_conditions(request: Request, match_req: ConditionMatchRequest):
+    """
+    ICD-coded conditions from pilot_conditions.json ranked for a set of symptoms.
+    
+    Scored with one sparse matrix-vector product over a condition x
+    symptom-term TF-IDF matrix, plus a log prevalence prior.
+    
+    Rate limit: Configurable via environment (default: 100/minute)
+    """
+    engine = get_data_index("conditions")
+    return ConditionMatchResponse(results=engine.rank(match_req.symptoms, match_req.limit))
+
+@app.post("/api/conditions/match/batch", response_model=ConditionBatchResponse, dependencies=[Depends(verify_api_key)])
+@limiter.limit("10/minute")
+async def match_conditions_batch(request: Request, batch_req: ConditionBatchRequest):
+    """
+    Rank conditions for many vignettes (offline evaluation), in one sparse product.
+    
+    Rate limit: 10 requests per minute
+    """
+    if len(batch_req.vignettes) > CONDITION_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many vignettes ({len(batch_req.vignettes)}); the maximum is {CONDITION_BATCH_MAX}"
+        )
+    engine = get_data_index("conditions")
+    # CPU-bound for large batches: keep the event loop serving other requests
+    results = await asyncio.to_thread(engine.rank_batch, batch_req.vignettes, batch_req.limit)
+    return ConditionBatchResponse(results=results)
+
+@app.post("/api/drugs/classes", response_model=DrugClassResponse)
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def resolve_drug_classes(request: Request, class_req: DrugClassRequest):
+    """
+    Drug classes of every medication in a patient's list, in one call.
+    
+    Doses, dosage forms and routes are ignored unless a route is given
+    ("timolol ophthalmic"); combinations match in any order ("a + b").
+    
+    Rate limit: Configurable via environment (default: 100/minute)
+    """
+    if any(len(medication) > 200 for medication in class_req.medications):
+        raise HTTPException(status_code=400, detail="Each medication must be at most 200 characters")
+    index = get_data_index("drug_classes")
+    return DrugClassResponse(results=index.resolve(class_req.medications))
+
+@app.post("/api/drugs/interactions", response_model=DrugInteractionResponse)
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def screen_drug_interactions(request: Request, class_req: DrugClassRequest):
+    """
+    Class-level interactions between the medications of one patient.
+    
+    Each medication is resolved to its drug classes as in /api/drugs/classes;
+    every pair of medications is then checked against the class x class
+    interaction matrix of drug_class_interactions.json.
+    
+    Rate limit: Configurable via environment (default: 100/minute)
+    """
+    if any(len(medication) > 200 for medication in class_req.medications):
+        raise HTTPException(status_code=400, detail="Each medication must be at most 200 characters")
+    index = get_data_index("drug_classes")
+    matrix = get_data_index("drug_interactions")
+    class_ids = [index.class_ids_of(medication) for medication in class_req.medications]
+    interactions = [
+        DrugInteraction(medications=[class_req.medications[i] for i in hit["medications"]], classes=list(hit["classes"]),
+                        severity=hit["severity"], effect=hit["effect"])
+        for hit in matrix.screen(class_ids)
+    ]
+    unresolved = [medication for medication, ids in zip(class_req.medications, class_ids) if not len(ids)]
+    return DrugInteractionResponse(interactions=interactions, unresolved=unresolved)
+
+def screen_cohort(patients: List[List[str]]) -> List[PatientScreening]:
+    """Resolve every distinct medication once, then screen all patients in one vectorized pass"""
+    from drug_interactions import severity_name
+    index = get_data_index("drug_classes")
+    matrix = get_data_index("drug_interactions")
+    class_ids = {m: index.class_ids_of(m) for m in {m for medications in patients for m in medications}}
+    resolved = [[class_ids[m] for m in medications] for medications in patients]
+    counts, worst = matrix.screen_cohort(resolved)
+    return [PatientScreening(interactions=int(count), worst_severity=severity_name(int(code)))
+            for count, code in zip(counts, worst)]
+
+@app.post("/api/drugs/interactions/batch", response_model=DrugInteractionBatchResponse,
+          dependencies=[Depends(verify_api_key)])
+@limiter.limit("10/minute")
+async def screen_drug_interactions_batch(request: Request, batch_req: DrugInteractionBatchRequest):
+    """
+    Interaction counts and worst severity for a cohort of patients (population screening).
+    
+    Rate limit: 10 requests per minute
+    """
+    if len(batch_req.patients) > DRUG_INTERACTION_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many patients ({len(batch_req.patients)}); the maximum is {DRUG_INTERACTION_BATCH_MAX}"
+        )
+    if any(len(medications) > 100 or any(len(m) > 200 for m in medications) for medications in batch_req.patients):
+        raise HTTPException(status_code=400,
+                            detail="Each patient may list at most 100 medications of at most 200 characters")
+    try:
+        # CPU-bound for large cohorts: keep the event loop serving other requests
+        results = await asyncio.to_thread(screen_cohort, batch_req.patients)
+    except ImportError as e:
+        raise HTTPException(status_code=503, detail=f"Cohort screening needs {e.name}, which is not installed")
+    return DrugInteractionBatchResponse(results=results)
+
+@app.post("/api/repertory/analyze", response_model=RepertorizationResponse)
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def repertorize_case(request: Request, case_req: RepertorizationRequest):
+    """
+    Remedies for a homeopathic case, from the OpenRep repertory.
+    
+    Sums each remedy's grades over the case's rubrics (optionally weighted
+    by intensity) in one sparse row-sum; ranks by that total, then by the
+    number of rubrics covered.
+    
+    Rate limit: Configurable via environment (default: 100/minute)
+    """
+    if not all(0 < symptom_id < 2 ** 31 for symptom_id in case_req.symptom_ids):
+        raise HTTPException(status_code=400, detail="Symptom ids must be positive integers")
+    weights = case_req.weights
+    if weights is not None and (len(weights) != len(case_req.symptom_ids) or not all(1 <= w <= 4 for w in weights)):
+        raise HTTPException(status_code=400, detail="weights must give one value from 1 to 4 per symptom id")
+    engine = get_data_index("repertory")
+    return RepertorizationResponse(**engine.repertorize(case_req.symptom_ids, weights, case_req.limit))
+
+@app.get("/api/materia-medica/{remedy}", response_model=MateriaMedicaResponse)
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def get_materia_medica(request: Request, remedy: str, section: Optional[str] = Query(None, max_length=30)):
+    """
+    A remedy's text from Boericke's Materia Medica, by body-system section.
+    
+    The remedy is looked up by name ("Aconite Napellus", "nux vomica") or
+    by its heading in the book; ?section=Stomach returns only that section.
+    
+    Rate limit: Configurable via environment (default: 100/minute)
+    """
+    if len(remedy) > 100:
+        raise HTTPException(status_code=400, detail="Remedy name must be at most 100 characters")
+    book = get_data_index("materia_medica")
+    entry = book.get(remedy)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"'{remedy}' is not in the materia medica")
+    sections = entry["sections"]
+    if section is not None:
+        text = book.section(remedy, section)
+        if text is None:
+            raise HTTPException(status_code=404, detail=f"{entry['name']} has no '{section}' section")
+        sections = {section.capitalize(): text}
+    return MateriaMedicaResponse(name=entry["name"], heading=entry["heading"], common_name=entry["common_name"],
+                                 sections=sections)
+
 # ======================
 # Email API Endpoints
 # ======================
@@ -272,9 +1064,10 @@ async def send_diagnosis_email(request: Request, email_req: DiagnosisEmailReques
     Send diagnosis completion email
     
     Rate limit: 10/minute to prevent spam
+    Returns 202 with a message_id when EMAIL_DISPATCH_MODE=queue
     """
     try:
-        success = await EmailService.send_diagnosis_complete(
+        email_kwargs = dict(
             to_email=email_req.to_email,
             user_name=email_req.user_name,
             diagnosis_summary=email_req.diagnosis_summary,
@@ -282,6 +1075,13 @@ async def send_diagnosis_email(request: Request, email_req: DiagnosisEmailReques
             consultation_id=email_req.consultation_id
         )
         
+        if EMAIL_DISPATCH_MODE == "queue":
+            message_id = await get_email_queue().enqueue("diagnosis", email_kwargs)
+            return JSONResponse(status_code=202, content={"status": "queued", "message_id": message_id})
+        
+        from email_service import EmailService
+        success = await EmailService.send_diagnosis_complete(**email_kwargs)
+        
         if success:
             return {"status": "success", "message": "Diagnosis email sent successfully"}
         else:
@@ -298,15 +1098,23 @@ async def send_reminder_email(request: Request, email_req: ReminderEmailRequest)
     Send reminder email (medication or appointment)
     
     Rate limit: 20/minute
+    Returns 202 with a message_id when EMAIL_DISPATCH_MODE=queue
     """
     try:
-        success = await EmailService.send_reminder(
+        email_kwargs = dict(
             to_email=email_req.to_email,
             user_name=email_req.user_name,
             reminder_type=email_req.reminder_type,
             reminder_details=email_req.reminder_details
         )
         
+        if EMAIL_DISPATCH_MODE == "queue":
+            message_id = await get_email_queue().enqueue("reminder", email_kwargs)
+            return JSONResponse(status_code=202, content={"status": "queued", "message_id": message_id})
+        
+        from email_service import EmailService
+        success = await EmailService.send_reminder(**email_kwargs)
+        
         if success:
             return {"status": "success", "message": "Reminder email sent successfully"}
         else:
@@ -323,15 +1131,23 @@ async def send_health_tip_email(request: Request, email_req: HealthTipEmailReque
     Send health tip email
     
     Rate limit: 5/minute
+    Returns 202 with a message_id when EMAIL_DISPATCH_MODE=queue
     """
     try:
-        success = await EmailService.send_health_tip(
+        email_kwargs = dict(
             to_email=email_req.to_email,
             user_name=email_req.user_name,
             tip_title=email_req.tip_title,
             tip_content=email_req.tip_content
         )
         
+        if EMAIL_DISPATCH_MODE == "queue":
+            message_id = await get_email_queue().enqueue("health_tip", email_kwargs)
+            return JSONResponse(status_code=202, content={"status": "queued", "message_id": message_id})
+        
+        from email_service import EmailService
+        success = await EmailService.send_health_tip(**email_kwargs)
+        
         if success:
             return {"status": "success", "message": "Health tip email sent successfully"}
         else:
@@ -341,15 +1157,117 @@ async def send_health_tip_email(request: Request, email_req: HealthTipEmailReque
         print(f"Email error: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred sending the email")
 
+@app.post("/api/email/bulk", dependencies=[Depends(verify_api_key)])
+@limiter.limit("5/minute")
+async def send_bulk_email(request: Request, email_req: BulkEmailRequest):
+    """
+    Send one template to many recipients through provider batch calls
+    
+    Up to 100 emails go out per Resend call, and at most BULK_EMAIL_MAX_RECIPIENTS
+    per request (default 300); split larger mailings across requests.
+    Returns a per-recipient status.
+    
+    Rate limit: 5/minute
+    """
+    from email_service import EmailService, BATCH_TEMPLATES
+    if email_req.template_id not in BATCH_TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unknown template_id '{email_req.template_id}'")
+    if len(email_req.recipients) > BULK_EMAIL_MAX_RECIPIENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many recipients. Maximum is {BULK_EMAIL_MAX_RECIPIENTS} per request"
+        )
+    
+    try:
+        results = await EmailService.send_batch(
+            email_req.template_id,
+            ({**r.data, "to_email": r.to_email, "user_name": r.user_name} for r in email_req.recipients)
+        )
+    except Exception as e:
+        print(f"Email error: {str(e)}")
+        raise HTTPException(status_code=500, detail="An error occurred sending the emails")
+    
+    sent = sum(1 for r in results if r["status"] == "sent")
+    return {"status": "completed", "sent": sent, "failed": len(results) - sent, "results": results}
+
+@app.get("/api/email/status/{message_id}", dependencies=[Depends(verify_api_key)])
+@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+async def get_email_status(request: Request, message_id: str):
+    """
+    Delivery status of a queued email: pending, sending, sent or dead
+    
+    Only available when EMAIL_DISPATCH_MODE=queue
+    """
+    if EMAIL_DISPATCH_MODE != "queue":
+        raise HTTPException(status_code=404, detail="Email queue is not enabled")
+    status = await get_email_queue().status(message_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown message id")
+    return status
+
+def server_options() -> Dict[str, Any]:
+    """
+    Keyword arguments for uvicorn.run according to SERVER_MODE.
+
+    Production mode forks one worker per CPU core (or WEB_CONCURRENCY), prefers
+    uvloop and httptools when they are installed, and gives in-flight uploads
+    and email sends SERVER_GRACEFUL_TIMEOUT_SECONDS to finish on SIGTERM.
+    """
+    if SERVER_MODE != "production":
+        return {"host": HOST, "port": PORT}
+
+    import importlib.util
+
+    def installed(module: str) -> bool:
+        return importlib.util.find_spec(module) is not None
+
+    if WEB_CONCURRENCY > 0:
+        workers = WEB_CONCURRENCY
+    elif hasattr(os, "sched_getaffinity"):
+        workers = len(os.sched_getaffinity(0))  # respects container CPU pinning
+    else:
+        workers = os.cpu_count() or 1
+
+    return {
+        "host": HOST,
+        "port": PORT,
+        "workers": workers,
+        "loop": "uvloop" if installed("uvloop") else "asyncio",
+        "http": "httptools" if installed("httptools") else "h11",
+        "backlog": SERVER_BACKLOG,
+        "timeout_keep_alive": SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "proxy_headers": True,
+        "server_header": False,
+        "access_log": False,
+    }
+
 if __name__ == "__main__":
     import uvicorn
     
+    options = server_options()
+    workers = options.get("workers", 1)
+
     # Validate required environment variables on startup
     print("🔒 Security Configuration:")
-    print(f"  ✓ Rate Limit: {RATE_LIMIT_PER_MINUTE} requests/minute")
+    print(f"  ✓ Rate Limit: {RATE_LIMIT_PER_MINUTE} requests/minute ({RATE_LIMIT_STRATEGY}, {RATE_LIMIT_STORAGE_URI.split('://')[0]})")
     print(f"  ✓ Upload Rate Limit: {UPLOAD_RATE_LIMIT_PER_MINUTE} uploads/minute")
-    print(f"  ✓ Max Upload Size: {MAX_UPLOAD_SIZE_MB}MB")
+    print(f"  ✓ Max Upload Size: {MAX_UPLOAD_SIZE_MB}MB ({UPLOAD_MODE} mode, {UPLOAD_STORE} store)")
     print(f"  ✓ Allowed CORS Origins: {', '.join(ALLOWED_ORIGINS)}")
     print(f"  ✓ Allowed File Types: {', '.join(ALLOWED_FILE_EXTENSIONS)}")
+    print(f"  ✓ Email Dispatch: {EMAIL_DISPATCH_MODE}")
+    print(f"🚀 Server: {SERVER_MODE} mode, {workers} worker(s)"
+          + (f", loop={options['loop']}, http={options['http']}" if SERVER_MODE == "production" else ""))
+    if workers > 1 and RATE_LIMIT_STORAGE_URI.startswith("memory://"):
+        print("  ⚠️ memory:// rate limits are per worker; set RATE_LIMIT_STORAGE_URI to share them")
+    if workers > 1 and METRICS_ENABLED:
+        if METRICS_DIR:
+            metrics.clear_snapshots(METRICS_DIR)
+        else:
+            print("  ⚠️ /metrics reports only the worker that answers; set METRICS_DIR to sum all workers")
     
-    uvicorn.run(app, host=HOST, port=PORT)
+    if workers > 1:
+        # Worker processes import the app themselves, so it has to be passed by name
+        uvicorn.run("main:app", app_dir=os.path.dirname(os.path.abspath(__file__)), **options)
+    else:
+        uvicorn.run(app, **options)
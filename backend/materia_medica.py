@@ -0,0 +1,341 @@
+"""
+Boericke's Materia Medica, split into remedies and sections, for Healio.AI
+
+The OCR text of the book (scripts/boericke.txt) is parsed once into
+remedies, each with its body-system sections as Boericke wrote them:
+a general description, then paragraphs headed "Mind. —", "Head. —",
+"Stomach. —" ... "Modalities. —", "Relationship. —", "Dose. —".
+
+The scan is noisy, so the parser works from the shape of the text rather
+than from exact strings:
+
+  - a remedy starts at an upper-case heading line ("ABROTANUM."), usually
+    followed by its common name in brackets ("(Southernwood.)"); running
+    page headers look the same but carry a page number, are followed by
+    the rest of a paragraph or a section, or repeat the current remedy;
+  - section labels are garbled too ("StooL", "Hose", "Relationsliip"), so
+    they are matched to SECTIONS with the bounded edit distance of
+    fuzzy_index, preferring sections that come after the current one
+    ("Bose" after "Relationship" is "Dose", not "Nose");
+  - headings are fixed against known remedy names (the curated homeopathic
+    list of the medicine database) when one is close enough, so
+    "ACONITUM NAPELLUS" is stored as the database's "Aconite Napellus".
+
+scripts/build_materia_medica.py writes the result to
+data/materia_medica.json; MateriaMedica loads it into dicts keyed by
+normalized remedy name, so a remedy's section is two dict lookups.
+"""
+
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fuzzy_index import bounded_distance, trigrams, words_of
+
+# Boericke's section order; rarer sections follow the ones they usually come after
+SECTIONS = (
+    "General", "Mind", "Head", "Vertigo", "Scalp", "Eyes", "Ears", "Nose", "Face", "Mouth", "Tongue", "Teeth",
+    "Gums", "Throat", "Neck", "Glands", "Stomach", "Gastric", "Liver", "Spleen", "Abdomen", "Bowels", "Rectum",
+    "Stool", "Anus", "Kidneys", "Bladder", "Urinary", "Urine", "Urethra", "Male", "Female", "Sexual", "Breasts",
+    "Pregnancy", "Respiratory", "Larynx", "Cough", "Chest", "Heart", "Circulation", "Pulse", "Back",
+    "Extremities", "Limbs", "Nerves", "Nervous", "Bones", "Tissues", "Sleep", "Skin", "Fever", "Generalities",
+    "Modalities", "Relationship", "Dose",
+)
+_SECTION_ORDER = {section.casefold(): order for order, section in enumerate(SECTIONS)}
+
+# The book runs from the title page of the materia medica to the repertory's first chapter
+_BOOK_START = re.compile(r"^MATERIA\s+MEDICA,", re.M)
+_BOOK_END = re.compile(r"^MIND\s*$", re.M)
+# "Stomach. — ...", "StooL — ...", "Extremities.^ — ...", "Eyes» — ...", "Extremities .  ~Shooting"
+_SECTION_START = re.compile(
+    r"^([A-Z][A-Za-z]{1,20}(?:[ -][A-Za-z]{2,20})?)\s*[.,:;*»«]?\s*[\^=]*\s*(?:—|-—|\^-|--|~)\s*\^*\s*")
+# "(Southernwood.}", "^^ (Gum of the Stinkasand.)", "tSavine.)"
+_COMMON_NAME = re.compile(r"^\S{0,8}\s*[({\[]\s*\W*[A-Za-z]|[)}]\W{0,4}$")
+# Page numbers as scanned: "8  ACONITUM", "lO  ACONITUM", "APIS  MBLWriCA.  Sq"
+_PAGE_NUMBER = re.compile(r"^\S*\d\S*\s|^[lI][Oo0-9]\S?\s|[.,]\s+(?:\S{1,3}\s*){1,2}$")
+# Two remedies on one page: "CYCLAMEN — CYPRIPEDIUM.", "FERRUM    METAL, FERRUM    PHOS."
+_TWO_NAMES = re.compile(r"—|[.,]\s*\S.*[.,]")
+# Junk left of a heading by the scan: "^H  ANAGALLIS.", "_  MORPHINUM.", "I  BORICUM ACIDUM"
+_LEADING_JUNK = re.compile(r"^(?:(?:[^A-Za-z\s]\S{0,3}|[A-Za-z](?:[^A-Za-z\s]\S?)?)\s+)+")
+_NOT_A_LETTER = re.compile(r"[^A-Za-z]+")
+_NOT_ALNUM = re.compile(r"[\W_]+")
+# Every heading has a run of capitals; checked before counting a line's letters
+_CAPITALS = re.compile(r"[A-Z]{3}")
+
+
+def remedy_key(name: str) -> str:
+    """Lookup key of a remedy name: case-folded words, so "Nux  Vomica." finds "nux vomica" """
+    return " ".join(words_of(name))
+
+
+def _upper_case(line: str) -> bool:
+    if not _CAPITALS.search(line):
+        return False
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 4 and sum(c.isupper() for c in letters) >= 0.8 * len(letters)
+
+
+def _is_noise(line: str) -> bool:
+    """Page numbers and specks of the scan standing alone on a line: "77", "Tog", "■" """
+    return len(line) <= 5 or len(_NOT_ALNUM.sub("", line)) <= 2
+
+
+class RemedyNames:
+    """Known remedy names, matched to OCR headings within a few edits"""
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = []
+        self._keys: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+        for name in names:
+            key = remedy_key(name)
+            if key and key not in self._keys:
+                # First words too, so a one-word heading ("ARUICA") can find "Arnica Montana"
+                for gram in set(trigrams(key)) | set(trigrams(key.split()[0])):
+                    self._postings.setdefault(gram, []).append(len(self.names))
+                self.names.append(name)
+                self._keys.append(key)
+        first_words = Counter(key.split()[0] for key in self._keys)
+        # Names of several words whose first word no other name starts with
+        self._unique_first_word = {key.split()[0] for key in self._keys
+                                   if len(key.split()) > 1 and first_words[key.split()[0]] == 1}
+
+    def match(self, heading: str) -> Optional[str]:
+        """
+        The known name a heading stands for, or None.
+
+        A name matches the whole heading, or its first words when the
+        heading adds a species ("Lycopodium" for "LYCOPODIUM CLAVATUM"),
+        allowing one edit per six letters (per eight for a prefix). The heading's own extra words
+        are kept: "Lycopodium Clavatum". A one-word heading also matches a
+        longer name by its first word, within the same bound, when no other
+        name starts with that word: "ARUICA" is "Arnica Montana".
+        """
+        key = remedy_key(heading)
+        words = key.split()
+        counts = Counter(name_id for gram in set(trigrams(key)) for name_id in self._postings.get(gram, ()))
+        best: Optional[Tuple[Tuple[int, int, int], int]] = None
+        for name_id, _ in counts.most_common(20):
+            name_words = self._keys[name_id].split()
+            if len(name_words) > len(words):
+                if len(words) != 1 or name_words[0] not in self._unique_first_word:
+                    continue
+                # The heading is the first word of the name
+                covered, target, bound = key, name_words[0], len(key) // 6
+            else:
+                covered, target = " ".join(words[:len(name_words)]), self._keys[name_id]
+                # A prefix only stands for a name with fewer edits: "Apium Graveolens" is not "Opium"
+                bound = len(covered) // (6 if len(name_words) == len(words) else 8)
+            distance = bounded_distance(covered, target, bound)
+            # The whole heading and whole name before a prefix of either
+            rank = (distance, max(len(words) - len(name_words), 0), max(len(name_words) - len(words), 0))
+            if distance <= bound and (best is None or rank < best[0]):
+                best = rank, name_id
+        if best is None:
+            return None
+        (_, extra, _), name_id = best
+        return " ".join([self.names[name_id]] + [word.capitalize() for word in words[len(words) - extra:]])
+
+
+def _clean_heading(line: str) -> str:
+    line = _LEADING_JUNK.sub("", line)
+    return " ".join(word.capitalize() for word in _NOT_A_LETTER.split(line) if len(word) > 1)
+
+
+def _common_name(line: str) -> str:
+    start = line.find("(")
+    text = line[start + 1:] if start >= 0 else line[next((i for i, c in enumerate(line) if c.isupper()), 0):]
+    return " ".join(text.translate(str.maketrans("(){}[]^*", "        ")).split()).strip(" .,;:'\"")
+
+
+@lru_cache(maxsize=None)
+def _sections_near(label: str) -> Tuple[Tuple[int, int], ...]:
+    """(distance, order) of the sections within a few edits of a case-folded label"""
+    if label in _SECTION_ORDER:
+        return ((0, _SECTION_ORDER[label]),)
+    bound = 1 if len(label) <= 5 else 2
+    distances = ((bounded_distance(label, section, bound), order) for section, order in _SECTION_ORDER.items())
+    return tuple(near for near in distances if near[0] <= bound)
+
+
+def _section_label(label: str, current: int) -> Optional[str]:
+    """The section a garbled label stands for; ties go to the next section after the current one"""
+    near = _sections_near(label.casefold())
+    if not near:
+        return None
+    _, _, order = min((distance, order <= current, order) for distance, order in near)
+    return SECTIONS[order]
+
+
+def _join(lines: List[str]) -> str:
+    """A paragraph's lines as one string, re-joining words hyphenated across lines"""
+    text = ""
+    for line in lines:
+        line = " ".join(line.split())
+        if text.endswith("-") and line[:1].islower():
+            text = text[:-1] + line
+        else:
+            text = f"{text} {line}" if text else line
+    return text
+
+
+def parse(text: str, names: Iterable[str] = ()) -> Dict[str, dict]:
+    """
+    Remedies of the book text (the whole scan; the materia medica part is found in it).
+
+    Args:
+        text: OCR text of Boericke's Materia Medica (scripts/boericke.txt)
+        names: known remedy names to fix headings against
+
+    Returns:
+        dict: remedy key -> {"name", "heading" (as scanned), "common_name",
+        "sections": {section: text}}, in book order
+    """
+    known = RemedyNames(names)
+    start = _BOOK_START.search(text)
+    if start:
+        text = text[text.find("\n", start.end()) + 1:]
+    end = _BOOK_END.search(text)
+    if end:
+        text = text[:end.start()]
+
+    # Non-blank lines, each with whether a blank line precedes it
+    lines: List[Tuple[str, bool]] = []
+    blank = True
+    for raw in text.split("\n"):
+        line = raw.strip()
+        if line:
+            lines.append((line, blank))
+        blank = not line
+
+    remedies: Dict[str, dict] = {}
+    remedy: Optional[dict] = None
+    paragraph: List[str] = []
+    paragraphs: List[List[str]] = []  # of the current remedy
+    page_break = False
+
+    def finish_remedy():
+        if paragraph:
+            paragraphs.append(paragraph[:])
+        if remedy is not None:
+            remedy["sections"] = _sections(paragraphs)
+        paragraphs.clear()
+        paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line, after_blank = lines[i]
+        starts_paragraph = after_blank or page_break
+        following = lines[i + 1][0] if i + 1 < len(lines) else ""
+        if starts_paragraph and _is_noise(line) and (i + 1 == len(lines) or lines[i + 1][1]):
+            page_break = True
+            i += 1
+            continue
+        if starts_paragraph and _upper_case(line):
+            header = _PAGE_NUMBER.search(line) or _TWO_NAMES.search(line.rstrip(" .,^*"))
+            heading = _clean_heading(line)
+            if (not header and not re.search(r"[.,]", line) and _upper_case(following)
+                    and len(following.split()) <= 2 and re.search(r"[.,]\W*$", following)):
+                # A heading broken over two lines: "ANTIMONIUM SULPHURATUM" / "AURATUM."
+                heading = _clean_heading(f"{line} {following}")
+                i += 1
+                following = lines[i + 1][0] if i + 1 < len(lines) else ""
+            common_name = len(following) <= 60 and _COMMON_NAME.search(following)
+            if heading and (common_name or not header and _opens_remedy(heading, following, remedy)):
+                finish_remedy()
+                name = known.match(heading) or heading
+                remedy = {"name": name, "heading": heading, "common_name": None, "sections": {}}
+                remedies.setdefault(remedy_key(name), remedy)
+                if common_name:
+                    remedy["common_name"] = _common_name(following) or None
+                    i += 1
+                page_break = False
+            else:
+                # A running page header: the paragraph it interrupted may go on after it
+                page_break = True
+            i += 1
+            continue
+        if remedy is not None:
+            section = _SECTION_START.match(line)
+            # Sections often start on the line after the previous one, without a blank line
+            if paragraph and (starts_paragraph and not (page_break and line[:1].islower())
+                              or section and _section_label(section.group(1), 0)):
+                paragraphs.append(paragraph[:])
+                paragraph.clear()
+            paragraph.append(line)
+        page_break = False
+        i += 1
+    finish_remedy()
+    return remedies
+
+
+def _opens_remedy(heading: str, following: str, remedy: Optional[dict]) -> bool:
+    """
+    Whether a heading without a common name starts a remedy: it has to be
+    followed by the start of a description, not by a page number, the rest
+    of a paragraph or a section, and must not repeat the current remedy.
+    """
+    if not following[:1].isupper() or _is_noise(following) or _upper_case(following):
+        return False
+    if _SECTION_START.match(following):
+        return False
+    bound = max(1, len(heading) // 4)
+    return remedy is None or bounded_distance(remedy_key(heading), remedy_key(remedy["heading"]), bound) > bound
+
+
+def _sections(paragraphs: List[List[str]]) -> Dict[str, str]:
+    sections: Dict[str, List[str]] = {}
+    current = "General"
+    for lines in paragraphs:
+        text = _join(lines)
+        match = _SECTION_START.match(text)
+        label = match and _section_label(match.group(1), _SECTION_ORDER[current.casefold()])
+        if label:
+            current = label
+            text = text[match.end():]
+        if text:
+            sections.setdefault(current, []).append(text)
+    return {section: "\n\n".join(texts) for section, texts in sections.items()}
+
+
+class MateriaMedica:
+    """Parsed remedies, looked up by remedy name (or its scanned heading) and section"""
+
+    def __init__(self, remedies: Dict[str, dict]):
+        self.remedies = remedies
+        # The first word of a name ("Arnica", "Aconite") when no other remedy starts with it
+        first_words: Dict[str, List[str]] = {}
+        for key in remedies:
+            first_words.setdefault(key.split()[0], []).append(key)
+        self._aliases = {word: keys[0] for word, keys in first_words.items() if len(keys) == 1}
+        # Headings as scanned find the remedy too, unless another remedy already has that name
+        self._aliases.update({remedy_key(remedy["heading"]): key for key, remedy in remedies.items()})
+        self._aliases.update({key: key for key in remedies})
+
+    @classmethod
+    def from_text(cls, text: str, names: Iterable[str] = ()) -> "MateriaMedica":
+        return cls(parse(text, names))
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"remedies": self.remedies}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "MateriaMedica":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["remedies"])
+
+    def get(self, name: str) -> Optional[dict]:
+        """A remedy by name: {"name", "heading", "common_name", "sections"}"""
+        key = self._aliases.get(remedy_key(name))
+        return self.remedies[key] if key is not None else None
+
+    def section(self, name: str, section: str) -> Optional[str]:
+        """One section of a remedy ("Stomach", "modalities"), or None"""
+        remedy = self.get(name)
+        order = _SECTION_ORDER.get(section.casefold())
+        if remedy is None or order is None:
+            return None
+        return remedy["sections"].get(SECTIONS[order])
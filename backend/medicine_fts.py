@@ -0,0 +1,171 @@
+"""
+SQLite full-text search over the unified medicine database for Healio.AI
+
+scripts/build_unified_database.py --sqlite writes the database to a SQLite
+file: a `medicines` table (category, letter, key, name, source) and an
+FTS5 index over it tokenized into trigrams:
+
+    medicines_fts(name, key UNINDEXED, category UNINDEXED, source UNINDEXED,
+                  content='medicines', tokenize='trigram')
+
+`key` is the lower-cased name and `source` the build input the name came
+from (csv, medicines_json, eml, herbs, ayurvedic_curated or
+homeopathic_curated). Only names are tokenized; the other columns are read
+from `medicines` for the matching rows.
+
+Rows are stored by category, then key, so a category is a range of rowids
+and rowid order is alphabetical. A query of 3 or more characters then
+never scans the table: FTS5 walks the matching rowids of the category's
+range in order and stops at the page size, and names starting with the
+query come from the (category, key) index. Shorter queries have no
+trigram and scan the range.
+
+MedicineFTS opens the file read-only with a pool of connections, so the
+backend can serve the catalogue from several threads at once without a
+separate search service.
+"""
+
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+FORMAT_VERSION = 1  # PRAGMA user_version
+
+# Idle connections kept open; more are opened under load and closed after use
+DEFAULT_POOL_SIZE = 4
+
+# Sorts after every character a key can contain
+_PREFIX_END = "\U0010ffff"
+
+
+def write_database(database: Dict[str, Dict[str, List[str]]], path: str,
+                   sources: Optional[Dict[Tuple[str, str], str]] = None):
+    """
+    Write the {category: {letter: [names]}} database to path, with each
+    name's source from sources[(category, name)] when given.
+
+    The file is written next to path and renamed over it, so open
+    connections keep reading the old one.
+    """
+    sources = sources or {}
+    partial = path + ".tmp"
+    if os.path.exists(partial):
+        os.remove(partial)
+    db = sqlite3.connect(partial)
+    try:
+        db.execute("CREATE TABLE medicines (id INTEGER PRIMARY KEY, category TEXT NOT NULL, "
+                   "letter TEXT NOT NULL, key TEXT NOT NULL, name TEXT NOT NULL, source TEXT)")
+        db.execute("CREATE TABLE categories (name TEXT PRIMARY KEY, first_id INTEGER NOT NULL, "
+                   "last_id INTEGER NOT NULL)")
+        next_id = 1
+        for category, letters in database.items():
+            rows = sorted((name.lower(), name, letter) for letter, names in letters.items() for name in names)
+            db.executemany("INSERT INTO medicines VALUES (?, ?, ?, ?, ?, ?)", (
+                (next_id + i, category, letter, key, name, sources.get((category, name)))
+                for i, (key, name, letter) in enumerate(rows)
+            ))
+            db.execute("INSERT INTO categories VALUES (?, ?, ?)", (category, next_id, next_id + len(rows) - 1))
+            next_id += len(rows)
+        db.execute("CREATE INDEX medicines_key ON medicines (category, key)")
+        db.execute("CREATE VIRTUAL TABLE medicines_fts USING fts5(name, key UNINDEXED, category UNINDEXED, "
+                   "source UNINDEXED, content='medicines', content_rowid='id', tokenize='trigram')")
+        db.execute("INSERT INTO medicines_fts(medicines_fts) VALUES ('rebuild')")
+        # Merge the index segments written during the load into one b-tree
+        db.execute("INSERT INTO medicines_fts(medicines_fts) VALUES ('optimize')")
+        db.execute(f"PRAGMA user_version = {FORMAT_VERSION}")
+        db.commit()
+    finally:
+        db.close()
+    os.replace(partial, path)
+
+
+class MedicineFTS:
+    """Substring search over a database written by write_database"""
+
+    def __init__(self, path: str, pool_size: int = DEFAULT_POOL_SIZE):
+        self._uri = Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=pool_size)
+        with self._connection() as db:
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported medicine search database format: {version}")
+            # Category -> (first rowid, last rowid)
+            self._ranges: Dict[str, Tuple[int, int]] = {
+                name: (first, last) for name, first, last in db.execute("SELECT name, first_id, last_id FROM categories")
+            }
+        self.categories: Dict[str, int] = {name: last - first + 1 for name, (first, last) in self._ranges.items()}
+
+    @classmethod
+    def load(cls, path: str) -> "MedicineFTS":
+        return cls(path)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            db = self._pool.get_nowait()
+        except queue.Empty:
+            db = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        try:
+            yield db
+        finally:
+            try:
+                self._pool.put_nowait(db)
+            except queue.Full:
+                db.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def search(self, query: str, category: Optional[str] = None,
+               limit: int = 40) -> Tuple[List[Dict[str, Optional[str]]], int]:
+        """
+        Names containing `query`, ignoring case: those starting with it first,
+        then alphabetically.
+
+        Returns:
+            (results, total): up to `limit` [{"name", "category", "source"}],
+            and how many names match
+
+        Raises:
+            KeyError: if category is not in the database
+        """
+        key = query.strip().lower()
+        if not key or limit <= 0:
+            return [], 0
+        if len(key) >= 3:
+            # One phrase: its trigrams must be consecutive, i.e. a substring
+            table, contains, pattern = "medicines_fts", "medicines_fts MATCH ?", '"' + key.replace('"', '""') + '"'
+        else:
+            table, contains, pattern = "medicines", "instr(key, ?) > 0", key
+        names = [category] if category is not None else list(self._ranges)
+        ranges = [(name, self._ranges[name]) for name in names]
+
+        hits = []
+        total = 0
+        with self._connection() as db:
+            for name, (first, last) in ranges:
+                prefixed = db.execute(
+                    "SELECT key, name, source FROM medicines WHERE category = ? AND key >= ? AND key < ? "
+                    "ORDER BY key LIMIT ?", (name, key, key + _PREFIX_END, limit)
+                ).fetchall()
+                rest = []
+                if len(prefixed) < limit:
+                    rest = db.execute(
+                        f"SELECT key, name, source FROM {table} WHERE {contains} AND rowid BETWEEN ? AND ? "
+                        "AND NOT (key >= ? AND key < ?) ORDER BY rowid LIMIT ?",
+                        (pattern, first, last, key, key + _PREFIX_END, limit - len(prefixed))
+                    ).fetchall()
+                total += db.execute(f"SELECT count(*) FROM {table} WHERE {contains} AND rowid BETWEEN ? AND ?",
+                                    (pattern, first, last)).fetchone()[0]
+                hits += [(False, *row, name) for row in prefixed] + [(True, *row, name) for row in rest]
+        # Never compare sources: the same name can carry one in one category and None in another
+        hits.sort(key=lambda hit: (hit[0], hit[1], hit[2], hit[4]))
+        return [{"name": match, "category": name, "source": source}
+                for _, _, match, source, name in hits[:limit]], total
@@ -0,0 +1,102 @@
+"""
+Medicine name prefix index for Healio.AI
+
+Loads data/unified_medicines_database.json (written by
+scripts/build_unified_database.py) into one sorted array of normalized names
+per category. A prefix query is two binary searches that bound the matching
+run, so a top-k lookup costs O(log n + k) no matter how many of the ~250k
+names share the query's first letter.
+"""
+
+import json
+from bisect import bisect_left
+from heapq import merge
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CATEGORIES = ("Allopathic", "Ayurvedic", "Homeopathic")
+
+# Sorts after every character a normalized name can contain
+_PREFIX_END = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    """Case-insensitive lookup key with whitespace runs collapsed"""
+    return " ".join(text.casefold().split())
+
+
+class PrefixIndex:
+    """Names of one category as parallel arrays sorted by normalized key"""
+
+    __slots__ = ("keys", "names")
+
+    def __init__(self, names: Iterable[str]):
+        pairs = sorted({(normalize(name), name.strip()) for name in names if name.strip()})
+        self.keys: List[str] = [key for key, _ in pairs]
+        self.names: List[str] = [name for _, name in pairs]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """[start, end) positions of the keys starting with a normalized prefix"""
+        start = bisect_left(self.keys, prefix)
+        return start, bisect_left(self.keys, prefix + _PREFIX_END, start)
+
+    def search(self, prefix: str, limit: int) -> Tuple[List[Tuple[str, str]], int]:
+        """Up to `limit` (key, name) pairs in key order, and the total number of matches"""
+        start, end = self.prefix_range(prefix)
+        stop = min(end, start + limit)
+        return list(zip(self.keys[start:stop], self.names[start:stop])), end - start
+
+
+class MedicineIndex:
+    """Per-category prefix indexes over the unified medicine database"""
+
+    def __init__(self, categories: Dict[str, PrefixIndex]):
+        self.categories = categories
+
+    @classmethod
+    def from_database(cls, database: Dict[str, Dict[str, List[str]]]) -> "MedicineIndex":
+        """Build from the {category: {letter: [names]}} layout of the unified database"""
+        return cls({
+            category: PrefixIndex(name for names in letters.values() for name in names)
+            for category, letters in database.items()
+        })
+
+    @classmethod
+    def load(cls, path: str) -> "MedicineIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_database(json.load(f))
+
+    def counts(self) -> Dict[str, int]:
+        return {category: len(index) for category, index in self.categories.items()}
+
+    def autocomplete(self, query: str, category: Optional[str] = None,
+                     limit: int = 10) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Top-k names starting with `query`, alphabetically (a name before its extensions).
+
+        Args:
+            query: Typed prefix; matching ignores case and extra whitespace
+            category: One of CATEGORIES, or None for all of them
+            limit: Maximum number of results
+
+        Returns:
+            (results, total): [{"name", "category"}] in key order, and how many names match
+
+        Raises:
+            KeyError: if category is not in the database
+        """
+        prefix = normalize(query)
+        if not prefix or limit <= 0:
+            return [], 0
+        names = [category] if category else list(self.categories)
+        hits = []
+        total = 0
+        for name in names:
+            matches, count = self.categories[name].search(prefix, limit)
+            hits.append([(key, match, name) for key, match in matches])
+            total += count
+        ranked = islice(merge(*hits), limit) if len(hits) > 1 else hits[0]
+        return [{"name": match, "category": name} for _, match, name in ranked], total
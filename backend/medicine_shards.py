@@ -0,0 +1,104 @@
+"""
+Sharded unified medicine database for Healio.AI
+
+scripts/build_unified_database.py --shards writes the database as one
+minified JSON array of names per category and letter, each precompressed
+as .gz and (when the brotli package is installed) .br, so a static server
+can send it with Content-Encoding as is. manifest.json holds every
+shard's name count, SHA-256 and sizes; a client fetches or loads only the
+letters it needs and can use the hash to tell when one changed:
+
+    {"format": 1, "categories": {"Allopathic": {"A": {"file": "Allopathic/A.json",
+     "count": 20311, "sha256": "...", "bytes": 512340, "gzip_bytes": 98012, "brotli_bytes": 80345}}}}
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+try:
+    import brotli
+except ImportError:  # .br shards are optional
+    brotli = None
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def shard_name(letter: str) -> str:
+    """File stem of a letter bucket; "#" (names not starting with a letter) is "_", which needs no URL escaping"""
+    return "_" if letter == "#" else letter
+
+
+def write_shards(database: Dict[str, Dict[str, List[str]]], directory: str) -> dict:
+    """
+    Write every letter bucket of the {category: {letter: [names]}} database
+    under directory, and the manifest last. Shards of letters no longer in
+    the database are removed. Returns the manifest.
+    """
+    categories = {}
+    written = {os.path.join(directory, MANIFEST_NAME)}
+    for category, letters in database.items():
+        os.makedirs(os.path.join(directory, category), exist_ok=True)
+        categories[category] = {}
+        for letter, names in letters.items():
+            file = f"{category}/{shard_name(letter)}.json"
+            path = os.path.join(directory, file)
+            data = json.dumps(names, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            # mtime=0 so that unchanged names give byte-identical files
+            compressed = {".gz": gzip.compress(data, 9, mtime=0)}
+            if brotli is not None:
+                compressed[".br"] = brotli.compress(data, quality=11)
+            for suffix, content in [("", data), *compressed.items()]:
+                with open(path + suffix, "wb") as f:
+                    f.write(content)
+                written.add(path + suffix)
+            entry = {"file": file, "count": len(names), "sha256": hashlib.sha256(data).hexdigest(),
+                     "bytes": len(data), "gzip_bytes": len(compressed[".gz"])}
+            if ".br" in compressed:
+                entry["brotli_bytes"] = len(compressed[".br"])
+            categories[category][letter] = entry
+
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if os.path.join(root, file) not in written:
+                os.remove(os.path.join(root, file))
+    manifest = {"format": FORMAT_VERSION, "categories": categories}
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+class ShardedDatabase:
+    """The manifest of a sharded database; shards are read on first use"""
+
+    def __init__(self, directory: str, manifest: dict):
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported shard manifest format: {manifest.get('format')}")
+        self.directory = directory
+        self.manifest = manifest
+        self._shards: Dict[str, List[str]] = {}
+
+    @classmethod
+    def load(cls, directory: str) -> "ShardedDatabase":
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            return cls(directory, json.load(f))
+
+    def counts(self) -> Dict[str, int]:
+        return {category: sum(entry["count"] for entry in letters.values())
+                for category, letters in self.manifest["categories"].items()}
+
+    def letter(self, category: str, letter: str) -> List[str]:
+        """
+        The names of one letter bucket, as in the unified database.
+
+        Raises:
+            KeyError: if the category or letter is not in the manifest
+        """
+        file = self.manifest["categories"][category][letter]["file"]
+        if file not in self._shards:
+            with open(os.path.join(self.directory, file), encoding="utf-8") as f:
+                self._shards[file] = json.load(f)
+        return self._shards[file]
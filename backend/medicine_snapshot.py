@@ -0,0 +1,111 @@
+"""
+Columnar snapshot of the unified medicine database for Healio.AI
+
+scripts/build_unified_database.py --snapshot writes the database as one
+Arrow IPC file with a row per name:
+
+    category  dictionary<int8, string>    Allopathic, Ayurvedic, Homeopathic
+    letter    dictionary<int16, string>   the database's letter bucket
+    name      string                      display name
+    key       string                      medicine_index.normalize(name)
+
+Rows are grouped by category and letter in the database's order, and the
+schema metadata records the [start, stop) rows of each bucket. The file is
+uncompressed, so MedicineSnapshot.load memory-maps it and reads only the
+footer: every view is a slice of the mapped pages, start-up takes
+milliseconds and the names never occupy Python heap. (Parquet pages are
+encoded and must be decoded into memory, so they cannot be mapped.)
+
+Needs pyarrow (an optional backend dependency).
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from medicine_index import normalize
+
+FORMAT_VERSION = 1
+_FORMAT_KEY = b"healio.format"
+_RUNS_KEY = b"healio.runs"
+
+
+def write_snapshot(database: Dict[str, Dict[str, List[str]]], path: str):
+    """
+    Write the {category: {letter: [names]}} database to path.
+
+    The file is written next to path and renamed over it, so on Linux a
+    server that has the old snapshot mapped keeps reading the old pages.
+    """
+    import pyarrow as pa
+
+    categories = list(database)
+    letters = sorted({letter for buckets in database.values() for letter in buckets})
+    letter_ids = {letter: i for i, letter in enumerate(letters)}
+    category_column, letter_column, names = [], [], []
+    runs = {}
+    for category_id, category in enumerate(categories):
+        runs[category] = {}
+        for letter, bucket in database[category].items():
+            runs[category][letter] = [len(names), len(names) + len(bucket)]
+            names.extend(bucket)
+            category_column.extend([category_id] * len(bucket))
+            letter_column.extend([letter_ids[letter]] * len(bucket))
+
+    table = pa.table({
+        "category": pa.DictionaryArray.from_arrays(pa.array(category_column, pa.int8()), pa.array(categories)),
+        "letter": pa.DictionaryArray.from_arrays(pa.array(letter_column, pa.int16()), pa.array(letters)),
+        "name": pa.array(names, pa.string()),
+        "key": pa.array([normalize(name) for name in names], pa.string()),
+    }).replace_schema_metadata({_FORMAT_KEY: str(FORMAT_VERSION), _RUNS_KEY: json.dumps(runs)})
+
+    partial = path + ".tmp"
+    with pa.OSFile(partial, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(partial, path)
+
+
+class MedicineSnapshot:
+    """Zero-copy views by category and letter over a memory-mapped snapshot"""
+
+    def __init__(self, table, runs: Dict[str, Dict[str, List[int]]]):
+        self.table = table
+        self.runs = runs
+
+    @classmethod
+    def load(cls, path: str) -> "MedicineSnapshot":
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        metadata = table.schema.metadata or {}
+        if metadata.get(_FORMAT_KEY) != str(FORMAT_VERSION).encode():
+            raise ValueError(f"Unsupported snapshot format: {metadata.get(_FORMAT_KEY)}")
+        return cls(table, json.loads(metadata[_RUNS_KEY]))
+
+    def counts(self) -> Dict[str, int]:
+        return {category: sum(stop - start for start, stop in runs.values())
+                for category, runs in self.runs.items()}
+
+    def letters(self, category: str) -> List[str]:
+        return list(self.runs[category])
+
+    def view(self, category: str, letter: Optional[str] = None):
+        """
+        The rows of a category, or of one of its letters, as a pyarrow Table
+        sharing the mapped buffers.
+
+        Raises:
+            KeyError: if the category or letter is not in the snapshot
+        """
+        runs = self.runs[category]
+        if letter is not None:
+            start, stop = runs[letter]
+        elif runs:
+            start, stop = min(run[0] for run in runs.values()), max(run[1] for run in runs.values())
+        else:
+            start = stop = 0
+        return self.table.slice(start, stop - start)
+
+    def names(self, category: str, letter: Optional[str] = None):
+        """Display names of view(category, letter), as a pyarrow ChunkedArray"""
+        return self.view(category, letter).column("name")
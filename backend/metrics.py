@@ -0,0 +1,280 @@
+"""
+Metrics for Healio.AI backend
+
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format for GET /metrics.
+
+Every update runs on the event loop thread and is a dict lookup plus an add,
+so no locks are taken and the request middleware adds about 3µs per request
+(benchmarks/bench_metrics_overhead.py).
+Each uvicorn worker process keeps its own values. When METRICS_DIR is set,
+every worker periodically writes a snapshot there, and /metrics reports the
+sum over all workers whichever one answers the scrape.
+"""
+
+import json
+import os
+import tempfile
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Seconds; covers fast JSON endpoints through slow uploads and provider calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: List["Metric"] = []
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: Dict[Tuple[str, ...], Any] = {}
+        _registry.append(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "help": self.help, "labels": self.labels,
+                "series": [[list(key), value] for key, value in self.values.items()]}
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1):
+        values = self.values
+        values[label_values] = values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 collect: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, labels)
+        # Gauges with a collect callback are read at scrape time and never summed across workers
+        self.collect = collect
+
+    def inc(self, *label_values: str, amount: float = 1):
+        values = self.values
+        values[label_values] = values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1):
+        values = self.values
+        values[label_values] = values.get(label_values, 0) - amount
+
+    def set(self, value: float, *label_values: str):
+        self.values[label_values] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values: str):
+        # Per-bucket (non-cumulative) counts plus a final +Inf slot, then the sum
+        series = self.values.get(label_values)
+        if series is None:
+            series = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot["buckets"] = self.buckets
+        return snapshot
+
+
+# ---------------------------------------------------------------------------
+# Application metrics
+# ---------------------------------------------------------------------------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+HTTP_RATE_LIMITED = Counter(
+    "http_rate_limited_total", "Requests rejected with 429 by the rate limiter", ("route",)
+)
+UPLOAD_BYTES = Counter("upload_bytes_total", "Bytes accepted by POST /upload", ("mode",))
+EMAIL_SEND_DURATION = Histogram(
+    "email_send_duration_seconds", "Email provider call latency", ("kind",)
+)
+EMAIL_SENDS = Counter(
+    "email_sends_total", "Email provider calls by outcome (sent, failed, timeout)", ("kind", "outcome")
+)
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and in-flight requests.
+
+    Routes are labelled by their template (/api/email/status/{message_id}),
+    not the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.values
+        in_flight[()] = in_flight.get((), 0) + 1
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                perf_counter() - start,
+                scope["method"], route.path if route is not None else "unmatched", str(status),
+            )
+            in_flight[()] -= 1
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _merge(snapshots: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Sum series of the same metric across worker snapshots"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "series": {}})
+            for labels, value in metric["series"]:
+                key = tuple(labels)
+                current = target["series"].get(key)
+                if current is None:
+                    target["series"][key] = [list(value[0]), value[1]] if metric["kind"] == "histogram" else value
+                elif metric["kind"] == "histogram":
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                else:
+                    target["series"][key] = current + value
+    return merged
+
+
+def _local_snapshot() -> Dict[str, Dict[str, Any]]:
+    return {metric.name: metric.snapshot() for metric in _registry
+            if not (isinstance(metric, Gauge) and metric.collect)}
+
+
+def write_snapshot(directory: str):
+    """Atomically publish this process's values for the other workers to read"""
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(_local_snapshot(), f)
+    os.replace(temp_path, os.path.join(directory, f"metrics-{os.getpid()}.json"))
+
+
+def clear_snapshots(directory: str):
+    """Remove snapshots left by a previous server run (call before starting workers)"""
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.startswith("metrics-") and name.endswith(".json"):
+            os.unlink(os.path.join(directory, name))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def render(directory: Optional[str] = None) -> str:
+    """
+    Prometheus text format (version 0.0.4).
+
+    With a directory, this process's values are published first and the
+    snapshots of every worker are summed. Counters and histograms of exited
+    workers are kept so they never go backwards; their gauges are dropped,
+    since a dead worker has nothing in flight.
+    """
+    if directory:
+        write_snapshot(directory)
+        snapshots = []
+        for name in os.listdir(directory):
+            if name.startswith("metrics-") and name.endswith(".json"):
+                try:
+                    with open(os.path.join(directory, name)) as f:
+                        snapshot = json.load(f)
+                except (OSError, ValueError):
+                    continue  # worker exited or file replaced mid-read
+                pid = name[len("metrics-"):-len(".json")]
+                if pid.isdigit() and not _pid_alive(int(pid)):
+                    snapshot = {metric_name: metric for metric_name, metric in snapshot.items()
+                                if metric["kind"] != "gauge"}
+                snapshots.append(snapshot)
+        merged = _merge(snapshots)
+    else:
+        merged = _merge([_local_snapshot()])
+
+    lines = []
+    for metric in _registry:
+        if isinstance(metric, Gauge) and metric.collect:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} gauge")
+            lines.append(f"{metric.name} {_format_value(metric.collect())}")
+            continue
+        if metric.name not in merged:
+            continue
+        data = merged[metric.name]
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for key, value in sorted(data["series"].items()):
+            if metric.kind != "histogram":
+                lines.append(f"{metric.name}{_label_text(metric.labels, key)} {_format_value(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(list(data["buckets"]) + [float("inf")], counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{metric.name}_bucket{_label_text(metric.labels, key, le)} {cumulative}")
+            lines.append(f"{metric.name}_sum{_label_text(metric.labels, key)} {_format_value(total)}")
+            lines.append(f"{metric.name}_count{_label_text(metric.labels, key)} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,350 @@
+"""
+Shared Rate Limit Storage for Healio.AI
+
+slowapi keeps its counters in process memory by default, so N uvicorn
+workers allow N times the configured limit. Importing this module
+registers two extra `limits` storage backends that every worker shares:
+
+  sqlite:///path/to/ratelimit.db   one host, any number of processes
+  resp://host:6379/0               several nodes, any Redis-protocol server
+
+Both support the fixed-window and sliding-window-counter strategies.
+Select one with RATE_LIMIT_STORAGE_URI (see main.py).
+"""
+
+import math
+import socket
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport
+
+
+def sliding_window_keys(key: str, expiry: int, now: float) -> Tuple[str, str]:
+    """Keys of the previous and current fixed windows that make up a sliding window"""
+    return f"{key}/{int((now - expiry) / expiry)}", f"{key}/{int(now / expiry)}"
+
+
+def sliding_window_info(
+    previous_count: int, current_count: int, expiry: int, now: float
+) -> Tuple[int, float, int, float]:
+    """(previous count, previous ttl, current count, current ttl) as `limits` expects"""
+    previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+    current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+    return previous_count, previous_ttl, current_count, current_ttl
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Rate limit counters in a SQLite file shared by all workers on one host.
+
+    Every check-and-increment runs inside one IMMEDIATE transaction, so
+    concurrent processes cannot overshoot the limit.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    # Delete expired counters once every this many writes
+    PURGE_EVERY = 1000
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        # sqlite:///relative.db or sqlite:////absolute/path.db
+        path = uri.split("://", 1)[1]
+        path = (path[1:] if path.startswith("/") else path) or "ratelimit.sqlite3"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=OFF")  # counters are disposable
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS counters ("
+            "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _get(self, key: str, now: float) -> int:
+        row = self._db.execute(
+            "SELECT count FROM counters WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _incr(self, key: str, expiry: float, amount: int, now: float) -> int:
+        """Increment inside the caller's transaction; expired counters restart"""
+        self._db.execute(
+            "INSERT INTO counters (key, count, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "count = CASE WHEN expires_at <= ? THEN excluded.count ELSE count + excluded.count END, "
+            "expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END",
+            (key, amount, now + expiry, now, now),
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._db.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+        return self._get(key, now)
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn()
+                self._db.execute("COMMIT")
+                return result
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._transaction(lambda: self._incr(key, expiry, amount, time.time()))
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._get(key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at FROM counters WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self._lock:
+                self._db.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            return self._db.execute("DELETE FROM counters").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM counters WHERE key = ?", (key,))
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        def acquire() -> bool:
+            now = time.time()
+            previous_key, current_key = sliding_window_keys(key, expiry, now)
+            previous_count, previous_ttl, current_count, _ = sliding_window_info(
+                self._get(previous_key, now), self._get(current_key, now), expiry, now
+            )
+            if math.floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            self._incr(current_key, 2 * expiry, amount, now)
+            return True
+
+        return self._transaction(acquire)
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = sliding_window_keys(key, expiry, now)
+        with self._lock:
+            return sliding_window_info(
+                self._get(previous_key, now), self._get(current_key, now), expiry, now
+            )
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        for window_key in sliding_window_keys(key, expiry, time.time()):
+            self.clear(window_key)
+
+
+class RespError(Exception):
+    """Error reply or protocol failure from a Redis-protocol server"""
+
+
+class RespConnection:
+    """
+    Minimal blocking RESP2 client: pipelined commands over one socket.
+
+    Only what the rate limiter needs; reconnects on the next call after
+    a network error.
+    """
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None,
+                 timeout: float = 1.0):
+        self.host, self.port, self.db, self.password, self.timeout = host, port, db, password, timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock, self._file = sock, sock.makefile("rb")
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            self._pipeline(setup)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._file = None
+
+    @staticmethod
+    def _encode(command: tuple) -> bytes:
+        out = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            arg = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    def _read(self):
+        line = self._file.readline()
+        if not line:
+            raise RespError("Connection closed by server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return RespError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count == -1 else [self._read() for _ in range(count)]
+        raise RespError(f"Unexpected reply: {line!r}")
+
+    def _pipeline(self, commands: List[tuple]) -> list:
+        self._sock.sendall(b"".join(self._encode(c) for c in commands))
+        replies = [self._read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def pipeline(self, *commands: tuple) -> list:
+        """Send all commands in one write and return their replies in order"""
+        if self._sock is None:
+            self._connect()
+        try:
+            return self._pipeline(list(commands))
+        except (OSError, RespError):
+            self.close()
+            raise
+
+    def execute(self, *command):
+        return self.pipeline(tuple(command))[0]
+
+
+class RespStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Rate limit counters on a Redis-protocol server shared by several nodes.
+
+    Uses only plain commands (GET, INCRBY, DECRBY, PEXPIRE, PTTL, DEL,
+    SCAN), so it works against Redis, Valkey, KeyDB or a test fake, and
+    needs no client library.
+    """
+
+    STORAGE_SCHEME = ["resp"]
+    PREFIX = "LIMITS:"
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        parsed = urlparse(uri)
+        db = int(parsed.path.lstrip("/") or 0)
+        self._lock = threading.Lock()
+        self._conn = RespConnection(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            db=db,
+            password=parsed.password,
+            timeout=float(options.pop("socket_timeout", 1.0)),
+        )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return (OSError, RespError)
+
+    def _pipeline(self, *commands: tuple) -> list:
+        with self._lock:
+            return self._conn.pipeline(*commands)
+
+    def _incr(self, key: str, expiry: float, amount: int) -> int:
+        key = self.PREFIX + key
+        count, ttl = self._pipeline(("INCRBY", key, amount), ("PTTL", key))
+        if ttl < 0:
+            # New (or persisted) counter: start its window now
+            self._pipeline(("PEXPIRE", key, int(expiry * 1000)))
+        return count
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._incr(key, expiry, amount)
+
+    def get(self, key: str) -> int:
+        return int(self._pipeline(("GET", self.PREFIX + key))[0] or 0)
+
+    def get_expiry(self, key: str) -> float:
+        ttl = self._pipeline(("PTTL", self.PREFIX + key))[0]
+        return time.time() + max(ttl, 0) / 1000
+
+    def check(self) -> bool:
+        try:
+            return self._pipeline(("PING",))[0] == "PONG"
+        except self.base_exceptions:
+            return False
+
+    def reset(self) -> Optional[int]:
+        removed, cursor = 0, b"0"
+        while True:
+            cursor, keys = self._pipeline(("SCAN", cursor, "MATCH", self.PREFIX + "*", "COUNT", 1000))[0]
+            if keys:
+                removed += self._pipeline(("DEL", *keys))[0]
+            if cursor in (b"0", "0"):
+                return removed
+
+    def clear(self, key: str) -> None:
+        self._pipeline(("DEL", self.PREFIX + key))
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = sliding_window_keys(key, expiry, now)
+        previous, current = self._pipeline(
+            ("GET", self.PREFIX + previous_key), ("GET", self.PREFIX + current_key)
+        )
+        previous_count, previous_ttl, current_count, _ = sliding_window_info(
+            int(previous or 0), int(current or 0), expiry, now
+        )
+        if math.floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+            return False
+        current_count = self._incr(current_key, 2 * expiry, amount)
+        if math.floor(previous_count * previous_ttl / expiry + current_count) > limit:
+            # Another node won the race for the last slot: give ours back
+            self._pipeline(("DECRBY", self.PREFIX + current_key, amount))
+            return False
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = sliding_window_keys(key, expiry, now)
+        previous, current = self._pipeline(
+            ("GET", self.PREFIX + previous_key), ("GET", self.PREFIX + current_key)
+        )
+        return sliding_window_info(int(previous or 0), int(current or 0), expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = sliding_window_keys(key, expiry, time.time())
+        self._pipeline(("DEL", self.PREFIX + previous_key, self.PREFIX + current_key))
@@ -0,0 +1,136 @@
+"""
+Homeopathic repertorization for Healio.AI
+
+The repertory imported from OpenRep (sql_chunks/: the sym_rem table links
+symptom ids - rubrics - to remedies with a grade of 1 to 5, once per
+source) is held as a CSR matrix of symptom rows x remedy columns with
+integer-coded ids, as numpy indptr / indices / grades arrays. A symptom
+listed by several sources keeps its highest grade for a remedy.
+
+Repertorizing a case sums the graded remedy scores of its rubrics (each
+optionally weighted by its intensity in the case): one sparse row-sum,
+gathering the case's rows from the CSR arrays and adding them up per
+remedy with np.bincount. Remedies are ranked by that total, then by how
+many of the case's rubrics they cover. scipy is not used: for a few dozen
+rows, building its matrices cost more than the sum itself.
+
+scripts/build_repertory.py parses the SQL dump once into
+data/repertory.npz, which this loads in milliseconds. Needs numpy, an
+optional backend dependency (installed in the Docker image); main.py
+imports this module on first use.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class RepertoryEngine:
+    """Symptom x remedy grade matrix (CSR arrays) and case scoring"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, grades: np.ndarray, symptom_ids: np.ndarray,
+                 remedy_ids: np.ndarray, remedy_abbrevs: Sequence[str], remedy_names: Sequence[str]):
+        # CSR: the remedies of row r are indices[indptr[r]:indptr[r + 1]], graded grades[...]
+        self.indptr = indptr
+        self.indices = indices
+        self.grades = grades
+        self.symptom_ids = symptom_ids  # sorted; row r is symptom symptom_ids[r]
+        self.remedy_ids = remedy_ids
+        self.remedy_abbrevs = list(remedy_abbrevs)
+        self.remedy_names = list(remedy_names)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.symptom_ids), len(self.remedy_ids)
+
+    @classmethod
+    def build(cls, links: Iterable[Tuple[int, int, int]],
+              remedies: Dict[int, Tuple[str, str]]) -> "RepertoryEngine":
+        """
+        Args:
+            links: (sym_id, rem_id, grade) rows of sym_rem
+            remedies: rem_id -> (abbreviation, name) from the remedies table
+        """
+        rows = np.array(list(links), dtype=np.int64).reshape(-1, 3)
+        symptom_ids, symptom_rows = np.unique(rows[:, 0], return_inverse=True)
+        remedy_ids, remedy_columns = np.unique(rows[:, 1], return_inverse=True)
+        # Highest grade of each (symptom, remedy) pair over all sources: sort and keep the last of each run
+        order = np.lexsort((rows[:, 2], remedy_columns, symptom_rows))
+        symptom_rows, remedy_columns, grades = symptom_rows[order], remedy_columns[order], rows[order, 2]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = (symptom_rows[1:] != symptom_rows[:-1]) | (remedy_columns[1:] != remedy_columns[:-1])
+        indptr = np.zeros(len(symptom_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(symptom_rows[last], minlength=len(symptom_ids)), out=indptr[1:])
+        names = [remedies.get(int(rem_id), (f"rem-{rem_id}", f"Remedy {rem_id}")) for rem_id in remedy_ids]
+        return cls(indptr, remedy_columns[last].astype(np.intp), grades[last].astype(np.float64), symptom_ids,
+                   remedy_ids, [abbrev for abbrev, _ in names], [name for _, name in names])
+
+    def save(self, path: str):
+        np.savez_compressed(path, indptr=self.indptr, indices=self.indices.astype(np.uint16),
+                            grades=self.grades.astype(np.uint8), symptom_ids=self.symptom_ids,
+                            remedy_ids=self.remedy_ids, remedy_abbrevs=np.array(self.remedy_abbrevs),
+                            remedy_names=np.array(self.remedy_names))
+
+    @classmethod
+    def load(cls, path: str) -> "RepertoryEngine":
+        with np.load(path) as data:
+            # float64 grades: np.bincount sums its weights in float64 and would convert them on every case
+            return cls(data["indptr"].astype(np.int64), data["indices"].astype(np.intp),
+                       data["grades"].astype(np.float64), data["symptom_ids"].astype(np.int64),
+                       data["remedy_ids"], data["remedy_abbrevs"].tolist(), data["remedy_names"].tolist())
+
+    def rows_of(self, symptom_ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Matrix rows of the given symptom ids, and a mask of the ids that are in the repertory"""
+        # Ids the array's dtype cannot hold are not in the repertory; look them up as 0 and drop them after
+        bounds = np.iinfo(self.symptom_ids.dtype)
+        in_range = np.array([bounds.min <= i <= bounds.max for i in symptom_ids], dtype=bool)
+        ids = np.array([i if ok else 0 for i, ok in zip(symptom_ids, in_range)], dtype=self.symptom_ids.dtype)
+        rows = np.minimum(np.searchsorted(self.symptom_ids, ids), len(self.symptom_ids) - 1)
+        known = (self.symptom_ids[rows] == ids) & in_range
+        return rows[known], known
+
+    def scores(self, symptom_ids: Sequence[int],
+               weights: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+        """
+        Totals and covered rubric counts of every remedy for a case: the
+        weighted sum of the case's rows, gathered straight from the CSR arrays.
+
+        Returns:
+            tuple: (weighted grade totals, rubrics covered) per remedy column,
+            and the symptom ids that are not in the repertory
+        """
+        rows, known = self.rows_of(symptom_ids)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        # Positions of every entry of the selected rows, in one arange instead of a slice per row
+        positions = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        columns = self.indices[positions]
+        grades = self.grades[positions]
+        if weights is not None:
+            grades = grades * np.repeat(np.asarray(weights, dtype=np.float64)[known], lengths)
+        totals = np.bincount(columns, weights=grades, minlength=len(self.remedy_ids))
+        covered = np.bincount(columns, minlength=len(self.remedy_ids))
+        unknown = [int(i) for i, found in zip(symptom_ids, known) if not found]
+        return totals, covered, unknown
+
+    def repertorize(self, symptom_ids: Sequence[int], weights: Optional[Sequence[float]] = None,
+                    limit: int = 20) -> Dict[str, list]:
+        """
+        Remedies ranked for a case, by weighted grade total, then rubrics covered.
+
+        Returns:
+            dict: "results" ({"abbreviation", "name", "score", "rubrics"} per
+            remedy, best first) and "unknown_symptoms"
+        """
+        totals, covered, unknown = self.scores(symptom_ids, weights)
+        candidates = np.flatnonzero(covered)
+        if len(candidates) > limit:
+            # Only remedies tied with or above the limit-th total can make the cut
+            threshold = np.partition(totals[candidates], -limit)[-limit]
+            candidates = candidates[totals[candidates] >= threshold]
+        best = candidates[np.lexsort((candidates, -covered[candidates], -totals[candidates]))][:limit]
+        return {
+            "results": [{"abbreviation": self.remedy_abbrevs[i], "name": self.remedy_names[i],
+                         "score": float(totals[i]), "rubrics": int(covered[i])} for i in best],
+            "unknown_symptoms": unknown,
+        }
@@ -0,0 +1,109 @@
+"""
+Symptom search over the home remedies corpus for Healio.AI
+
+Each ailment in data/home_remedies/nuskhe.json is a document made of its
+symptoms_keywords and its English and Hinglish names. An inverted index maps
+each word to the ailments using it, with the Okapi BM25 weight of every
+posting computed when the index is built; a query only adds up the weights
+on the posting lists of its words. A query word missing from the vocabulary
+falls back to the words sharing its phonetic key (see transliteration.py),
+so "jukam" and "ज़ुकाम" find "zukam" while "nose" stays apart from "nausea".
+"""
+
+import json
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from transliteration import phonetic_key, to_latin
+
+# Okapi BM25 parameters: term frequency saturation and document length normalization
+K1 = 1.2
+B = 0.75
+
+_STOPWORDS = {
+    "a", "an", "and", "or", "of", "the", "in", "on", "with", "without", "to", "for", "from", "my", "is", "at",
+    "mein", "me", "se", "ka", "ki", "ke", "ko", "aur", "na", "hai",
+}
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def terms_of(text: str) -> List[str]:
+    return [word for word in _WORD.findall(to_latin(text)) if word not in _STOPWORDS]
+
+
+def document_text(ailment: dict) -> List[str]:
+    """The fields of an ailment that describe its symptoms"""
+    return [*ailment.get("symptoms_keywords", []), ailment["ailment"], *(ailment.get("ailment_hindi") or "").split("/")]
+
+
+class SymptomIndex:
+    """Term -> [(ailment id, BM25 weight)] over the ailments of nuskhe.json"""
+
+    def __init__(self, ailments: List[dict]):
+        self.ailments = ailments
+        documents = [terms_of(" ".join(document_text(ailment))) for ailment in ailments]
+        average_length = sum(map(len, documents)) / max(1, len(documents))
+
+        frequencies: Dict[str, Dict[int, int]] = {}
+        for doc_id, terms in enumerate(documents):
+            for term in terms:
+                counts = frequencies.setdefault(term, {})
+                counts[doc_id] = counts.get(doc_id, 0) + 1
+
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for term, counts in frequencies.items():
+            idf = math.log(1 + (len(documents) - len(counts) + 0.5) / (len(counts) + 0.5))
+            self.postings[term] = [
+                (doc_id, idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len(documents[doc_id]) / average_length)))
+                for doc_id, tf in counts.items()
+            ]
+        # Phonetic key -> vocabulary words, for query words spelled differently
+        self._spellings: Dict[str, List[str]] = {}
+        for term in self.postings:
+            self._spellings.setdefault(phonetic_key(term), []).append(term)
+
+    @classmethod
+    def load(cls, path: str) -> "SymptomIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def score(self, symptoms: Iterable[str]) -> Dict[int, float]:
+        """BM25 score of every ailment sharing a term with the symptoms"""
+        terms = set()
+        for word in terms_of(" ".join(symptoms)):
+            terms.update([word] if word in self.postings else self._spellings.get(phonetic_key(word), ()))
+        scores: Dict[int, float] = {}
+        for term in terms:
+            for doc_id, weight in self.postings[term]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        return scores
+
+    def search(self, symptoms: Iterable[str], limit: int = 5,
+               remedies_per_ailment: Optional[int] = None) -> List[Dict[str, object]]:
+        """
+        Ailments best matching a set of symptoms, with their remedies.
+
+        Args:
+            symptoms: Symptom phrases in English, Hinglish or Devanagari
+            limit: Maximum number of ailments
+            remedies_per_ailment: Remedies returned per ailment (None for all),
+                named remedies first as in the source file
+
+        Returns:
+            list: {"id", "ailment", "ailment_hindi", "score", "remedies"} dicts, best first
+        """
+        scores = self.score(symptoms)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:max(0, limit)]
+        results = []
+        for doc_id, score in ranked:
+            ailment = self.ailments[doc_id]
+            remedies = ailment.get("remedies", [])
+            results.append({
+                "id": ailment["id"],
+                "ailment": ailment["ailment"],
+                "ailment_hindi": ailment.get("ailment_hindi") or None,
+                "score": round(score, 4),
+                "remedies": remedies if remedies_per_ailment is None else remedies[:remedies_per_ailment],
+            })
+        return results
@@ -0,0 +1,55 @@
+"""
+Cold start imports for the Vercel deployment.
+
+Imports main under `python -X importtime` with VERCEL set and checks that
+the deferred modules stay out of the cold start. The import time itself
+is measured by benchmarks/bench_cold_start.py.
+
+Run: python test_cold_start.py   (or via pytest)
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Loaded on the first request that needs them, never at import
+DEFERRED_MODULES = {
+    "dotenv", "slowapi", "limits", "resend", "requests",
+    "email_service", "email_queue", "rate_limit_storage",
+    "numpy", "scipy", "condition_engine",
+    # Data indexes are imported by their DATA_INDEXES loader
+    "medicine_index", "fuzzy_index", "symptom_index", "herb_query", "drug_classes", "drug_interactions",
+    "repertory", "materia_medica", "transliteration", "medicine_fts",
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile() -> list:
+    """(cumulative_us, depth, module) per line of `python -X importtime -c 'import main'`"""
+    env = dict(os.environ, VERCEL="1")
+    env.pop("LAZY_INIT", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    profile = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            profile.append((int(match.group(2)), (len(match.group(3)) - 1) // 2, match.group(4)))
+    return profile
+
+
+def test_cold_start_defers_heavy_modules():
+    imported = {name.split(".")[0] for _, _, name in import_profile()}
+    eager = DEFERRED_MODULES & imported
+    assert not eager, f"imported at cold start: {sorted(eager)}"
+
+
+if __name__ == "__main__":
+    test_cold_start_defers_heavy_modules()
+    print("✅ TEST PASSED: Heavy modules are deferred at cold start.")
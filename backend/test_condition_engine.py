@@ -0,0 +1,58 @@
+"""
+Condition matching engine tests.
+
+Run: python test_condition_engine.py   (or via pytest)
+Needs numpy and scipy (optional backend dependencies); skipped without them.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+HAS_SCIPY = importlib.util.find_spec("scipy") is not None
+
+CONDITIONS = [
+    {"code": "G43.0", "name": "Migraine without aura", "prevalence": "common", "severity": "moderate-severe",
+     "symptoms_text": "Severe throbbing pain on one side of head. Sensitive to light and sound. Nausea and vomiting.",
+     "match_criteria": {"types": ["throbbing", "pulsating"], "symptomWeights": {"nausea": {"weight": 2.0}}}},
+    {"code": "G44.2", "name": "Tension-type headache", "prevalence": "very_common", "severity": "mild-moderate",
+     "symptoms_text": "Dull, aching pain on both sides of head. Tightness or pressure. No nausea.",
+     "match_criteria": {"types": ["dull", "aching", "tight", "pressure"], "absentSymptoms": ["nausea", "vomiting"]}},
+    {"code": "J00", "name": "Common cold", "prevalence": "very_common", "severity": "mild",
+     "symptoms_text": "Runny nose, sneezing, sore throat."},
+]
+
+
+@pytest.mark.skipif(not HAS_SCIPY, reason="scipy not installed")
+def test_symptoms_rank_conditions_and_absent_symptoms_count_against():
+    from condition_engine import ConditionEngine
+    engine = ConditionEngine(CONDITIONS)
+    migraine, tension = engine.rank(["throbbing head pain", "nausea"])
+    assert (migraine["code"], tension["code"]) == ("G43.0", "G44.2")
+    without_nausea = {r["code"]: r["score"] for r in engine.rank(["throbbing head pain"])}
+    assert tension["score"] < without_nausea["G44.2"]  # its text says "No nausea"
+    assert engine.rank(["dull pressure", "head pain"])[0]["code"] == "G44.2"
+    assert engine.rank(["unrelated words"]) == []
+
+
+@pytest.mark.skipif(not HAS_SCIPY, reason="scipy not installed")
+def test_batch_matches_single_vignettes():
+    from condition_engine import ConditionEngine
+    engine = ConditionEngine(CONDITIONS)
+    vignettes = [["runny nose", "sneezing"], ["pulsating pain", "vomiting"], [], ["dull ache"]]
+    assert engine.rank_batch(vignettes, 2) == [engine.rank(v, 2) for v in vignettes]
+    assert engine.rank_batch(vignettes, 2)[0][0]["code"] == "J00"
+
+
+if __name__ == "__main__":
+    if not HAS_SCIPY:
+        print("⚠️ TESTS SKIPPED: numpy/scipy not installed.")
+        sys.exit(0)
+    test_symptoms_rank_conditions_and_absent_symptoms_count_against()
+    print("✅ TEST PASSED: Symptoms rank conditions; absent symptoms count against.")
+    test_batch_matches_single_vignettes()
+    print("✅ TEST PASSED: Batch scoring matches single vignettes.")
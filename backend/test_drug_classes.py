@@ -0,0 +1,46 @@
+"""
+Drug class reverse index tests.
+
+Run: python test_drug_classes.py   (or via pytest)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from drug_classes import DrugClassIndex, normalize_drug
+
+CLASSES = {
+    "ACE inhibitors": ["lisinopril systemic", "enalapril systemic", "About Drugs.com", "Privacy policy"],
+    "ACE inhibitors with thiazides": ["hydrochlorothiazide / lisinopril systemic"],
+    "Non-cardioselective beta blockers": ["timolol systemic", "propranolol systemic"],
+    "Ophthalmic glaucoma agents": ["timolol ophthalmic", "latanoprost ophthalmic"],
+}
+
+
+def test_names_normalize_to_sorted_ingredients_and_route():
+    assert normalize_drug("Lisinopril + Hydrochlorothiazide 20mg/12.5 mg Tablet") == \
+        ("hydrochlorothiazide / lisinopril", None)
+    assert normalize_drug("timolol ophthalmic") == ("timolol", "ophthalmic")
+
+
+def test_medication_list_resolves_in_one_call():
+    index = DrugClassIndex(CLASSES)
+    results = index.resolve(["Lisinopril 10 mg", "lisinopril/hydrochlorothiazide", "Timolol",
+                             "timolol ophthalmic", "unknownumab"])
+    assert [r["classes"] for r in results] == [
+        ["ACE inhibitors"],
+        ["ACE inhibitors with thiazides"],
+        ["Non-cardioselective beta blockers", "Ophthalmic glaucoma agents"],
+        ["Ophthalmic glaucoma agents"],
+        [],
+    ]
+    assert index.classes_of("privacy policy") == []  # scraped site links are not drugs
+
+
+if __name__ == "__main__":
+    test_names_normalize_to_sorted_ingredients_and_route()
+    print("✅ TEST PASSED: Names normalize to sorted ingredients and route.")
+    test_medication_list_resolves_in_one_call()
+    print("✅ TEST PASSED: A medication list resolves in one call.")
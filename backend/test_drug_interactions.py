@@ -0,0 +1,74 @@
+"""
+Class-level drug interaction screening tests.
+
+Run: python test_drug_interactions.py   (or via pytest)
+The cohort test needs numpy (an optional backend dependency); skipped without it.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from drug_classes import DrugClassIndex
+from drug_interactions import InteractionMatrix, severity_name
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+CLASSES = {
+    "Coumarins and indandiones": ["warfarin systemic"],
+    "Nonsteroidal anti-inflammatory drugs": ["ibuprofen systemic", "naproxen systemic"],
+    "Salicylates": ["aspirin systemic"],
+    "Platelet aggregation inhibitors": ["aspirin systemic", "clopidogrel systemic"],
+    "Beta-adrenergic blocking agents": ["metoprolol systemic"],
+    "Sulfonylureas": ["glipizide systemic"],
+    "Proton pump inhibitors": ["omeprazole systemic"],
+}
+INTERACTIONS = [
+    {"classes": ["Coumarins and indandiones", "Nonsteroidal anti-inflammatory drugs"], "severity": "major",
+     "effect": "Bleeding"},
+    {"classes": ["Coumarins and indandiones", "Platelet aggregation inhibitors"], "severity": "major",
+     "effect": "Bleeding"},
+    {"classes": ["Salicylates", "Platelet aggregation inhibitors"], "severity": "moderate", "effect": "Test only"},
+    {"classes": ["Beta-adrenergic blocking agents", "Sulfonylureas"], "severity": "minor",
+     "effect": "Masked hypoglycemia"},
+]
+
+
+def setup():
+    index = DrugClassIndex(CLASSES)
+    return index, InteractionMatrix(index.class_names, INTERACTIONS)
+
+
+def test_medication_list_pairs_are_screened_by_class():
+    index, matrix = setup()
+    medications = ["Metoprolol 50 mg", "warfarin", "omeprazole", "Aspirin 81 mg", "glipizide"]
+    found = matrix.screen([index.class_ids_of(m) for m in medications])
+    assert [(hit["medications"], hit["severity"]) for hit in found] == [((1, 3), "major"), ((0, 4), "minor")]
+    assert found[0]["classes"] == ("Coumarins and indandiones", "Platelet aggregation inhibitors")
+    # aspirin is both a salicylate and a platelet inhibitor: classes of one drug never interact with each other
+    assert matrix.screen([index.class_ids_of("aspirin")]) == []
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+def test_cohort_screen_matches_single_screens():
+    index, matrix = setup()
+    cohort = [["warfarin", "ibuprofen", "naproxen", "aspirin"], ["aspirin"], [], ["metoprolol", "glipizide"],
+              ["omeprazole", "unknownumab"]]
+    patients = [[index.class_ids_of(m) for m in medications] for medications in cohort]
+    counts, worst = matrix.screen_cohort(patients)
+    assert counts.tolist() == [len(matrix.screen(p)) for p in patients] == [3, 0, 0, 1, 0]
+    assert [severity_name(code) for code in worst] == ["major", None, None, "minor", None]
+
+
+if __name__ == "__main__":
+    test_medication_list_pairs_are_screened_by_class()
+    print("✅ TEST PASSED: Medication list pairs are screened by class.")
+    if not HAS_NUMPY:
+        print("⚠️ TEST SKIPPED: numpy not installed (cohort screening).")
+        sys.exit(0)
+    test_cohort_screen_matches_single_screens()
+    print("✅ TEST PASSED: Cohort screening matches single screens.")
@@ -0,0 +1,240 @@
+"""
+Persistent email queue tests.
+
+- Failed sends are retried with exponential backoff, and dead-lettered
+  after the last attempt.
+- A message whose lease expires (crashed worker) is claimed again.
+- Waiting for another process's write lock must not block the event loop.
+- With LAZY_INIT the queue is opened by the first email request, not at import.
+- With EMAIL_DISPATCH_MODE=queue the API answers 202 with a message id
+  whose status can be looked up, while a local fake Resend server takes
+  the send.
+
+Run: python test_email_queue.py   (or via pytest)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from email_queue import EmailQueue  # noqa: E402
+
+RETRY_BASE_SECONDS = 0.1
+
+
+def drain(queue: EmailQueue, message_id: str, done, timeout: float = 10.0) -> dict:
+    """Run the workers until done(status) is true, then stop them"""
+    async def run():
+        queue.start()
+        try:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                status = await queue.status(message_id)
+                if done(status):
+                    return status
+                await asyncio.sleep(0.02)
+            raise AssertionError(f"gave up waiting, last status {status}")
+        finally:
+            await queue.stop()
+    return asyncio.run(run())
+
+
+def test_failed_sends_retry_with_backoff():
+    attempts = []
+
+    async def flaky(**payload):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RuntimeError("provider unavailable")
+        return True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = EmailQueue(os.path.join(tmp, "queue.sqlite3"), {"health_tip": flaky}, workers=2,
+                           max_attempts=5, retry_base_seconds=RETRY_BASE_SECONDS)
+        message_id = asyncio.run(queue.enqueue("health_tip", {"to_email": "patient@example.com"}))
+        status = drain(queue, message_id, lambda s: s["status"] == "sent")
+        queue.close()
+
+    assert status == {"message_id": message_id, "status": "sent", "attempts": 3, "last_error": None}
+    # Delays of base * 2**(attempt - 1), less at most 20% jitter
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    assert gaps[0] >= RETRY_BASE_SECONDS * 0.8 and gaps[1] >= RETRY_BASE_SECONDS * 2 * 0.8
+
+
+def test_last_failed_attempt_moves_message_to_dead_letters():
+    async def failing(**payload):
+        return False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = EmailQueue(os.path.join(tmp, "queue.sqlite3"), {"reminder": failing},
+                           max_attempts=3, retry_base_seconds=0.01)
+        message_id = asyncio.run(queue.enqueue("reminder", {"to_email": "patient@example.com"}))
+        status = drain(queue, message_id, lambda s: s["status"] == "dead")
+        dead = queue.dead_letters()
+        assert queue.depth() == 0
+        queue.close()
+
+    assert status["attempts"] == 3 and status["last_error"] == "Provider rejected or failed the send"
+    assert [(d["message_id"], d["kind"], d["attempts"]) for d in dead] == [(message_id, "reminder", 3)]
+
+
+def test_expired_lease_is_claimed_again():
+    async def never_called(**payload):
+        raise AssertionError("no worker is running")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = EmailQueue(os.path.join(tmp, "queue.sqlite3"), {"diagnosis": never_called}, lease_seconds=0.2)
+        message_id = asyncio.run(queue.enqueue("diagnosis", {"to_email": "patient@example.com"}))
+        # A worker claims the message and crashes before marking it sent or failed
+        assert queue._claim()[::3] == (message_id, 1)
+        assert queue._claim() is None
+        assert asyncio.run(queue.status(message_id))["status"] == "sending"
+        time.sleep(0.25)
+        assert queue._claim()[::3] == (message_id, 2)
+        assert queue.depth() == 1
+        queue.close()
+
+
+def test_event_loop_runs_while_another_process_holds_the_write_lock():
+    async def never_called(**payload):
+        raise AssertionError("no worker is running")
+
+    async def enqueue_while_locked(queue: EmailQueue, path: str) -> int:
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        enqueued = asyncio.ensure_future(queue.enqueue("diagnosis", {"to_email": "patient@example.com"}))
+        ticks = 0
+        for _ in range(10):
+            await asyncio.sleep(0.02)
+            ticks += 1
+        assert not enqueued.done()
+        blocker.execute("COMMIT")
+        blocker.close()
+        await enqueued
+        return ticks
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queue.sqlite3")
+        queue = EmailQueue(path, {"diagnosis": never_called})
+        assert asyncio.run(enqueue_while_locked(queue, path)) == 10
+        assert queue.depth() == 1
+        queue.close()
+
+
+def test_lazy_init_does_not_open_the_queue_at_import():
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, VERCEL="1", EMAIL_DISPATCH_MODE="queue",
+                   EMAIL_QUEUE_PATH=os.path.join(tmp, "email_queue.sqlite3"))
+        env.pop("LAZY_INIT", None)
+        subprocess.run([sys.executable, "-c", "import sys, main; "
+                        "assert main.email_queue is None and 'email_queue' not in sys.modules"],
+                       cwd=BACKEND_DIR, env=env, check=True)
+        assert os.listdir(tmp) == []
+
+
+class FakeResendHandler(BaseHTTPRequestHandler):
+    """Answers POST /emails like Resend"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"id": "fake-email-id"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def request(url: str, payload: dict = None) -> tuple:
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.status, json.loads(resp.read())
+
+
+def test_queued_email_returns_202_and_reports_status():
+    fake = ThreadingHTTPServer(("127.0.0.1", 0), FakeResendHandler)
+    threading.Thread(target=fake.serve_forever, daemon=True).start()
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            RESEND_API_KEY="re_test",
+            RESEND_API_URL=f"http://127.0.0.1:{fake.server_address[1]}",
+            BACKEND_API_KEY="",
+            EMAIL_DISPATCH_MODE="queue",
+            EMAIL_QUEUE_PATH=os.path.join(tmp, "email_queue.sqlite3"),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        base = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(100):
+                try:
+                    request(base + "/")
+                    break
+                except OSError:
+                    time.sleep(0.1)
+
+            code, body = request(base + "/api/email/health-tip", {
+                "to_email": "patient@example.com", "user_name": "Test Patient",
+                "tip_title": "Hydration", "tip_content": "Drink water regularly.",
+            })
+            assert code == 202 and body["status"] == "queued"
+            for _ in range(100):
+                code, status = request(f"{base}/api/email/status/{body['message_id']}")
+                if status["status"] == "sent":
+                    break
+                time.sleep(0.05)
+            missing = None
+            try:
+                request(base + "/api/email/status/unknown")
+            except urllib.error.HTTPError as e:
+                missing = e.code
+        finally:
+            server.terminate()
+            server.wait()
+            fake.shutdown()
+
+    assert code == 200 and status == {"message_id": body["message_id"], "status": "sent", "attempts": 1,
+                                      "last_error": None}
+    assert missing == 404
+
+
+if __name__ == "__main__":
+    test_failed_sends_retry_with_backoff()
+    print("✅ TEST PASSED: Failed sends retry with backoff.")
+    test_last_failed_attempt_moves_message_to_dead_letters()
+    print("✅ TEST PASSED: Last failed attempt moves the message to dead letters.")
+    test_expired_lease_is_claimed_again()
+    print("✅ TEST PASSED: Expired lease is claimed again.")
+    test_event_loop_runs_while_another_process_holds_the_write_lock()
+    print("✅ TEST PASSED: Event loop runs while another process holds the write lock.")
+    test_lazy_init_does_not_open_the_queue_at_import()
+    print("✅ TEST PASSED: Lazy init does not open the queue at import.")
+    test_queued_email_returns_202_and_reports_status()
+    print("✅ TEST PASSED: Queued email returns 202 and reports its status.")
@@ -0,0 +1,198 @@
+"""
+Email service tests against a local fake Resend server.
+
+- Slow sends must not stall the event loop: runs the API under uvicorn
+  with a provider that takes EMAIL_DELAY seconds per send and measures
+  health check latency while emails are in flight.
+- Bulk sends must be grouped into provider batch calls of at most 100
+  and report a status for every recipient.
+
+Run: python test_email_service.py   (or via pytest)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+EMAIL_DELAY = 2.0
+CONCURRENT_EMAILS = 5
+MAX_HEALTH_LATENCY = 0.25
+
+
+class FakeResendHandler(BaseHTTPRequestHandler):
+    """Answers POST /emails and /emails/batch like Resend, only slowly"""
+
+    delay = EMAIL_DELAY
+    batch_sizes = []
+    missing_ids = 0  # ids left off the end of each batch response
+
+    def do_POST(self):
+        sent = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        time.sleep(self.delay)
+        if self.path == "/emails/batch":
+            self.batch_sizes.append(len(sent))
+            response = {"data": [{"id": f"fake-email-{i}"} for i in range(len(sent) - self.missing_ids)]}
+        else:
+            response = {"id": "fake-email-id"}
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get(url: str) -> float:
+    start = time.perf_counter()
+    urllib.request.urlopen(url, timeout=10).read()
+    return time.perf_counter() - start
+
+
+def post_json(url: str, payload: dict, statuses: list):
+    req = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        statuses.append(resp.status)
+
+
+def test_health_check_stays_fast_while_emails_in_flight():
+    fake = ThreadingHTTPServer(("127.0.0.1", 0), FakeResendHandler)
+    threading.Thread(target=fake.serve_forever, daemon=True).start()
+
+    port = free_port()
+    env = dict(
+        os.environ,
+        RESEND_API_KEY="re_test",
+        RESEND_API_URL=f"http://127.0.0.1:{fake.server_address[1]}",
+        BACKEND_API_KEY="",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                get(base + "/")
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        payload = {
+            "to_email": "patient@example.com",
+            "user_name": "Test Patient",
+            "diagnosis_summary": "Tension headache",
+            "top_conditions": [{"name": "Tension headache", "confidence": 82}],
+            "consultation_id": "c-123",
+        }
+        statuses = []
+        senders = [
+            threading.Thread(target=post_json, args=(base + "/api/email/diagnosis", payload, statuses))
+            for _ in range(CONCURRENT_EMAILS)
+        ]
+        for t in senders:
+            t.start()
+        time.sleep(0.3)  # let the sends reach the fake provider
+
+        latencies = [get(base + "/") for _ in range(10)]
+        for t in senders:
+            t.join()
+    finally:
+        server.terminate()
+        server.wait()
+        fake.shutdown()
+
+    print(f"Health check latency while emails in flight: max {max(latencies) * 1000:.1f}ms")
+    assert statuses == [200] * CONCURRENT_EMAILS
+    assert max(latencies) < MAX_HEALTH_LATENCY
+
+
+def test_send_batch_groups_recipients_into_provider_batches():
+    sys.path.insert(0, BACKEND_DIR)
+    import resend
+    from email_service import EmailService
+
+    FakeResendHandler.delay = 0
+    FakeResendHandler.batch_sizes = []
+    fake = ThreadingHTTPServer(("127.0.0.1", 0), FakeResendHandler)
+    threading.Thread(target=fake.serve_forever, daemon=True).start()
+    resend.api_key = "re_test"
+    resend.api_url = f"http://127.0.0.1:{fake.server_address[1]}"
+
+    recipients = (
+        {
+            "to_email": f"patient{i}@example.com",
+            "user_name": f"Patient {i}",
+            "reminder_type": "medication",
+            "reminder_details": {"medicine": "Metformin", "dosage": "500mg", "time": "8:00 AM"},
+        }
+        for i in range(250)
+    )
+    # Missing reminder_details cannot be rendered and must be reported, not sent
+    broken = [{"to_email": "broken@example.com", "user_name": "Broken", "reminder_type": "medication"}]
+    try:
+        results = asyncio.run(EmailService.send_batch("reminder", list(recipients) + broken))
+    finally:
+        fake.shutdown()
+        FakeResendHandler.delay = EMAIL_DELAY
+
+    assert FakeResendHandler.batch_sizes == [100, 100, 50]
+    assert len(results) == 251
+    assert all(r["status"] == "sent" and r["id"] for r in results[:250])
+    assert results[250]["status"] == "failed" and results[250]["to_email"] == "broken@example.com"
+
+
+def test_send_batch_fails_recipients_without_an_id():
+    sys.path.insert(0, BACKEND_DIR)
+    import resend
+    from email_service import EmailService
+
+    FakeResendHandler.delay = 0
+    FakeResendHandler.missing_ids = 2
+    fake = ThreadingHTTPServer(("127.0.0.1", 0), FakeResendHandler)
+    threading.Thread(target=fake.serve_forever, daemon=True).start()
+    resend.api_key = "re_test"
+    resend.api_url = f"http://127.0.0.1:{fake.server_address[1]}"
+
+    recipients = [
+        {"to_email": f"patient{i}@example.com", "user_name": f"Patient {i}", "tip_title": "Hydration",
+         "tip_content": "Drink water regularly."}
+        for i in range(5)
+    ]
+    try:
+        results = asyncio.run(EmailService.send_batch("health_tip", recipients))
+    finally:
+        fake.shutdown()
+        FakeResendHandler.delay = EMAIL_DELAY
+        FakeResendHandler.missing_ids = 0
+
+    assert [r["status"] for r in results] == ["sent"] * 3 + ["failed"] * 2
+    assert all(r["error"] for r in results[3:])
+
+
+if __name__ == "__main__":
+    test_health_check_stays_fast_while_emails_in_flight()
+    print("✅ TEST PASSED: Event loop stays responsive during email sends.")
+    test_send_batch_groups_recipients_into_provider_batches()
+    print("✅ TEST PASSED: Bulk emails are grouped into provider batches.")
+    test_send_batch_fails_recipients_without_an_id()
+    print("✅ TEST PASSED: Recipients without a returned id are reported failed.")
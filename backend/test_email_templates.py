@@ -0,0 +1,58 @@
+"""
+Email template escaping tests.
+
+User fields must be HTML-escaped in the HTML body, exactly once, and left
+as typed in the plain-text alternative; SafeHTML markup is inserted as is.
+
+Run: python test_email_templates.py   (or via pytest)
+"""
+
+import html
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from email_service import EmailService  # noqa: E402
+from email_templates import CompiledTemplate, SafeHTML  # noqa: E402
+
+EVIL = '<script>alert("x")</script> & Sons'
+ESCAPED = html.escape(EVIL)
+
+
+def emails():
+    """Resend params of every template, with EVIL in each user field"""
+    yield EmailService.build_diagnosis_complete(
+        "patient@example.com", EVIL, f"Diagnosis: {EVIL}", [{"name": EVIL, "confidence": 82}], "c-123"
+    )
+    yield EmailService.build_reminder(
+        "patient@example.com", EVIL, "medication", {"medicine": EVIL, "dosage": EVIL, "time": EVIL}
+    )
+    yield EmailService.build_reminder(
+        "patient@example.com", EVIL, "appointment",
+        {"doctor": EVIL, "date": EVIL, "time": EVIL, "location": EVIL}
+    )
+    yield EmailService.build_reminder("patient@example.com", EVIL, "general", {"message": EVIL})
+    yield EmailService.build_health_tip("patient@example.com", EVIL, EVIL, EVIL)
+
+
+def test_user_fields_are_escaped_in_html_only():
+    for email in emails():
+        assert "<script>" not in email["html"] and 'alert("x")' not in email["html"]
+        assert ESCAPED in email["html"]
+        # Nested templates (conditions, reminder details) are escaped once, not twice
+        assert "&amp;amp;" not in email["html"] and "&amp;lt;" not in email["html"]
+        assert EVIL in email["text"] and ESCAPED not in email["text"]
+
+
+def test_safe_html_passes_through():
+    template = CompiledTemplate("<p>{{ body }}</p>")
+    assert template.render(body=SafeHTML("<b>Tom &amp; Jerry</b>")) == "<p><b>Tom &amp; Jerry</b></p>"
+    assert template.render(body="<b>Tom & Jerry</b>") == "<p>&lt;b&gt;Tom &amp; Jerry&lt;/b&gt;</p>"
+
+
+if __name__ == "__main__":
+    test_user_fields_are_escaped_in_html_only()
+    print("✅ TEST PASSED: User fields are escaped in HTML only.")
+    test_safe_html_passes_through()
+    print("✅ TEST PASSED: SafeHTML passes through.")
@@ -0,0 +1,65 @@
+"""
+Fuzzy medicine search index tests.
+
+Run: python test_fuzzy_index.py   (or via pytest)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fuzzy_index import FuzzyIndex, bounded_distance
+
+DATABASE = {
+    "Allopathic": {
+        "A": ["Amoxicillin", "Amoxicillin 500mg Capsule", "Amlodipine", "Augmentin"],
+        "P": ["Paracetamol 500mg Tablet", "Paracetamol 650mg Tablet", "Pantoprazole"],
+    },
+    "Ayurvedic": {"A": ["Ashwagandha", "Ashwagandha Churna", "Amla", "Arjuna"]},
+    "Homeopathic": {"A": ["Arnica Montana", "Aconite Napellus"]},
+}
+
+
+def test_bounded_distance_counts_transpositions_and_stops_at_bound():
+    assert bounded_distance("amoxicilin", "amoxicillin", 2) == 1
+    assert bounded_distance("paractemol", "paracetamol", 2) == 2
+    assert bounded_distance("asprin", "ashwagandha", 2) == 3
+
+
+def test_typos_find_names_ranked_by_distance_then_length():
+    index = FuzzyIndex.build(DATABASE)
+    results = index.search("amoxicilin")
+    assert [(r["name"], r["distance"]) for r in results] == [
+        ("Amoxicillin", 1), ("Amoxicillin 500mg Capsule", 1)]
+    assert [r["name"] for r in index.search("ashwaganda churan")] == ["Ashwagandha Churna"]
+    assert index.search("paracetmol 650mg")[0]["name"] == "Paracetamol 650mg Tablet"
+    # doses and short words must match exactly
+    assert index.search("paracetamol 600mg") == []
+
+
+def test_category_filter_and_saved_index_round_trip():
+    built = FuzzyIndex.build(DATABASE)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fuzzy.json")
+        built.save(path)
+        index = FuzzyIndex.load(path)
+    assert index.search("arnika montana", limit=5) == built.search("arnika montana", limit=5)
+    assert [r["category"] for r in index.search("amla", "Ayurvedic")] == ["Ayurvedic"]
+    assert index.search("amla", "Homeopathic") == []
+    try:
+        index.search("amla", "Unani")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("unknown category should raise KeyError")
+
+
+if __name__ == "__main__":
+    test_bounded_distance_counts_transpositions_and_stops_at_bound()
+    print("✅ TEST PASSED: Bounded edit distance handles transpositions and the bound.")
+    test_typos_find_names_ranked_by_distance_then_length()
+    print("✅ TEST PASSED: Typo queries find names ranked by distance.")
+    test_category_filter_and_saved_index_round_trip()
+    print("✅ TEST PASSED: Category filter and saved index round trip.")
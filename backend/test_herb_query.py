@@ -0,0 +1,55 @@
+"""
+Herb property query engine tests.
+
+Run: python test_herb_query.py   (or via pytest)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from herb_query import HerbQueryEngine, herb_facets
+
+HERBS = [
+    {"id": "ayh001", "herb_name": "Ashwagandha", "rasa": ["Tikta (Bitter)", "Madhura (Sweet)"],
+     "guna": ["Laghu (Light)", "Snigdha (Unctuous)"], "virya": "Ushna (Hot potency)", "vipaka": "Madhura (Sweet)",
+     "dosha_effect": "Balances Vata and Kapha; may increase Pitta in excess", "parts_used": ["Root", "Leaf"]},
+    {"id": "ayh005", "herb_name": "Neem", "rasa": ["Tikta (Bitter)", "Kashaya (Astringent)"],
+     "guna": ["Laghu (Light)", "Ruksha (Dry)"], "virya": "Sheeta (Cold)", "vipaka": "Katu (Pungent)",
+     "dosha_effect": "Reduces Pitta and Kapha; may aggravate Vata", "parts_used": ["Leaves", "Bark"]},
+    {"id": "ayh006", "herb_name": "Triphala", "rasa": ["All 6 tastes except Lavana (Salt)"],
+     "guna": ["Laghu (Light)", "Ruksha (Dry)"], "virya": "Sheeta (Cold) — Haritaki is Ushna",
+     "vipaka": "Madhura (Sweet)", "dosha_effect": "Balances all three doshas (Tridoshic)",
+     "parts_used": ["Dried fruit"]},
+]
+
+
+def test_free_text_fields_parse_to_canonical_values():
+    triphala = herb_facets(HERBS[2])
+    assert triphala["rasa"] == ["Madhura", "Amla", "Katu", "Tikta", "Kashaya"]
+    assert triphala["virya"] == ["Sheeta"]  # the note after the dash is about one ingredient
+    assert triphala["dosha_effect"] == ["Balances Vata", "Balances Pitta", "Balances Kapha"]
+    assert herb_facets(HERBS[1])["dosha_effect"] == ["Balances Pitta", "Balances Kapha", "Aggravates Vata"]
+    assert herb_facets(HERBS[1])["parts_used"] == ["Leaf", "Bark"]
+
+
+def test_facets_are_anded_and_values_ored_with_disjunctive_counts():
+    engine = HerbQueryEngine(HERBS)
+    result = engine.query({"virya": ["ushna"], "rasa": ["Tikta"], "dosha_effect": ["Balances Kapha"]})
+    assert [h["herb_name"] for h in result["herbs"]] == ["Ashwagandha"]
+    assert result["total"] == 1
+    # Counts for virya ignore the virya filter itself: how many each virya would give
+    assert result["facets"]["virya"] == {"Sheeta": 2, "Ushna": 1}
+
+    result = engine.query({"virya": ["Ushna", "Sheeta"]}, offset=1, limit=1)
+    assert result["total"] == 3 and [h["herb_name"] for h in result["herbs"]] == ["Neem"]
+    assert engine.query({"rasa": ["Tikta", "Amla"]}, match="all")["total"] == 1
+    assert engine.query({"rasa": ["Unknown"]})["total"] == 0
+
+
+if __name__ == "__main__":
+    test_free_text_fields_parse_to_canonical_values()
+    print("✅ TEST PASSED: Free-text fields parse to canonical values.")
+    test_facets_are_anded_and_values_ored_with_disjunctive_counts()
+    print("✅ TEST PASSED: Facets are ANDed, values ORed, with disjunctive counts.")
@@ -0,0 +1,108 @@
+"""
+Materia medica parser tests.
+
+Run: python test_materia_medica.py   (or via pytest)
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from materia_medica import MateriaMedica  # noqa: E402
+
+# Two remedies in the shape of the scan: a page break with a numbered page
+# header in the middle of a paragraph, OCR-garbled labels and headings.
+BOOK = """PREFACE
+
+HOMCEOPATHIC
+MATERIA    MEDICA,
+
+
+ACONITUM   NAPELLUS.
+^^  (Monkshood.)
+
+A state of fear, anxiety; anguish of mind and body. Sudden and
+great  prostration.  Complaints  caused  by  exposure  to  dry,
+cold  weather.
+Mind. — Great fear, anxiety and worry accompany every ail-
+ment, however trivial.
+
+Hose.^ — Smell acutely sensitive. Pain at root of nose.
+
+
+lO  ACONITUM    NAPELLUS.
+
+Fluent coryza with much sneezing.
+
+Modalities. — Better in open air; worse in warm room.
+
+Relationship. — Compare: Bell.; Cham.
+
+Bose. — Sixth potency for most conditions.
+
+LYCOPODIUM    CLAVATUM.
+(Club Moss.)
+
+Deep-acting remedy, mostly for chronic conditions.
+
+StooL — Hard, difficult, small.
+
+MIND
+"""
+
+NAMES = ["Aconite Napellus", "Lycopodium", "Opium"]
+
+
+def test_remedies_split_into_sections():
+    book = MateriaMedica.from_text(BOOK, NAMES)
+    assert list(book.remedies) == ["aconite napellus", "lycopodium clavatum"]
+    aconite = book.get("Aconite Napellus")
+    assert (aconite["name"], aconite["heading"], aconite["common_name"]) == \
+        ("Aconite Napellus", "Aconitum Napellus", "Monkshood")
+    assert list(aconite["sections"]) == ["General", "Mind", "Nose", "Modalities", "Relationship", "Dose"]
+    assert aconite["sections"]["General"].startswith("A state of fear")
+    # A section starting on the next line, and a word hyphenated over two lines
+    assert aconite["sections"]["Mind"] == "Great fear, anxiety and worry accompany every ailment, however trivial."
+    # The paragraph goes on after the page header, which is not a new remedy
+    assert aconite["sections"]["Nose"].endswith("Fluent coryza with much sneezing.")
+    assert book.section("aconitum napellus", "dose") == "Sixth potency for most conditions."
+    # A curated name matching the heading's first word keeps the rest of it
+    assert book.get("lycopodium clavatum")["name"] == "Lycopodium Clavatum"
+    assert book.section("Lycopodium Clavatum", "Stool") == "Hard, difficult, small."
+    assert book.get("Opium") is None and book.section("Lycopodium Clavatum", "Mind") is None
+
+
+def test_saved_book_loads_identically():
+    book = MateriaMedica.from_text(BOOK, NAMES)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "materia_medica.json")
+        book.save(path)
+        loaded = MateriaMedica.load(path)
+    assert loaded.remedies == book.remedies
+    assert loaded.get("ACONITUM NAPELLUS.") == book.get("aconite napellus")
+
+
+
+def test_one_word_heading_matches_first_word_of_curated_name():
+    # The Arnica heading as scanned in scripts/boericke.txt
+    book = MateriaMedica.from_text(
+        BOOK.replace("MIND\n", "ARUICA. \n\n(Leopard's  Bane.) \n\nTraumatism, injuries, falls, blows.\n\n"
+                                "Mind. — Fears touch.\n\nMIND\n"),
+        NAMES + ["Arnica Montana", "Kali Bichromicum", "Kali Carbonicum"])
+    arnica = book.get("Arnica Montana")
+    assert (arnica["name"], arnica["heading"], arnica["common_name"]) == ("Arnica Montana", "Aruica", "Leopard's Bane")
+    # Curated first words and scanned headings are aliases
+    assert book.get("Arnica") is arnica and book.get("aruica") is arnica
+    assert book.section("arnica", "mind") == "Fears touch."
+    assert book.get("Aconite") is book.get("Aconite Napellus")
+
+
+if __name__ == "__main__":
+    test_remedies_split_into_sections()
+    print("✅ TEST PASSED: Remedies split into sections.")
+    test_saved_book_loads_identically()
+    print("✅ TEST PASSED: Saved book loads identically.")
+    test_one_word_heading_matches_first_word_of_curated_name()
+    print("✅ TEST PASSED: One-word heading matches the first word of a curated name.")
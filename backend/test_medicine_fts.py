@@ -0,0 +1,89 @@
+"""
+SQLite medicine full-text search tests.
+
+Run: python test_medicine_fts.py   (or via pytest)
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from medicine_fts import MedicineFTS, write_database  # noqa: E402
+
+DATABASE = {
+    "Allopathic": {
+        "A": ["Amlodipine", "Amoxicillin", "Amoxicillin 500mg Capsule"],
+        "C": ["Co-Amoxiclav"],
+        "P": ["Pan_D", "Paracetamol 100% Pure"],
+    },
+    "Ayurvedic": {"A": ["Amla", "Ashwagandha"]},
+}
+SOURCES = {("Allopathic", "Amoxicillin"): "csv", ("Ayurvedic", "Amla"): "herbs"}
+
+
+def test_substring_search_ranks_prefixes_first():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unified_medicines.sqlite3")
+        write_database(DATABASE, path, SOURCES)
+        index = MedicineFTS.load(path)
+        assert index.categories == {"Allopathic": 6, "Ayurvedic": 2}
+        results, total = index.search("MOXI")
+        assert [r["name"] for r in results] == ["Amoxicillin", "Amoxicillin 500mg Capsule", "Co-Amoxiclav"]
+        assert results[0] == {"name": "Amoxicillin", "category": "Allopathic", "source": "csv"} and total == 3
+        results, total = index.search("amox", limit=1)
+        assert [r["name"] for r in results] == ["Amoxicillin"] and total == 3
+        # Under 3 characters there are no trigrams: a LIKE scan, wildcards taken literally
+        results, total = index.search("am", "Ayurvedic")
+        assert results == [{"name": "Amla", "category": "Ayurvedic", "source": "herbs"}] and total == 1
+        assert [r["name"] for r in index.search("n_")[0]] == ["Pan_D"]
+        assert [r["name"] for r in index.search("0%")[0]] == ["Paracetamol 100% Pure"]
+        assert index.search('a"m') == ([], 0) and index.search("  ") == ([], 0)
+        index.close()
+
+
+def test_same_name_in_two_categories_with_and_without_source():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unified_medicines.sqlite3")
+        write_database({"Allopathic": {"A": ["Amla"]}, "Ayurvedic": {"A": ["Amla"]}}, path,
+                       {("Ayurvedic", "Amla"): "herbs"})
+        index = MedicineFTS.load(path)
+        results, total = index.search("aml")
+        assert total == 2
+        assert [(r["category"], r["source"]) for r in results] == [("Allopathic", None), ("Ayurvedic", "herbs")]
+        index.close()
+
+
+def test_connections_are_pooled_and_read_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unified_medicines.sqlite3")
+        write_database(DATABASE, path)
+        index = MedicineFTS(path, pool_size=2)
+        with ThreadPoolExecutor(8) as pool:
+            totals = list(pool.map(lambda q: index.search(q)[1], ["amox", "para", "ashwa", "dipine"] * 25))
+        assert totals == [3, 1, 1, 1] * 25
+        assert index._pool.qsize() <= 2
+        with index._connection() as db:
+            try:
+                db.execute("DELETE FROM categories")
+            except sqlite3.OperationalError:
+                pass
+            else:
+                raise AssertionError("expected a read-only connection")
+        # Rebuilding replaces the file; the pool keeps answering from the one it opened
+        write_database({"Allopathic": {"B": ["Benadryl"]}}, path)
+        assert index.search("amox")[1] == 3
+        index.close()
+        assert MedicineFTS.load(path).categories == {"Allopathic": 1}
+
+
+if __name__ == "__main__":
+    test_substring_search_ranks_prefixes_first()
+    print("✅ TEST PASSED: Substring search ranks prefixes first.")
+    test_same_name_in_two_categories_with_and_without_source()
+    print("✅ TEST PASSED: Same name in two categories with and without a source.")
+    test_connections_are_pooled_and_read_only()
+    print("✅ TEST PASSED: Connections are pooled and read-only.")
@@ -0,0 +1,47 @@
+"""
+Medicine autocomplete index tests.
+
+Run: python test_medicine_index.py   (or via pytest)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from medicine_index import MedicineIndex
+
+DATABASE = {
+    "Allopathic": {
+        "A": ["Amoxicillin", "Amoxicillin 500mg Capsule", "Amlodipine", "Augmentin"],
+        "P": ["Paracetamol", "Pantoprazole"],
+    },
+    "Ayurvedic": {"A": ["Ashwagandha", "Amla", "Arjuna"]},
+    "Homeopathic": {"A": ["Arnica Montana", "Aconite Napellus"]},
+}
+
+
+def test_prefix_matches_ignore_case_and_whitespace():
+    index = MedicineIndex.from_database(DATABASE)
+    results, total = index.autocomplete("  AMOX ", "Allopathic", 10)
+    assert [r["name"] for r in results] == ["Amoxicillin", "Amoxicillin 500mg Capsule"]
+    assert total == 2
+
+
+def test_all_categories_are_merged_in_order_and_limited():
+    index = MedicineIndex.from_database(DATABASE)
+    results, total = index.autocomplete("a", None, 4)
+    assert [(r["name"], r["category"]) for r in results] == [
+        ("Aconite Napellus", "Homeopathic"),
+        ("Amla", "Ayurvedic"),
+        ("Amlodipine", "Allopathic"),
+        ("Amoxicillin", "Allopathic"),
+    ]
+    assert total == 9
+
+
+if __name__ == "__main__":
+    test_prefix_matches_ignore_case_and_whitespace()
+    print("✅ TEST PASSED: Prefix matching ignores case and whitespace.")
+    test_all_categories_are_merged_in_order_and_limited()
+    print("✅ TEST PASSED: Categories are merged in order and limited.")
@@ -0,0 +1,72 @@
+"""
+Sharded medicine database tests.
+
+Run: python test_medicine_shards.py   (or via pytest)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from medicine_shards import ShardedDatabase, brotli, write_shards  # noqa: E402
+
+DATABASE = {
+    "Allopathic": {
+        "#": ["3-In-1 Syrup"],
+        "A": ["Amlodipine", "Amoxicillin 500mg Capsule"],
+        "P": ["Paracetamol", "Pantoprazole"],
+    },
+    "Homeopathic": {"A": ["Arnica Montana", "Aconite Napellus"]},
+}
+
+
+def test_shards_are_minified_compressed_and_hashed():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = write_shards(DATABASE, tmp)
+        entry = manifest["categories"]["Allopathic"]["#"]
+        assert entry["file"] == "Allopathic/_.json" and entry["count"] == 1
+        with open(os.path.join(tmp, "Allopathic", "A.json"), "rb") as f:
+            data = f.read()
+        assert data == '["Amlodipine","Amoxicillin 500mg Capsule"]'.encode("utf-8")
+        entry = manifest["categories"]["Allopathic"]["A"]
+        assert entry["sha256"] == hashlib.sha256(data).hexdigest() and entry["bytes"] == len(data)
+        with open(os.path.join(tmp, "Allopathic", "A.json.gz"), "rb") as f:
+            assert gzip.decompress(f.read()) == data
+        if brotli is not None:
+            with open(os.path.join(tmp, "Allopathic", "A.json.br"), "rb") as f:
+                assert brotli.decompress(f.read()) == data
+        with open(os.path.join(tmp, "manifest.json"), encoding="utf-8") as f:
+            assert json.load(f) == manifest
+
+
+def test_letters_load_on_demand_and_stale_shards_are_removed():
+    with tempfile.TemporaryDirectory() as tmp:
+        write_shards(DATABASE, tmp)
+        write_shards({"Allopathic": {"A": DATABASE["Allopathic"]["A"]}}, tmp)
+        assert sorted(os.listdir(tmp)) == ["Allopathic", "Homeopathic", "manifest.json"]
+        assert not os.listdir(os.path.join(tmp, "Homeopathic"))
+        assert not os.path.exists(os.path.join(tmp, "Allopathic", "P.json.gz"))
+
+        write_shards(DATABASE, tmp)
+        database = ShardedDatabase.load(tmp)
+        assert database.counts() == {"Allopathic": 5, "Homeopathic": 2}
+        assert database.letter("Allopathic", "P") == ["Paracetamol", "Pantoprazole"]
+        assert list(database._shards) == ["Allopathic/P.json"]
+        try:
+            database.letter("Ayurvedic", "A")
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("expected KeyError for a category not in the manifest")
+
+
+if __name__ == "__main__":
+    test_shards_are_minified_compressed_and_hashed()
+    print("✅ TEST PASSED: Shards are minified, compressed and hashed.")
+    test_letters_load_on_demand_and_stale_shards_are_removed()
+    print("✅ TEST PASSED: Letters load on demand and stale shards are removed.")
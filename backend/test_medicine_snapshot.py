@@ -0,0 +1,85 @@
+"""
+Columnar medicine snapshot tests.
+
+Run: python test_medicine_snapshot.py   (or via pytest)
+Needs pyarrow (an optional backend dependency); skipped without it.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+DATABASE = {
+    "Allopathic": {
+        "#": ["3-In-1 Syrup"],
+        "A": ["Amlodipine", "Amoxicillin  500mg Capsule"],
+        "P": ["Paracetamol", "Pantoprazole"],
+    },
+    "Ayurvedic": {},
+    "Homeopathic": {"A": ["Arnica Montana", "Aconite Napellus"]},
+}
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow not installed")
+def test_views_by_category_and_letter():
+    from medicine_snapshot import MedicineSnapshot, write_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unified_medicines.arrow")
+        write_snapshot(DATABASE, path)
+        snapshot = MedicineSnapshot.load(path)
+        assert snapshot.counts() == {"Allopathic": 5, "Ayurvedic": 0, "Homeopathic": 2}
+        assert snapshot.letters("Allopathic") == ["#", "A", "P"]
+        assert snapshot.names("Allopathic", "P").to_pylist() == ["Paracetamol", "Pantoprazole"]
+        assert snapshot.names("Homeopathic").to_pylist() == DATABASE["Homeopathic"]["A"]
+        assert snapshot.names("Ayurvedic").to_pylist() == []
+        view = snapshot.view("Allopathic", "A")
+        assert view.column("key").to_pylist() == ["amlodipine", "amoxicillin 500mg capsule"]
+        assert set(view.column("category").to_pylist()) == {"Allopathic"}
+        assert set(view.column("letter").to_pylist()) == {"A"}
+        try:
+            snapshot.view("Allopathic", "Z")
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("expected KeyError for a letter not in the snapshot")
+        # Unmapped before the directory is removed (Windows cannot delete a mapped file)
+        del snapshot, view
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow not installed")
+def test_snapshot_is_dictionary_encoded_and_mapped():
+    import pyarrow as pa
+    from medicine_snapshot import MedicineSnapshot, write_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "unified_medicines.arrow")
+        write_snapshot(DATABASE, path)
+        allocated = pa.total_allocated_bytes()
+        snapshot = MedicineSnapshot.load(path)
+        # Nothing copied into Arrow's memory pool: the columns are the mapped file
+        assert pa.total_allocated_bytes() == allocated
+        assert pa.types.is_dictionary(snapshot.table.schema.field("category").type)
+        assert pa.types.is_dictionary(snapshot.table.schema.field("letter").type)
+        # Rewriting replaces the file, so the mapped snapshot still reads the old rows
+        write_snapshot({"Allopathic": {"B": ["Benadryl"]}}, path)
+        assert snapshot.names("Allopathic", "A").to_pylist() == DATABASE["Allopathic"]["A"]
+        assert MedicineSnapshot.load(path).counts() == {"Allopathic": 1}
+        del snapshot
+
+
+if __name__ == "__main__":
+    if not HAS_PYARROW:
+        print("⚠️ TESTS SKIPPED: pyarrow not installed.")
+        sys.exit(0)
+    test_views_by_category_and_letter()
+    print("✅ TEST PASSED: Views by category and letter.")
+    test_snapshot_is_dictionary_encoded_and_mapped()
+    print("✅ TEST PASSED: Snapshot is dictionary-encoded and mapped.")
@@ -0,0 +1,91 @@
+"""
+Metrics exposition tests.
+
+Checks the Prometheus text output of a histogram and a counter, and that
+snapshots published by two workers to METRICS_DIR are summed on scrape,
+without the gauges of workers that have exited, and that METRICS_API_KEY
+guards GET /metrics.
+
+Run: python test_metrics.py   (or via pytest)
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import metrics  # noqa: E402
+import main  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/")
+    text = metrics.render()
+    assert 'test_latency_seconds_bucket{route="/",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/",le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{route="/"} 4' in text
+    assert 'test_latency_seconds_sum{route="/"} 6.05' in text
+
+
+def test_worker_snapshots_are_summed():
+    counter = metrics.Counter("test_events_total", "Test events", ("kind",))
+    counter.inc("a", amount=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Another worker's snapshot, as written by metrics.write_snapshot
+        with open(os.path.join(tmp, "metrics-1.json"), "w") as f:
+            json.dump({"test_events_total": counter.snapshot()}, f)
+        text = metrics.render(tmp)
+    assert 'test_events_total{kind="a"} 6' in text
+
+
+def test_exited_worker_keeps_counters_but_not_gauges():
+    counter = metrics.Counter("test_jobs_total", "Test jobs")
+    gauge = metrics.Gauge("test_jobs_running", "Test jobs running")
+    counter.inc(amount=2)
+    gauge.values[()] = 1
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = {"test_jobs_total": counter.snapshot(), "test_jobs_running": gauge.snapshot()}
+        for pid in (os.getppid(), exited.pid):  # a live worker and one that has exited
+            with open(os.path.join(tmp, f"metrics-{pid}.json"), "w") as f:
+                json.dump(snapshot, f)
+        text = metrics.render(tmp)
+    assert "test_jobs_total 6" in text
+    assert "test_jobs_running 2" in text
+
+
+def test_metrics_key_is_required_when_configured():
+    metrics_key, main.METRICS_API_KEY = main.METRICS_API_KEY, "scrape-secret"
+    try:
+        asyncio.run(main.verify_metrics_key("Bearer scrape-secret"))
+        for header in ("", "Bearer wrong", "scrape-secret"):
+            try:
+                asyncio.run(main.verify_metrics_key(header))
+            except HTTPException as e:
+                assert e.status_code == 401
+            else:
+                raise AssertionError(f"expected a 401 for {header!r}")
+        main.METRICS_API_KEY = ""
+        asyncio.run(main.verify_metrics_key(""))
+    finally:
+        main.METRICS_API_KEY = metrics_key
+
+
+if __name__ == "__main__":
+    test_histogram_buckets_are_cumulative()
+    print("✅ TEST PASSED: Histogram buckets render cumulatively.")
+    test_worker_snapshots_are_summed()
+    print("✅ TEST PASSED: Worker snapshots are summed.")
+    test_exited_worker_keeps_counters_but_not_gauges()
+    print("✅ TEST PASSED: Exited worker keeps its counters but not its gauges.")
+    test_metrics_key_is_required_when_configured()
+    print("✅ TEST PASSED: Metrics key is required when configured.")
@@ -0,0 +1,156 @@
+"""
+Shared rate limit storage tests.
+
+Two independent storage instances stand in for two uvicorn workers; the
+limit must hold across both of them, for the SQLite backend and for the
+Redis-protocol backend running against FakeRespServer.
+
+Run: python test_rate_limit_storage.py   (or via pytest)
+"""
+
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+import rate_limit_storage  # noqa: F401  (registers sqlite:// and resp://)
+
+
+class FakeRespServer(socketserver.ThreadingTCPServer):
+    """In-memory server speaking enough RESP2 for RespStorage"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRespHandler)
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    @property
+    def uri(self) -> str:
+        return f"resp://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def _live(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def command(self, name: str, args: list):
+        with self.lock:
+            if name == "PING":
+                return "+PONG"
+            if name == "GET":
+                value = self._live(args[0])
+                return None if value is None else str(value).encode()
+            if name in ("INCRBY", "DECRBY"):
+                delta = int(args[1]) * (1 if name == "INCRBY" else -1)
+                self.data[args[0]] = int(self._live(args[0]) or 0) + delta
+                return self.data[args[0]]
+            if name == "PEXPIRE":
+                if self._live(args[0]) is None:
+                    return 0
+                self.expires[args[0]] = time.time() + int(args[1]) / 1000
+                return 1
+            if name == "PTTL":
+                if self._live(args[0]) is None:
+                    return -2
+                if args[0] not in self.expires:
+                    return -1
+                return int((self.expires[args[0]] - time.time()) * 1000)
+            if name == "DEL":
+                removed = sum(1 for key in args if self.data.pop(key, None) is not None)
+                for key in args:
+                    self.expires.pop(key, None)
+                return removed
+            if name == "SCAN":
+                prefix = args[args.index("MATCH") + 1].rstrip("*")
+                return [b"0", [k.encode() for k in list(self.data) if k.startswith(prefix)]]
+            return Exception(f"ERR unknown command '{name}'")
+
+
+class FakeRespHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        # Pipelined replies go out as separate small writes; don't let Nagle hold them back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode())
+        return args
+
+    def _encode(self, reply) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, Exception):
+            return b"-%s\r\n" % str(reply).encode()
+        if isinstance(reply, str):
+            return reply.encode() + b"\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(self._encode(r) for r in reply)
+
+    def handle(self):
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            self.wfile.write(self._encode(self.server.command(args[0].upper(), args[1:])))
+
+
+def assert_limit_shared(uri: str):
+    limit = parse("10/minute")
+    for strategy in (FixedWindowRateLimiter, SlidingWindowCounterRateLimiter):
+        worker_a = strategy(storage_from_string(uri))
+        worker_b = strategy(storage_from_string(uri))
+        worker_a.storage.reset()
+        allowed = sum(
+            worker.hit(limit, strategy.__name__, "203.0.113.7")
+            for _ in range(10)
+            for worker in (worker_a, worker_b)
+        )
+        assert allowed == 10, f"{uri} {strategy.__name__}: {allowed} hits allowed"
+
+
+def test_sqlite_storage_shares_limit_across_workers():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert_limit_shared(f"sqlite:///{os.path.join(tmp, 'ratelimit.sqlite3')}")
+
+
+def test_resp_storage_shares_limit_across_workers():
+    server = FakeRespServer().start()
+    try:
+        assert_limit_shared(server.uri)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_sqlite_storage_shares_limit_across_workers()
+    print("✅ TEST PASSED: SQLite storage enforces one limit across workers.")
+    test_resp_storage_shares_limit_across_workers()
+    print("✅ TEST PASSED: RESP storage enforces one limit across workers.")
@@ -0,0 +1,67 @@
+"""
+Repertorization engine tests.
+
+Run: python test_repertory.py   (or via pytest)
+Needs numpy (an optional backend dependency); skipped without it.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+REMEDIES = {5: ("Acon.", "Aconitum napellus"), 27: ("Apis", "Apis mellifica"), 37: ("Bell.", "Belladonna"),
+            51: ("Bry.", "Bryonia alba")}
+# (sym_id, rem_id, grade): 100 fever, 200 thirstless, 300 worse from motion, 400 sudden onset
+LINKS = [
+    (100, 5, 3), (100, 37, 3), (100, 27, 2), (100, 51, 2),
+    (200, 27, 3), (200, 37, 1),
+    (300, 51, 3), (300, 51, 1),  # two sources: the higher grade counts
+    (400, 5, 3), (400, 37, 2),
+]
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+def test_case_scores_sum_graded_rubrics():
+    from repertory import RepertoryEngine
+    engine = RepertoryEngine.build(LINKS, REMEDIES)
+    ranked = engine.repertorize([100, 400, 999])
+    assert [(r["abbreviation"], r["score"], r["rubrics"]) for r in ranked["results"]] == \
+        [("Acon.", 6, 2), ("Bell.", 5, 2), ("Apis", 2, 1), ("Bry.", 2, 1)]
+    assert ranked["unknown_symptoms"] == [999]
+    # Ids no int64 can hold are unknown too, not an OverflowError
+    assert engine.repertorize([100, 2 ** 63, -2 ** 70])["unknown_symptoms"] == [2 ** 63, -2 ** 70]
+    # Intensity weights scale a rubric
+    weighted = engine.repertorize([100, 200, 300], weights=[1, 2, 1], limit=2)["results"]
+    assert [(r["abbreviation"], r["score"]) for r in weighted] == [("Apis", 8), ("Bell.", 5)]
+    # Equal scores: the remedy covering more rubrics first
+    assert [r["abbreviation"] for r in engine.repertorize([200, 400], limit=3)["results"]] == \
+        ["Bell.", "Acon.", "Apis"]
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+def test_saved_matrix_loads_identically():
+    from repertory import RepertoryEngine
+    engine = RepertoryEngine.build(LINKS, REMEDIES)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "repertory.npz")
+        engine.save(path)
+        loaded = RepertoryEngine.load(path)
+    case = [100, 200, 300, 400]
+    assert loaded.repertorize(case) == engine.repertorize(case)
+
+
+if __name__ == "__main__":
+    if not HAS_NUMPY:
+        print("⚠️ TESTS SKIPPED: numpy not installed.")
+        sys.exit(0)
+    test_case_scores_sum_graded_rubrics()
+    print("✅ TEST PASSED: Case scores sum graded rubrics.")
+    test_saved_matrix_loads_identically()
+    print("✅ TEST PASSED: Saved matrix loads identically.")
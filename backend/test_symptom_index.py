@@ -0,0 +1,46 @@
+"""
+Symptom search index tests.
+
+Run: python test_symptom_index.py   (or via pytest)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from symptom_index import SymptomIndex
+
+AILMENTS = [
+    {"id": "nr001", "ailment": "Common Cold", "ailment_hindi": "Zukam / Sardi",
+     "symptoms_keywords": ["cold", "runny nose", "sneezing", "zukam"],
+     "remedies": [{"name": "Adrak-Tulsi Kadha"}, {"name": "Haldi Doodh"}, {"name": "Minor Home Treatment"}]},
+    {"id": "nr006", "ailment": "Nausea / Vomiting", "ailment_hindi": "Ji Machlana / Ulti",
+     "symptoms_keywords": ["nausea", "vomiting", "ulti"], "remedies": [{"name": "Adrak Ka Ras"}]},
+    {"id": "nr005", "ailment": "Headache", "ailment_hindi": "Sar Dard",
+     "symptoms_keywords": ["headache", "sar dard", "migraine"], "remedies": []},
+]
+
+
+def test_more_matching_symptoms_rank_higher():
+    index = SymptomIndex(AILMENTS)
+    results = index.search(["runny nose", "sneezing"], limit=5, remedies_per_ailment=2)
+    assert [r["id"] for r in results] == ["nr001"]  # "nose" must not match "nausea"
+    assert [r["name"] for r in results[0]["remedies"]] == ["Adrak-Tulsi Kadha", "Haldi Doodh"]
+    results = index.search(["headache", "nausea", "vomiting"])
+    assert [r["id"] for r in results] == ["nr006", "nr005"]
+    assert results[0]["score"] > results[1]["score"] > 0
+
+
+def test_hinglish_and_devanagari_spellings_fall_back_to_phonetic_keys():
+    index = SymptomIndex(AILMENTS)
+    for symptom in ("zukam", "jukam", "ज़ुकाम"):
+        assert [r["id"] for r in index.search([symptom])] == ["nr001"], symptom
+    assert index.search(["xyzzy"]) == []
+
+
+if __name__ == "__main__":
+    test_more_matching_symptoms_rank_higher()
+    print("✅ TEST PASSED: More matching symptoms rank higher.")
+    test_hinglish_and_devanagari_spellings_fall_back_to_phonetic_keys()
+    print("✅ TEST PASSED: Hinglish and Devanagari spellings fall back to phonetic keys.")
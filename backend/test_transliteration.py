@@ -0,0 +1,50 @@
+"""
+Transliteration name index tests.
+
+Run: python test_transliteration.py   (or via pytest)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from transliteration import TransliterationIndex, _herb_entries, _nuskhe_entries, phonetic_key
+
+HERBS = [
+    {"id": "ayh002", "herb_name": "Tulsi", "hindi_name": "तुलसी", "latin_name": "Ocimum sanctum",
+     "common_names": ["Holy Basil"]},
+    {"id": "ayh014", "herb_name": "Adraka", "hindi_name": "अदरक (Adrak)", "latin_name": "Zingiber officinale",
+     "common_names": ["Ginger"]},
+]
+NUSKHE = [
+    {"id": "nr001", "ailment": "Common Cold", "ailment_hindi": "Zukam / Sardi", "remedies": [
+        {"name": "Adrak-Tulsi Kadha", "name_hindi": "अदरक-तुलसी काढ़ा"},
+        {"name": "Minor Home Treatment", "method": "Gargle with salt water"},
+    ]},
+]
+
+
+def test_script_and_spelling_variants_share_a_key():
+    for variants in (["adrak", "Adraka", "अदरक"], ["tulsi", "tulasi", "तुलसी"],
+                     ["ashwagandha", "अश्वगंधा"], ["jeera", "zeera", "जीरा"],
+                     ["nimbu", "nimboo", "नींबू"], ["kadha", "काढ़ा"], ["ajwain", "अजवाइन"]):
+        assert len({phonetic_key(v) for v in variants}) == 1, variants
+
+
+def test_any_script_finds_every_entry_named_by_it():
+    index = TransliterationIndex([*_herb_entries(HERBS), *_nuskhe_entries(NUSKHE)])
+    for query in ("adrak", "अदरक", "ADRAKA"):
+        assert [(r["kind"], r["name"]) for r in index.search(query)] == [
+            ("herb", "Adraka"), ("remedy", "Adrak-Tulsi Kadha")]
+    assert [r["name"] for r in index.search("ginger")] == ["Adraka"]
+    assert [r["name"] for r in index.search("tulsi", kind="remedy")] == ["Adrak-Tulsi Kadha"]
+    assert index.search("zuk")[0]["matched"] == "Zukam"
+    assert index.search("home treatment") == []  # unnamed remedies are not indexed
+
+
+if __name__ == "__main__":
+    test_script_and_spelling_variants_share_a_key()
+    print("✅ TEST PASSED: Script and spelling variants share a key.")
+    test_any_script_finds_every_entry_named_by_it()
+    print("✅ TEST PASSED: Any script finds every entry named by it.")
@@ -0,0 +1,109 @@
+"""
+Content-addressed upload store tests.
+
+Run: python test_upload_store.py   (or via pytest)
+"""
+
+import asyncio
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from upload_store import UploadStore, UploadTooLargeError  # noqa: E402
+
+
+class FakeUpload:
+    """Async read(n) over bytes, like FastAPI's UploadFile"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+
+    async def read(self, size: int) -> bytes:
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+def save(store: UploadStore, data: bytes, filename: str, max_bytes: int = 1 << 20):
+    return asyncio.run(store.save(FakeUpload(data), filename, max_bytes, chunk_size=1024))
+
+
+def test_identical_content_is_stored_once_in_its_shard():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UploadStore(tmp)
+        data = b"scan " * 1000
+        sha256 = hashlib.sha256(data).hexdigest()
+        first = save(store, data, "report.pdf")
+        second = save(store, data, "copy-of-report.pdf")
+        assert (first.sha256, first.size_bytes, first.deduplicated) == (sha256, len(data), False)
+        assert (second.sha256, second.deduplicated) == (sha256, True)
+
+        path = store.blob_path(sha256)
+        assert path == os.path.join(tmp, "blobs", sha256[:2], sha256[2:4], sha256)
+        with open(path, "rb") as f:
+            assert f.read() == data
+        assert store.exists(sha256)
+        blobs = [name for _, _, names in os.walk(store.blob_dir) for name in names]
+        assert blobs == [sha256]
+        assert os.listdir(store.tmp_dir) == []
+        assert store.lookup("copy-of-report.pdf").sha256 == sha256 and store.lookup("missing.pdf") is None
+        store.close()
+
+
+def test_oversized_upload_leaves_nothing_behind():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UploadStore(tmp)
+        try:
+            save(store, b"x" * 5000, "big.bin", max_bytes=4096)
+        except UploadTooLargeError:
+            pass
+        else:
+            raise AssertionError("expected UploadTooLargeError")
+        assert os.listdir(store.tmp_dir) == [] and os.listdir(store.blob_dir) == []
+        assert store.list() == []
+        store.close()
+
+
+def test_list_pages_through_filename_and_hash_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UploadStore(tmp)
+        for i in range(7):
+            save(store, f"content {i % 3}".encode(), f"file-{i % 5}.txt")
+        expected = sorted((f"file-{i % 5}.txt", hashlib.sha256(f"content {i % 3}".encode()).hexdigest())
+                          for i in range(7))
+        pages, cursor = [], ("", "")
+        while True:
+            page = store.list(*cursor, limit=3)
+            if not page:
+                break
+            pages.append(page)
+            cursor = (page[-1].filename, page[-1].sha256)
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [(entry.filename, entry.sha256) for page in pages for entry in page] == expected
+        store.close()
+
+
+def test_lazy_init_does_not_create_the_store_at_import():
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, VERCEL="1", UPLOAD_STORE="sharded", PYTHONPATH=BACKEND_DIR)
+        env.pop("LAZY_INIT", None)
+        subprocess.run([sys.executable, "-c", "import main; assert main.upload_store is None"],
+                       cwd=tmp, env=env, check=True)
+        assert os.listdir(tmp) == []
+
+
+if __name__ == "__main__":
+    test_identical_content_is_stored_once_in_its_shard()
+    print("✅ TEST PASSED: Identical content is stored once in its shard.")
+    test_oversized_upload_leaves_nothing_behind()
+    print("✅ TEST PASSED: Oversized upload leaves nothing behind.")
+    test_list_pages_through_filename_and_hash_order()
+    print("✅ TEST PASSED: list() pages through filename and hash order.")
+    test_lazy_init_does_not_create_the_store_at_import()
+    print("✅ TEST PASSED: Lazy init does not create the store at import.")
@@ -0,0 +1,100 @@
+"""
+Streaming upload tests (UPLOAD_MODE=streaming, the default).
+
+- An upload over the size limit is rejected with 413 while streaming.
+- The .part temp file is removed when an upload is rejected or fails.
+- A finished upload never overwrites a file of the same name: it is
+  stored as name_1.ext, name_2.ext, ...
+
+Run: python test_upload_streaming.py   (or via pytest)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+
+
+class FakeUpload:
+    """Async read(n) over bytes, like FastAPI's UploadFile; fails after fail_after bytes if given"""
+
+    def __init__(self, data: bytes, fail_after: int = None):
+        self.data = data
+        self.position = 0
+        self.fail_after = fail_after
+
+    async def read(self, size: int) -> bytes:
+        if self.fail_after is not None and self.position >= self.fail_after:
+            raise ConnectionResetError("client went away")
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+def stream(upload: FakeUpload, filename: str, max_bytes: int) -> tuple:
+    return asyncio.run(main.stream_upload_to_disk(upload, filename, max_bytes))
+
+
+def in_upload_dir(test):
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            upload_dir, main.UPLOAD_DIR = main.UPLOAD_DIR, tmp
+            try:
+                test(tmp)
+            finally:
+                main.UPLOAD_DIR = upload_dir
+    run.__name__ = test.__name__
+    return run
+
+
+@in_upload_dir
+def test_oversized_upload_is_rejected_mid_stream(tmp):
+    upload = FakeUpload(b"x" * (3 * main.UPLOAD_CHUNK_SIZE_KB * 1024))
+    try:
+        stream(upload, "scan.pdf", max_bytes=main.UPLOAD_CHUNK_SIZE_KB * 1024 + 1)
+    except HTTPException as e:
+        assert e.status_code == 413
+    else:
+        raise AssertionError("expected a 413")
+    # Stopped at the chunk that crossed the limit, without reading the rest
+    assert upload.position == 2 * main.UPLOAD_CHUNK_SIZE_KB * 1024
+    assert os.listdir(tmp) == []
+
+
+@in_upload_dir
+def test_failed_upload_leaves_no_temp_file(tmp):
+    try:
+        stream(FakeUpload(b"y" * 1_000_000, fail_after=1), "scan.pdf", max_bytes=10_000_000)
+    except ConnectionResetError:
+        pass
+    else:
+        raise AssertionError("expected the read error to propagate")
+    assert os.listdir(tmp) == []
+
+
+@in_upload_dir
+def test_same_name_is_never_overwritten(tmp):
+    with open(os.path.join(tmp, "report.pdf"), "wb") as f:
+        f.write(b"first")
+    locations = [stream(FakeUpload(data), "report.pdf", max_bytes=1024)
+                 for data in (b"second", b"third")]
+    assert [(os.path.basename(path), size) for path, size in locations] == [("report_1.pdf", 6), ("report_2.pdf", 5)]
+    contents = {}
+    for name in os.listdir(tmp):
+        with open(os.path.join(tmp, name), "rb") as f:
+            contents[name] = f.read()
+    assert contents == {"report.pdf": b"first", "report_1.pdf": b"second", "report_2.pdf": b"third"}
+
+
+if __name__ == "__main__":
+    test_oversized_upload_is_rejected_mid_stream()
+    print("✅ TEST PASSED: Oversized upload is rejected mid-stream.")
+    test_failed_upload_leaves_no_temp_file()
+    print("✅ TEST PASSED: Failed upload leaves no temp file.")
+    test_same_name_is_never_overwritten()
+    print("✅ TEST PASSED: Same name is never overwritten.")
@@ -0,0 +1,199 @@
+"""
+Script-independent name lookup for Healio.AI
+
+Herb, ailment and remedy names appear in Devanagari ("अदरक"), Hinglish
+("Adrak", "adraka") and English ("Ginger"). Every variant is reduced to a
+phonetic key: Devanagari is transliterated to Latin, then the spellings
+Hinglish writers use interchangeably (ee/i, w/v, sh/s, aspirated consonants,
+doubled letters, the unwritten schwa) collapse to one form, so "tulsi",
+"tulasi" and "तुलसी" all become "tulsi".
+
+Keys are computed once when the index is built from data/ayurvedic/herbs.json
+and data/home_remedies/nuskhe.json; a query computes its own key and does one
+binary-searched prefix range lookup (exact matches sort first in it).
+"""
+
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Sorts after every character a key can contain
+_PREFIX_END = "\U0010ffff"
+
+_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ii", "उ": "u", "ऊ": "uu", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऑ": "o",
+}
+_VOWEL_SIGNS = {
+    "ा": "aa", "ि": "i", "ी": "ii", "ु": "u", "ू": "uu", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॉ": "o", "ॅ": "e",
+}
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "ळ": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+}
+# Consonant + nukta (़): loanword sounds, and ड़/ढ़ which Hinglish writes as d/dh ("kadha")
+_NUKTA_FORMS = {"क": "q", "ख": "kh", "ग": "g", "ज": "z", "ड": "d", "ढ": "dh", "फ": "f", "य": "y"}
+_SIGNS = {"ं": "n", "ँ": "n", "ः": "h", "ॐ": "om", "।": " ", "॥": " "}
+# Anusvara is spelled "m" before p, b, bh, m (नींबू -> "nimbu") but "n" before ph ("saunf")
+_NASALS = ("ं", "ँ")
+_LABIALS = ("प", "ब", "भ", "म")
+_NUKTA = "़"
+_VIRAMA = "्"
+
+# Spelling variants, applied in this order to each Latin word
+_LONG_VOWELS = re.compile(r"ee|ii|oo|uu|aa")
+_LONG_VOWEL_KEYS = {"ee": "i", "ii": "i", "oo": "u", "uu": "u", "aa": "a"}
+_DIGRAPHS = re.compile(r"chh|ch|sh|ph|kh|gh|jh|th|dh|bh|rh|ai|au|ou|w|z|q|x")
+_DIGRAPH_KEYS = {
+    "chh": "c", "ch": "c", "sh": "s", "ph": "f", "kh": "k", "gh": "g", "jh": "j", "th": "t",
+    "dh": "d", "bh": "b", "rh": "r", "ai": "e", "au": "o", "ou": "o", "w": "v", "z": "j",
+    "q": "k", "x": "ks",
+}
+_REPEATS = re.compile(r"(.)\1+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+KINDS = ("herb", "ailment", "remedy")
+
+
+def to_latin(text: str) -> str:
+    """Transliterate Devanagari to lowercase ASCII; Latin text only loses case and accents"""
+    out = []
+    chars = unicodedata.normalize("NFD", text)
+    i = 0
+    while i < len(chars):
+        char = chars[i]
+        if char in _CONSONANTS:
+            if i + 1 < len(chars) and chars[i + 1] == _NUKTA:
+                out.append(_NUKTA_FORMS.get(char, _CONSONANTS[char]))
+                i += 1
+            else:
+                out.append(_CONSONANTS[char])
+            following = chars[i + 1] if i + 1 < len(chars) else ""
+            if following in _VOWEL_SIGNS:
+                out.append(_VOWEL_SIGNS[following])
+                i += 1
+            elif following == _VIRAMA:
+                i += 1
+            else:
+                out.append("a")  # inherent vowel
+        elif char in _VOWELS:
+            out.append(_VOWELS[char])
+        elif char in _NASALS and i + 1 < len(chars) and chars[i + 1] in _LABIALS:
+            out.append("m")
+        elif char in _SIGNS:
+            out.append(_SIGNS[char])
+        elif "०" <= char <= "९":
+            out.append(str(unicodedata.digit(char)))
+        elif not unicodedata.combining(char):
+            out.append(char)
+        i += 1
+    return "".join(out).casefold()
+
+
+def _word_key(word: str) -> str:
+    word = _LONG_VOWELS.sub(lambda m: _LONG_VOWEL_KEYS[m.group()], word)
+    word = _DIGRAPHS.sub(lambda m: _DIGRAPH_KEYS[m.group()], word)
+    # Short "a" is the schwa Hinglish spellings add or drop at will ("adrak"/"adraka")
+    word = word[0] + word[1:].replace("a", "")
+    return _REPEATS.sub(r"\1", word)
+
+
+def phonetic_key(text: str) -> str:
+    """Script- and spelling-independent key: "Ashwagandha" and "अश्वगंधा" -> "asvgnd" """
+    return " ".join(_word_key(word) for word in _WORD.findall(to_latin(text)))
+
+
+def _herb_entries(herbs: List[dict]) -> Iterable[Tuple[dict, List[str]]]:
+    for herb in herbs:
+        entry = {"kind": "herb", "id": herb["id"], "name": herb["herb_name"],
+                 "hindi_name": herb.get("hindi_name") or None}
+        variants = [herb["herb_name"], herb.get("hindi_name", ""), herb.get("latin_name", "")]
+        yield entry, variants + list(herb.get("common_names", []))
+
+
+def _nuskhe_entries(ailments: List[dict]) -> Iterable[Tuple[dict, List[str]]]:
+    for ailment in ailments:
+        hindi = ailment.get("ailment_hindi") or None
+        yield ({"kind": "ailment", "id": ailment["id"], "name": ailment["ailment"], "hindi_name": hindi},
+               [ailment["ailment"], *(hindi or "").split("/")])
+    for ailment in ailments:
+        # Only named remedies; the generic "Minor Home Treatment" tips have no Hindi name
+        for remedy in ailment.get("remedies", []):
+            if remedy.get("name_hindi"):
+                yield ({"kind": "remedy", "id": ailment["id"], "name": remedy["name"],
+                        "hindi_name": remedy["name_hindi"], "ailment": ailment["ailment"]},
+                       [remedy["name"], remedy["name_hindi"]])
+
+
+class TransliterationIndex:
+    """
+    Herbs, ailments and remedies by the phonetic keys of all their name variants.
+
+    Every word-start suffix of a variant's key is stored ("adrk tulsi kd",
+    "tulsi kd", "kd"), so a query matches from the start of any word.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[dict, List[str]]]):
+        self.entries: List[dict] = []
+        rows = set()
+        for entry_id, (entry, variants) in enumerate(entries):
+            self.entries.append(entry)
+            for variant in variants:
+                key = phonetic_key(variant)
+                words = key.split()
+                for start in range(len(words)):
+                    # (key, starts the name?, entry id, text that matched)
+                    rows.add((" ".join(words[start:]), start > 0, entry_id, variant.strip()))
+        rows = sorted(rows)
+        self.keys: List[str] = [row[0] for row in rows]
+        self._rows = [row[1:] for row in rows]
+
+    @classmethod
+    def load(cls, herbs_path: str, nuskhe_path: str) -> "TransliterationIndex":
+        with open(herbs_path, encoding="utf-8") as f:
+            herbs = json.load(f)
+        with open(nuskhe_path, encoding="utf-8") as f:
+            ailments = json.load(f)
+        return cls([*_herb_entries(herbs), *_nuskhe_entries(ailments)])
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 10) -> List[Dict[str, object]]:
+        """
+        Entries with a name variant matching `query` in any script.
+
+        Exact key matches come first, then keys that extend the query; within
+        each, matches at the start of a name, then herbs, ailments, remedies.
+
+        Returns:
+            list: Up to `limit` entry dicts plus "matched" (the variant that matched)
+
+        Raises:
+            KeyError: if kind is not one of KINDS
+        """
+        if kind is not None and kind not in KINDS:
+            raise KeyError(kind)
+        key = phonetic_key(query)
+        if not key or limit <= 0:
+            return []
+        start = bisect_left(self.keys, key)
+        end = bisect_left(self.keys, key + _PREFIX_END, start)
+        ranked = sorted((self.keys[position] != key, *self._rows[position]) for position in range(start, end))
+
+        results = []
+        seen = set()
+        for _, _, entry_id, matched in ranked:
+            entry = self.entries[entry_id]
+            if entry_id in seen or (kind is not None and entry["kind"] != kind):
+                continue
+            seen.add(entry_id)
+            results.append({**entry, "matched": matched})
+            if len(results) == limit:
+                break
+        return results
@@ -0,0 +1,172 @@
+"""
+Content-Addressed Upload Store for Healio.AI
+
+Stores each uploaded file once, keyed by its SHA-256, under sharded
+directories (blobs/ab/cd/<sha256>) so no directory grows unbounded.
+A small SQLite index maps sanitized filenames to content hashes, which
+keeps name lookups, deduplication and listing fast at millions of files.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload stream exceeds the configured size limit"""
+
+
+@dataclass
+class StoredFile:
+    """A filename -> blob mapping recorded in the index"""
+    filename: str
+    sha256: str
+    size_bytes: int
+    uploaded_at: float
+    deduplicated: bool = False
+
+
+class UploadStore:
+    """Sharded, deduplicating blob store with a filename index"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(root, "index.sqlite3"), check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                filename    TEXT NOT NULL,
+                sha256      TEXT NOT NULL,
+                size_bytes  INTEGER NOT NULL,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (filename, sha256)
+            ) WITHOUT ROWID
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_by_hash ON files (sha256)")
+
+    def blob_path(self, sha256: str) -> str:
+        """Sharded on-disk path for a content hash"""
+        return os.path.join(self.blob_dir, sha256[:2], sha256[2:4], sha256)
+
+    async def save(self, file, filename: str, max_bytes: int, chunk_size: int = 256 * 1024) -> StoredFile:
+        """
+        Stream an upload into the store, hashing it on the way.
+
+        `file` is anything with an async `read(n)` (e.g. FastAPI's UploadFile).
+        If the content already exists only the index entry is added. Hashing,
+        disk writes and the index insert run in worker threads, so the event
+        loop only awaits the reads.
+
+        Raises:
+            UploadTooLargeError: if more than max_bytes are read
+        """
+        digest = hashlib.sha256()
+        fd, temp_path = await asyncio.to_thread(self._open_temp)
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                while True:
+                    chunk = await file.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                    await asyncio.to_thread(self._append, buffer, digest, chunk)
+
+            sha256 = digest.hexdigest()
+            deduplicated = await asyncio.to_thread(self._commit_blob, temp_path, sha256)
+        except BaseException:
+            # Rejected or failed before _commit_blob took the temp file
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        return await asyncio.to_thread(self._record, filename, sha256, size, deduplicated)
+
+    def _open_temp(self):
+        fd, temp_path = tempfile.mkstemp(dir=self.tmp_dir, suffix=".part")
+        os.chmod(temp_path, 0o644)
+        return fd, temp_path
+
+    @staticmethod
+    def _append(buffer, digest, chunk: bytes):
+        # sha256 and write() release the GIL for chunks this size
+        digest.update(chunk)
+        buffer.write(chunk)
+
+    def _commit_blob(self, temp_path: str, sha256: str) -> bool:
+        """Move the temp file into its shard; returns True if the blob already existed"""
+        target = self.blob_path(sha256)
+        try:
+            if os.path.exists(target):
+                return True
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                # link() never overwrites, so concurrent writers of the same content are safe
+                os.link(temp_path, target)
+            except FileExistsError:
+                return True
+            return False
+        finally:
+            os.unlink(temp_path)
+
+    def _record(self, filename: str, sha256: str, size: int, deduplicated: bool) -> StoredFile:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO files (filename, sha256, size_bytes, uploaded_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (filename, sha256) DO UPDATE SET uploaded_at = excluded.uploaded_at",
+                (filename, sha256, size, now),
+            )
+        return StoredFile(filename, sha256, size, now, deduplicated)
+
+    def lookup(self, filename: str) -> Optional[StoredFile]:
+        """Latest version uploaded under a filename, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT filename, sha256, size_bytes, uploaded_at FROM files "
+                "WHERE filename = ? ORDER BY uploaded_at DESC LIMIT 1",
+                (filename,),
+            ).fetchone()
+        return StoredFile(*row) if row else None
+
+    def exists(self, sha256: str) -> bool:
+        """Whether a blob with this hash is stored"""
+        return os.path.exists(self.blob_path(sha256))
+
+    def list(self, after_filename: str = "", after_sha256: str = "", limit: int = 100) -> List[StoredFile]:
+        """
+        Page through index entries in (filename, sha256) order.
+
+        Pass the last entry of the previous page as the `after_*` cursor;
+        keyset pagination keeps every page an index range scan.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT filename, sha256, size_bytes, uploaded_at FROM files "
+                "WHERE (filename, sha256) > (?, ?) ORDER BY filename, sha256 LIMIT ?",
+                (after_filename, after_sha256, limit),
+            ).fetchall()
+        return [StoredFile(*row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,50 @@
+"""
+Materia Medica Builder
+======================
+Parses the OCR text of Boericke's Materia Medica (scripts/boericke.txt)
+into remedies and their sections (Mind, Head, Stomach, ... Dose), with
+headings fixed against the curated homeopathic remedy names.
+
+Output: data/materia_medica.json  (see backend/materia_medica.py)
+
+Usage:
+    python scripts/build_materia_medica.py
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+BASE    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOOK_IN = os.path.join(BASE, "scripts", "boericke.txt")
+OUT     = os.path.join(BASE, "data", "materia_medica.json")
+
+sys.path.insert(0, os.path.join(BASE, "backend"))
+from materia_medica import MateriaMedica  # noqa: E402
+from curated_medicines import HOMEOPATHIC_CURATED  # noqa: E402
+
+# "Arnica Montana Mother Tincture", "Silica 6X", "Syphilinum (Luesinum)": the remedy is the name before these
+PREPARATION = re.compile(r"\s*\(.*\)|\s+(?:Mother Tincture|\d+[XC])$")
+
+
+def main():
+    start = time.perf_counter()
+    names = [PREPARATION.sub("", name) for name in HOMEOPATHIC_CURATED]
+    print(f"[1/2] Parsing {BOOK_IN} ...")
+    with open(BOOK_IN, encoding="utf-8") as f:
+        book = MateriaMedica.from_text(f.read(), names)
+    fixed = sum(remedy["name"] != remedy["heading"] for remedy in book.remedies.values())
+    sections = Counter(section for remedy in book.remedies.values() for section in remedy["sections"])
+    print(f"   {len(book.remedies):,} remedies ({fixed} headings fixed to curated names), "
+          f"{sum(sections.values()):,} sections")
+    print("   Most common sections: " + ", ".join(f"{name} {count}" for name, count in sections.most_common(8)))
+
+    print(f"[2/2] Writing {OUT} ...")
+    book.save(OUT)
+    print(f"Done in {time.perf_counter() - start:.1f}s! File size: {os.path.getsize(OUT) / (1024 * 1024):.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
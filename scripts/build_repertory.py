@@ -0,0 +1,73 @@
+"""
+Repertory Matrix Builder
+========================
+Reads the OpenRep repertory dump in sql_chunks/ (Postgres INSERTs):
+  - sym_rem   (rel_id, sym_id, rem_id, grade, src_id, ...) symptom -> remedy links
+  - remedies  (rem_id, rem_short, rem_name, ...)
+
+Output: data/repertory.npz  (symptom x remedy grade matrix, see backend/repertory.py)
+
+Usage:
+    python scripts/build_repertory.py [--sources kent.en,openrep_pub]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+BASE    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQL_IN  = os.path.join(BASE, "sql_chunks")
+OUT     = os.path.join(BASE, "data", "repertory.npz")
+
+sys.path.insert(0, os.path.join(BASE, "backend"))
+from repertory import RepertoryEngine  # noqa: E402
+
+# (rel_id, sym_id, rem_id, grade, 'src_id', ...
+SYM_REM_ROW = re.compile(r"\(\d+,(\d+),(\d+),(\d+),'([^']*)'")
+# (rem_id, 'rem_short', 'rem_name', ...
+REMEDY_ROW  = re.compile(r"\((\d+),'((?:[^'\\]|\\.|'')*)','((?:[^'\\]|\\.|'')*)'")
+
+
+def unquote(value: str) -> str:
+    return value.replace("''", "'").replace("\\'", "'")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", help="Comma-separated src_ids to keep (default: all sources)")
+    args = parser.parse_args()
+    sources = set(args.sources.split(",")) if args.sources else None
+
+    start = time.perf_counter()
+    links, remedies = [], {}
+    skipped = 0
+    files = sorted(glob.glob(os.path.join(SQL_IN, "*.sql")))
+    print(f"[1/2] Reading {len(files)} SQL chunks from {SQL_IN} ...")
+    for path in files:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith('INSERT INTO "sym_rem" '):
+                    for sym_id, rem_id, grade, src_id in SYM_REM_ROW.findall(line):
+                        if sources is None or src_id in sources:
+                            links.append((int(sym_id), int(rem_id), int(grade)))
+                        else:
+                            skipped += 1
+                elif line.startswith('INSERT INTO "remedies" '):
+                    for rem_id, short, name in REMEDY_ROW.findall(line):
+                        remedies[int(rem_id)] = (unquote(short), unquote(name))
+    print(f"   {len(links):,} symptom-remedy links ({skipped:,} from other sources skipped), "
+          f"{len(remedies):,} remedies")
+
+    print(f"[2/2] Building matrix -> {OUT} ...")
+    engine = RepertoryEngine.build(links, remedies)
+    engine.save(OUT)
+    rows, columns = engine.shape
+    print(f"   {rows:,} symptoms x {columns:,} remedies, {len(engine.grades):,} graded entries")
+    print(f"Done in {time.perf_counter() - start:.1f}s! File size: {os.path.getsize(OUT) / (1024 * 1024):.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,35 @@ Merges:
   1. all_medicine databased.csv  -> primary Allopathic source (~248k entries)
   2. data/medicines_database.json -> existing scraped Allopathic generics
   3. data/ayurvedic/herbs.json    -> Ayurvedic herbs (JSON)
-  4. Built-in curated Ayurvedic formulations list
-  5. Built-in curated Homeopathic remedies list
+  4. Essential_Medicines_List_2013_Delhi.xlsx -> Allopathic (if present, see merge_delhi_eml.py)
+  5. Curated Ayurvedic formulations list  (curated_medicines.py)
+  6. Curated Homeopathic remedies list     (curated_medicines.py)
+
+Usage:
+    python scripts/build_unified_database.py [--streaming] [--incremental] [--shards] [--snapshot] [--sqlite]
+
+--streaming reads the CSV block by block with pyarrow and title-cases and
+deduplicates it with Arrow string kernels and hash lookups instead of a
+Python loop per row (same output; see benchmarks/bench_csv_ingest.py).
+
+Every build saves each source's names to data/unified_build/<source>.json
+and a manifest of the sources' and outputs' SHA-256. --incremental reads
+again only the sources whose hash changed before merging, and does
+nothing at all when no source or output changed.
+
+--shards also writes data/unified_medicines/<Category>/<Letter>.json
+(minified, with .gz and .br copies) and a manifest of their counts and
+hashes, which replaces the summary file (see backend/medicine_shards.py).
+The single JSON file is still written for its existing readers.
+
+--snapshot also writes data/unified_medicines.arrow, a columnar snapshot
+servers memory-map instead of parsing JSON (see backend/medicine_snapshot.py).
+
+--sqlite also writes data/unified_medicines.sqlite3, an FTS5 trigram index
+of the names with their category and source (see backend/medicine_fts.py).
 
 Output: data/unified_medicines_database.json
+        data/unified_medicines_fuzzy_index.json  (typo-tolerant search index, see backend/fuzzy_index.py)
 Schema:
 {
   "Allopathic":  { "A": [...], "B": [...], ... },
@@ -17,10 +42,12 @@ Schema:
 }
 """
 
-import pandas as pd
+import argparse
+import hashlib
 import json
 import re
 import os
+import sys
 from collections import defaultdict
 
 # ---------------------------------------------------------------------------
@@ -29,135 +56,39 @@ CSV_IN  = os.path.join(BASE, "Medicines", "all_medicine databased.csv")
 ALLO_IN = os.path.join(BASE, "data", "medicines_database.json")
 AYUR_IN = os.path.join(BASE, "data", "ayurvedic", "herbs.json")
 OUT     = os.path.join(BASE, "data", "unified_medicines_database.json")
+FUZZY_OUT = os.path.join(BASE, "data", "unified_medicines_fuzzy_index.json")
+SUMMARY_OUT = os.path.join(BASE, "data", "unified_db_summary.json")
+SHARD_DIR = os.path.join(BASE, "data", "unified_medicines")
+SNAPSHOT_OUT = os.path.join(BASE, "data", "unified_medicines.arrow")
+SQLITE_OUT = os.path.join(BASE, "data", "unified_medicines.sqlite3")
+BUILD_DIR = os.path.join(BASE, "data", "unified_build")
+MANIFEST  = os.path.join(BUILD_DIR, "manifest.json")
+# Bump when a source's names are derived differently, so --incremental reads them all again
+BUILD_VERSION = 1
+# CSV bytes parsed per block in --streaming mode
+CSV_BLOCK_BYTES = 8 * 1024 * 1024
+# pandas' default NA strings: rows whose name is one of these are dropped in both modes
+CSV_NULL_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                   "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
 
-# ---------------------------------------------------------------------------
-# Curated Ayurvedic formulations / classical medicines
-# ---------------------------------------------------------------------------
-AYURVEDIC_CURATED = [
-    # Herbs (single)
-    "Ashwagandha","Tulsi","Amla","Giloy","Neem","Haridra","Brahmi","Shatavari",
-    "Methi","Mulethi","Punarnava","Ajwain","Adraka","Kumari (Aloe Vera)","Triphala",
-    "Arjuna","Senna","Brahmi","Shankhpushpi","Shilajit","Kesar","Guduchi","Pippali",
-    "Marica","Sunthi","Draksha","Jatamansi","Vacha","Kutki","Manjishtha","Sariva",
-    "Gokshura","Vidari","Bala","Musta","Kutaj","Dashamoola","Trikatu","Pushkarmool",
-    "Haritaki","Bibhitaki","Amalaki","Kali Mirch","Tejpata","Dalchini","Elaichi",
-    "Lavang","Javitri","Jaiphal","Nagkesar","Yashtimadhu","Babbula","Jyotishmati",
-    "Punarnavashtaka","Chirayata","Nux Vomica (Kuchwla)","Karela","Jamun (Eugenia)",
-    "Vasaka","Kantakari","Brihati","Eranda","Danti","Trivrit","Bilva","Agnimantha",
-    "Shyonaka","Gambhari","Patala","Gokshura","Salaparni","Prsniparni","Mashaparni",
-    "Shalaparni","Punarnava","Devdaru","Rasna","Guggulu","Shudh Guggulu","Kanchanar",
-    # Classical formulations
-    "Triphala Churna","Trikatu Churna","Sitopaladi Churna","Talisadi Churna",
-    "Avipattikar Churna","Hingwashtak Churna","Mahasudarshan Churna","Ashwagandhadi Churna",
-    "Brahmi Churna","Yashtimadhu Churna","Arjuna Churna","Haritaki Churna",
-    "Amrut Sagar Ras","Abhrak Bhasma","Swarna Bhasma","Rajat Bhasma","Tamra Bhasma",
-    "Lauh Bhasma","Mandur Bhasma","Prawal Bhasma","Mukta Shukti Bhasma","Kapardika Bhasma",
-    "Shankha Bhasma","Godanti Bhasma","Trivang Bhasma","Naga Bhasma","Vanga Bhasma",
-    "Ashtavarga","Chyawanprash","Brahma Rasayan","Bhallatakasava","Drakshasava",
-    "Ashwagandharishta","Dashamularishta","Saraswatarishta","Abhayarishta","Arjunarishta",
-    "Lohasava","Kumaryasava","Balarishta","Chandanasava","Pippalyasava",
-    "Brahmi Vati","Chandraprabha Vati","Arogyavardhini Vati","Sitopaladi Vati",
-    "Kankayan Vati","Swasa Kasa Chintamani","Lakshmi Vilas Ras","Vasant Kusumakar Ras",
-    "Sutashekhar Ras","Kamdudha Ras","Prawal Panchamrit","Godanti Mishran",
-    "Mahamrityunjay Ras","Swarna Sutsekhara Ras","Tribhuvan Kirti Ras",
-    "Chaturmukha Ras","Panchavalkala Kvath","Mahayogaraj Guggulu","Triphala Guggulu",
-    "Kanchanar Guggulu","Punarnavadi Guggulu","Shallaki Guggulu","Gokshuradi Guggulu",
-    "Yogaraj Guggulu","Kaishor Guggulu","Medohar Guggulu","Vatari Guggulu",
-    "Brihat Vatchintamani Ras","Ekangveer Ras","Vata Vidhwansaka Ras",
-    "Mukta Vati","Arjun Kwath","Kutajghan Vati","Bilwadi Churna","Panchasakar Churna",
-    "Haajmola (Digestive)","Punarnavadi Mandur","Irimedadi Oil","Mahanarayan Oil",
-    "Ksheerabala Oil","Dhanwantharam Oil","Balarista","Jeerakadyarishta","Chitrakadi Vati",
-    "Grahani Kapat Ras","Panchamrit Parpati","Swarna Parpati","Vijay Parpati",
-    "Bolbaddha Ras","Hridayarnav Ras","Pradarantak Lauha","Pushyanug Churna",
-    "Lodhrasava","Dashang Lepa","Jatyadi Oil","Triphala Ghrit","Brahmi Ghrit",
-    "Panchtikta Ghrit","Panchakarma Ghrit","Saraswat Ghrit","Ashwagandha Ghrit",
-    "Mahatikta Ghrit","Indukant Ghrit","Dhanwantharam Ghrit","Phala Ghrit",
-    # Patanjali / popular commercial Ayurvedic
-    "Divya Shilajit Rasayan Vati","Divya Kayakalp Vati","Divya Medha Vati",
-    "Divya Swasari Ras","Divya Arshkalp Vati","Divya Udarkalp Churna",
-    "Himalaya Liv.52","Himalaya Gasex","Himalaya Tentex Forte","Himalaya Speman",
-    "Himalaya Septilin","Himalaya Confido","Himalaya Ashvagandha","Himalaya Bacopa",
-    "Dabur Chyawanprash","Dabur Honitus","Dabur Hajmola","Dabur Ashwagandha",
-    "Baidyanath Triphala Churna","Baidyanath Dashamularishta","Baidyanath Chyawan Prash",
-    "Zandu Pancharishta","Zandu Balm","Zandu Nityam Churna","Zandu Kesari Jivan",
-]
+sys.path.insert(0, os.path.join(BASE, "backend"))
+from fuzzy_index import FuzzyIndex  # noqa: E402
+from medicine_shards import MANIFEST_NAME, write_shards  # noqa: E402
+from medicine_snapshot import write_snapshot  # noqa: E402
+from medicine_fts import write_database  # noqa: E402
+from curated_medicines import AYURVEDIC_CURATED, HOMEOPATHIC_CURATED  # noqa: E402
+from merge_delhi_eml import XLSX_IN, read_eml_names  # noqa: E402
 
-# ---------------------------------------------------------------------------
-# Curated Homeopathic remedies
-# ---------------------------------------------------------------------------
-HOMEOPATHIC_CURATED = [
-    # Polychrests (most widely used)
-    "Aconite Napellus","Apis Mellifica","Argentum Nitricum","Arnica Montana",
-    "Arsenicum Album","Aurum Metallicum","Belladonna","Bryonia Alba",
-    "Calcarea Carbonica","Calcarea Fluorica","Calcarea Phosphorica","Cantharis",
-    "Carbo Vegetabilis","Causticum","China Officinalis","Cina","Colocynthis",
-    "Conium Maculatum","Dulcamara","Euphrasia","Ferrum Metallicum","Ferrum Phosphoricum",
-    "Gelsemium","Graphites","Hepar Sulphuris","Hyoscyamus Niger","Ignatia Amara",
-    "Ipecacuanha","Kali Bichromicum","Kali Carbonicum","Kali Muriaticum",
-    "Kali Phosphoricum","Kali Sulphuricum","Lachesis","Ledum Palustre","Lycopodium",
-    "Magnesia Carbonica","Magnesia Muriatica","Magnesia Phosphorica","Mercurius Solubilis",
-    "Mercurius Vivus","Mezereum","Natrum Carbonicum","Natrum Muriaticum",
-    "Natrum Phosphoricum","Natrum Sulphuricum","Nitric Acid","Nux Moschata",
-    "Nux Vomica","Opium","Petroleum","Phosphoric Acid","Phosphorus","Platina",
-    "Plumbum Metallicum","Podophyllum","Pulsatilla","Rhus Toxicodendron",
-    "Ruta Graveolens","Sepia","Silica","Spigelia","Spongia Tosta","Stannum Metallicum",
-    "Staphysagria","Stramonium","Sulphur","Sulphuric Acid","Symphytum",
-    "Thuja Occidentalis","Urtica Urens","Veratrum Album","Zincum Metallicum",
-    # Nosodes & Sarcodes
-    "Tuberculinum","Medorrhinum","Syphilinum (Luesinum)","Carcinosin","Psorinum",
-    "Bacillinum","Diphtherinum","Thyroidinum","Insulinum","Lac Caninum",
-    # Common remedies
-    "Aethusa Cynapium","Allium Cepa","Aloe Socotrina","Alstonia Scholaris",
-    "Ammonium Carbonicum","Ammonium Muriaticum","Anacardium Orientale",
-    "Antimonium Crudum","Antimonium Tartaricum","Baryta Carbonica",
-    "Berberis Vulgaris","Borax","Bovista","Bufo Rana","Cactus Grandiflorus",
-    "Calotropis Gigantea","Camphora","Capsicum Annum","Chamomilla","Chelidonium Majus",
-    "Cicuta Virosa","Cimicifuga Racemosa","Clematis","Coffea Cruda","Colchicum",
-    "Crocus Sativus","Croton Tiglium","Cuprum Metallicum","Cyclamen","Digitalis",
-    "Dioscorea","Drosera Rotundifolia","Echinacea","Erigeron Canadense",
-    "Eupatorium Perfoliatum","Fluoric Acid","Galium Aparine","Glonoinum",
-    "Hamamelis Virginiana","Helleborus Niger","Helonias","Hydrastis","Hydrocyanicum Acidum",
-    "Hypericum Perforatum","Iodum","Iris Versicolor","Jalapa","Kreosotum",
-    "Lac Defloratum","Lachnantes","Lathyrus Sativus","Lilium Tigrinum","Lobelia Inflata",
-    "Lycopus Virginicus","Magnesium Sulphuricum","Medorrhinum","Merc Cor","Moschus",
-    "Murex Purpurea","Myristica Sebifera","Nabalus Serpentaria","Natrum Arsenicatum",
-    "Naja Tripudians","Stannum Iodatum","Stictia Pulmonaria","Strontium Carbonicum",
-    "Sulphur Iodatum","Tabacum","Tellurium","Teucrium Marum","Tinea Tonsurans",
-    "Torpidium","Veratrum Viride","Viscum Album","Wyethia","Xanthoxylum",
-    # Mother Tinctures (Q)
-    "Arnica Montana Mother Tincture","Echinacea Mother Tincture","Calendula Mother Tincture",
-    "Hydrastis Mother Tincture","Chelidonium Mother Tincture","Berberis Vulgaris Mother Tincture",
-    "Carduus Marianus Mother Tincture","Ceanothus Mother Tincture","Avena Sativa Mother Tincture",
-    "Passiflora Incarnata Mother Tincture","Withania Somnifera Mother Tincture",
-    "Syzygium Jambolanum Mother Tincture","Gymnema Sylvestre Mother Tincture",
-    "Momordica Charantia Mother Tincture","Phytolacca Decandra Mother Tincture",
-    "Thuja Occidentalis Mother Tincture","Lycopodium Mother Tincture",
-    "Symphytum Mother Tincture","Urtica Urens Mother Tincture","Hamamelis Mother Tincture",
-    # Biochemic Tissue Salts (Schussler)
-    "Calcarea Fluorica 6X","Calcarea Phosphorica 6X","Calcarea Sulphurica 6X",
-    "Ferrum Phosphoricum 6X","Kali Muriaticum 6X","Kali Phosphoricum 6X",
-    "Kali Sulphuricum 6X","Magnesia Phosphorica 6X","Natrum Muriaticum 6X",
-    "Natrum Phosphoricum 6X","Natrum Sulphuricum 6X","Silica 6X",
-    # Bio Combination tablets (Bioplasgen)
-    "Bioplasgen No 1 (Anaemia)","Bioplasgen No 2 (Asthma)","Bioplasgen No 3 (Colic)",
-    "Bioplasgen No 4 (Constipation)","Bioplasgen No 5 (Coryza)","Bioplasgen No 6 (Debility)",
-    "Bioplasgen No 7 (Diarrhoea)","Bioplasgen No 8 (Dysepsia)","Bioplasgen No 9 (Dentition)",
-    "Bioplasgen No 10 (Exhaustion)","Bioplasgen No 11 (Fever)","Bioplasgen No 12 (Headache)",
-    "Bioplasgen No 13 (Leucorrhoea)","Bioplasgen No 14 (Measles)","Bioplasgen No 15 (Menstrual)",
-    "Bioplasgen No 16 (Nervous Exhaustion)","Bioplasgen No 17 (Piles)",
-    "Bioplasgen No 18 (Throat)","Bioplasgen No 19 (Urinary)","Bioplasgen No 20 (Skin)",
-    "Bioplasgen No 21 (Teething)","Bioplasgen No 22 (Toothache)","Bioplasgen No 23 (Tumors)",
-    "Bioplasgen No 24 (Nervous Diseases)","Bioplasgen No 25 (Acidity)","Bioplasgen No 26 (Cold)",
-    "Bioplasgen No 27 (Eczema)","Bioplasgen No 28 (Nethertons)","Bioplasgen No 29 (Vitiligo)",
-]
+
+# Kept upper-case by title_smart
+ABBREVS = {"XR","SR","DT","IV","IM","SC","ER","CR","CD","LA","OD","BD","TDS",
+           "QID","MR","PR","SF","LS","DS","PD","LB","RF","Q"}
 
 
 def title_smart(name: str) -> str:
     """Title-case but preserve uppercase abbreviations."""
     words = name.strip().split()
-    abbrevs = {"XR","SR","DT","IV","IM","SC","ER","CR","CD","LA","OD","BD","TDS",
-               "QID","MR","PR","SF","LS","DS","PD","LB","RF","Q"}
-    return " ".join(w.upper() if w.upper() in abbrevs else w.capitalize() for w in words)
+    return " ".join(w.upper() if w.upper() in ABBREVS else w.capitalize() for w in words)
 
 
 def get_letter(name: str) -> str:
@@ -172,100 +103,339 @@ def build_letter_dict(names: list) -> dict:
     return dict(sorted(grouped.items()))
 
 
-# ---------------------------------------------------------------------------
-# Step 1: Load CSV
-# ---------------------------------------------------------------------------
-print("[1/6] Loading CSV (~248k rows) ...")
-df = pd.read_csv(CSV_IN, usecols=["name"], dtype=str, on_bad_lines="skip")
-df.dropna(subset=["name"], inplace=True)
-df["name"] = df["name"].str.strip()
-all_csv_names = df["name"].tolist()
-print(f"   Loaded {len(all_csv_names):,} entries from CSV.")
+def read_csv_names(path: str) -> list:
+    """Step 1: every name in the CSV, stripped (pandas, whole file in memory)"""
+    import pandas as pd
+    df = pd.read_csv(path, usecols=["name"], dtype=str, on_bad_lines="skip")
+    df.dropna(subset=["name"], inplace=True)
+    df["name"] = df["name"].str.strip()
+    return df["name"].tolist()
 
-# ---------------------------------------------------------------------------
-# Step 2: Load existing JSONs
-# ---------------------------------------------------------------------------
-print("[2/6] Loading existing JSON datasets ...")
-with open(ALLO_IN, encoding="utf-8") as f:
-    existing_allo = json.load(f)
 
-with open(AYUR_IN, encoding="utf-8") as f:
-    herbs_raw = json.load(f)
+def unique_titled(raw_names: list) -> list:
+    """Step 3: title_smart names, first of each case-insensitive duplicate"""
+    seen = set()
+    names = []
+    for raw in raw_names:
+        name = title_smart(raw)
+        key = name.lower()
+        if key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
 
-ayurvedic_from_json = [h["herb_name"] for h in herbs_raw]
-print(f"   Existing allopathic JSON: {len(existing_allo)} | Ayurvedic herbs JSON: {len(ayurvedic_from_json)}")
 
-# ---------------------------------------------------------------------------
-# Step 3: All CSV entries -> Allopathic (CSV is purely allopathic)
-# ---------------------------------------------------------------------------
-print("[3/6] Processing CSV entries into Allopathic bucket ...")
-seen_allo = set()
-allo_names = []
-for raw in all_csv_names:
-    name = title_smart(raw)
-    key = name.lower()
-    if key not in seen_allo:
-        seen_allo.add(key)
-        allo_names.append(name)
-print(f"   Unique CSV allopathic entries: {len(allo_names):,}")
+def stream_csv_names(path: str, block_bytes: int = CSV_BLOCK_BYTES) -> list:
+    """
+    Steps 1 and 3 in one pass over the CSV, CSV_BLOCK_BYTES at a time:
+    unique_titled(read_csv_names(path)) without the whole file in memory
+    or a Python loop per row.
 
-# ---------------------------------------------------------------------------
-# Step 4: Merge existing Allopathic JSON
-# ---------------------------------------------------------------------------
-print("[4/6] Merging existing medicines_database.json ...")
-merged_before = len(allo_names)
-for name in existing_allo:
-    key = name.strip().lower()
-    if key not in seen_allo:
-        seen_allo.add(key)
-        allo_names.append(title_smart(name))
-print(f"   Added {len(allo_names) - merged_before:,} unique entries from existing JSON. Total allopathic: {len(allo_names):,}")
+    pyarrow's streaming reader converts only the name column. title_smart
+    is done with Arrow string kernels on the block's words, and duplicates
+    are dropped by hash: pc.unique keeps the first of each key in the
+    block, pc.is_in drops keys already kept from earlier blocks.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv
 
-# ---------------------------------------------------------------------------
-# Step 5: Build Ayurvedic list
-# ---------------------------------------------------------------------------
-print("[5/6] Building Ayurvedic list ...")
-ayur_all = list(ayurvedic_from_json) + AYURVEDIC_CURATED
-ayur_unique = list({n.strip().lower(): n.strip() for n in ayur_all if n.strip()}.values())
-print(f"   Total unique Ayurvedic entries: {len(ayur_unique):,}")
+    reader = csv.open_csv(
+        path,
+        read_options=csv.ReadOptions(block_size=block_bytes),
+        # Like pandas' on_bad_lines="skip"
+        parse_options=csv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: "skip"),
+        convert_options=csv.ConvertOptions(include_columns=["name"], column_types={"name": pa.string()},
+                                           null_values=CSV_NULL_VALUES, strings_can_be_null=True),
+    )
+    abbrevs = pa.array(sorted(ABBREVS))
+    seen = pa.array([], pa.string())
+    names = []
+    for batch in reader:
+        words = pc.utf8_split_whitespace(pc.utf8_trim_whitespace(batch.column(0).drop_null()))
+        flat = pc.list_flatten(words)
+        upper = pc.utf8_upper(flat)
+        titled_words = pc.if_else(pc.is_in(upper, value_set=abbrevs), upper, pc.utf8_capitalize(flat))
+        titled = pc.binary_join(pa.ListArray.from_arrays(words.offsets, titled_words), " ")
+        keys = pc.utf8_lower(titled)
+        fresh = pc.invert(pc.is_in(keys, value_set=seen))
+        titled, keys = titled.filter(fresh), keys.filter(fresh)
+        unique = pc.unique(keys)
+        # index_in finds the first position of each distinct key
+        names.append(titled.take(pc.index_in(unique, value_set=keys)))
+        seen = pa.concat_arrays([seen, unique])
+    return pa.chunked_array(names, pa.string()).to_pylist()
 
-# ---------------------------------------------------------------------------
-# Step 6: Build Homeopathic list
-# ---------------------------------------------------------------------------
-print("[6/6] Building Homeopathic list ...")
-homeo_unique = list({n.strip().lower(): n.strip() for n in HOMEOPATHIC_CURATED if n.strip()}.values())
-print(f"   Total unique Homeopathic entries: {len(homeo_unique):,}")
 
-# ---------------------------------------------------------------------------
-# Build letter-wise structure
-# ---------------------------------------------------------------------------
-result = {
-    "Allopathic":  build_letter_dict(allo_names),
-    "Ayurvedic":   build_letter_dict(ayur_unique),
-    "Homeopathic": build_letter_dict(homeo_unique),
+# Sources in merge order, as named in BUILD_DIR and the manifest
+SOURCES = {
+    "csv": "all_medicine databased.csv",
+    "medicines_json": "medicines_database.json",
+    "herbs": "herbs.json",
+    "eml": "Delhi EML xlsx",
+    "ayurvedic_curated": "curated Ayurvedic formulations",
+    "homeopathic_curated": "curated Homeopathic remedies",
 }
 
-print("\nCategory summary:")
-for cat, letters in result.items():
-    total = sum(len(v) for v in letters.values())
-    print(f"   {cat:15s}: {total:>7,} entries  ({len(letters)} letters)")
 
-# ---------------------------------------------------------------------------
-# Write output
-# ---------------------------------------------------------------------------
-print(f"\nWriting to {OUT} ...")
-with open(OUT, "w", encoding="utf-8") as f:
-    json.dump(result, f, ensure_ascii=False, indent=2)
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-size_mb = os.path.getsize(OUT) / (1024 * 1024)
-print(f"Done! File size: {size_mb:.2f} MB")
 
-# Also write a flat summary for quick reference
-summary = {
-    cat: {letter: len(meds) for letter, meds in letters.items()}
-    for cat, letters in result.items()
-}
-SUMMARY_OUT = os.path.join(BASE, "data", "unified_db_summary.json")
-with open(SUMMARY_OUT, "w", encoding="utf-8") as f:
-    json.dump(summary, f, indent=2)
-print(f"Summary written to {SUMMARY_OUT}")
+def source_digests() -> dict:
+    """SHA-256 of each source; the EML is optional and None when absent"""
+    def list_digest(names: list) -> str:
+        return hashlib.sha256(json.dumps(names, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    return {
+        "csv": file_digest(CSV_IN),
+        "medicines_json": file_digest(ALLO_IN),
+        "herbs": file_digest(AYUR_IN),
+        "eml": file_digest(XLSX_IN) if os.path.exists(XLSX_IN) else None,
+        "ayurvedic_curated": list_digest(AYURVEDIC_CURATED),
+        "homeopathic_curated": list_digest(HOMEOPATHIC_CURATED),
+    }
+
+
+def output_paths(shards: bool = False, snapshot: bool = False, sqlite: bool = False) -> dict:
+    paths = {"database": OUT, "fuzzy_index": FUZZY_OUT}
+    if snapshot:
+        paths["snapshot"] = SNAPSHOT_OUT
+    if sqlite:
+        paths["sqlite"] = SQLITE_OUT
+    if not shards:
+        paths["summary"] = SUMMARY_OUT
+        return paths
+    # Every shard the shard manifest lists, so that a changed or missing one is rebuilt
+    paths["shard_manifest"] = os.path.join(SHARD_DIR, MANIFEST_NAME)
+    try:
+        with open(paths["shard_manifest"], encoding="utf-8") as f:
+            categories = json.load(f)["categories"]
+    except (OSError, ValueError, KeyError):
+        return paths
+    for letters in categories.values():
+        for entry in letters.values():
+            for suffix in ("", ".gz", ".br"):
+                if suffix != ".br" or "brotli_bytes" in entry:
+                    paths[entry["file"] + suffix] = os.path.join(SHARD_DIR, entry["file"] + suffix)
+    return paths
+
+
+def read_source(name: str, streaming: bool = False):
+    """One source's contribution to the merge, as saved in BUILD_DIR"""
+    if name == "csv":
+        if streaming:
+            print(f"   Streaming in {CSV_BLOCK_BYTES // (1024 * 1024)} MB blocks (title-cased and deduplicated per block) ...")
+            return stream_csv_names(CSV_IN)
+        all_csv_names = read_csv_names(CSV_IN)
+        print(f"   Loaded {len(all_csv_names):,} entries from CSV.")
+        # All CSV entries -> Allopathic (CSV is purely allopathic)
+        return unique_titled(all_csv_names)
+    if name == "medicines_json":
+        with open(ALLO_IN, encoding="utf-8") as f:
+            existing_allo = json.load(f)
+        # [key, name] pairs: the merge matches the untitled name against earlier keys
+        pairs = {}
+        for raw in existing_allo:
+            pairs.setdefault(raw.strip().lower(), title_smart(raw))
+        return [[key, titled] for key, titled in pairs.items()]
+    if name == "herbs":
+        with open(AYUR_IN, encoding="utf-8") as f:
+            herbs_raw = json.load(f)
+        return [h["herb_name"] for h in herbs_raw]
+    if name == "eml":
+        return read_eml_names(XLSX_IN) if os.path.exists(XLSX_IN) else []
+    if name == "ayurvedic_curated":
+        return AYURVEDIC_CURATED
+    if name == "homeopathic_curated":
+        return HOMEOPATHIC_CURATED
+    raise ValueError(f"Unknown source: {name}")
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == BUILD_VERSION else {}
+
+
+def load_part(name: str, digest: str):
+    """The saved contribution of a source, or None if it was saved from other content"""
+    try:
+        with open(os.path.join(BUILD_DIR, f"{name}.json"), encoding="utf-8") as f:
+            part = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if part.get("version") != BUILD_VERSION or part.get("sha256") != digest:
+        return None
+    return part["names"]
+
+
+def save_part(name: str, digest: str, names):
+    with open(os.path.join(BUILD_DIR, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": BUILD_VERSION, "sha256": digest, "names": names}, f, ensure_ascii=False)
+
+
+def merge(parts: dict, sources: dict = None) -> dict:
+    """
+    The letter-wise database from every source's contribution. When given,
+    sources is filled with the source of each name: {(category, name): source}.
+    """
+    if sources is None:
+        sources = {}
+    allo_names = list(parts["csv"])
+    sources.update((("Allopathic", name), "csv") for name in allo_names)
+    seen_allo = {name.lower() for name in allo_names}
+    merged_before = len(allo_names)
+    for key, name in parts["medicines_json"]:
+        if key not in seen_allo:
+            seen_allo.add(key)
+            allo_names.append(name)
+            sources.setdefault(("Allopathic", name), "medicines_json")
+    print(f"   Added {len(allo_names) - merged_before:,} unique entries from existing JSON.")
+    merged_before = len(allo_names)
+    for name in parts["eml"]:
+        key = name.lower()
+        if key not in seen_allo:
+            seen_allo.add(key)
+            allo_names.append(name)
+            sources.setdefault(("Allopathic", name), "eml")
+    print(f"   Added {len(allo_names) - merged_before:,} unique entries from Delhi EML. Total allopathic: {len(allo_names):,}")
+
+    # The first spelling's position, the last spelling's text, as in {key: name} of the whole list
+    ayur = {}
+    for source in ("herbs", "ayurvedic_curated"):
+        for n in parts[source]:
+            if n.strip():
+                ayur[n.strip().lower()] = (n.strip(), source)
+    ayur_unique = [name for name, _ in ayur.values()]
+    sources.update((("Ayurvedic", name), source) for name, source in ayur.values())
+    print(f"   Total unique Ayurvedic entries: {len(ayur_unique):,}")
+    homeo_unique = list({n.strip().lower(): n.strip() for n in parts["homeopathic_curated"] if n.strip()}.values())
+    sources.update((("Homeopathic", name), "homeopathic_curated") for name in homeo_unique)
+    print(f"   Total unique Homeopathic entries: {len(homeo_unique):,}")
+
+    return {
+        "Allopathic":  build_letter_dict(allo_names),
+        "Ayurvedic":   build_letter_dict(ayur_unique),
+        "Homeopathic": build_letter_dict(homeo_unique),
+    }
+
+
+def build(incremental: bool = False, streaming: bool = False, shards: bool = False,
+          snapshot: bool = False, sqlite: bool = False) -> list:
+    """
+    Build the outputs; returns the sources that were read again.
+
+    With incremental, a source whose SHA-256 matches its saved
+    contribution is not read again, and nothing is done when the manifest
+    matches every source and output. The manifest is written last, so an
+    interrupted build is redone on the next run.
+    """
+    digests = source_digests()
+    manifest = load_manifest() if incremental else {}
+    if manifest.get("sources") == digests and all(
+            os.path.exists(path) and manifest["outputs"].get(name) == file_digest(path)
+            for name, path in output_paths(shards, snapshot, sqlite).items()):
+        print("No source changed since the last build; outputs are up to date.")
+        return []
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    parts = {}
+    read = []
+    for step, (name, label) in enumerate(SOURCES.items(), 1):
+        part = load_part(name, digests[name]) if incremental else None
+        if part is not None:
+            print(f"[{step}/{len(SOURCES) + 1}] {label}: unchanged, reusing {len(part):,} saved entries")
+        else:
+            print(f"[{step}/{len(SOURCES) + 1}] Reading {label} ...")
+            part = read_source(name, streaming)
+            save_part(name, digests[name], part)
+            read.append(name)
+            print(f"   {len(part):,} entries")
+        parts[name] = part
+
+    print(f"[{len(SOURCES) + 1}/{len(SOURCES) + 1}] Merging ...")
+    sources = {}
+    result = merge(parts, sources)
+
+    print("\nCategory summary:")
+    for cat, letters in result.items():
+        total = sum(len(v) for v in letters.values())
+        print(f"   {cat:15s}: {total:>7,} entries  ({len(letters)} letters)")
+
+    # -----------------------------------------------------------------------
+    # Write output
+    # -----------------------------------------------------------------------
+    print(f"\nWriting to {OUT} ...")
+    with open(OUT, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    size_mb = os.path.getsize(OUT) / (1024 * 1024)
+    print(f"Done! File size: {size_mb:.2f} MB")
+
+    if shards:
+        print(f"\nWriting shards to {SHARD_DIR} ...")
+        shard_manifest = write_shards(result, SHARD_DIR)
+        entries = [entry for letters in shard_manifest["categories"].values() for entry in letters.values()]
+        sizes = ", ".join(f"{label} {sum(entry.get(key, 0) for entry in entries) / (1024 * 1024):.2f} MB"
+                          for label, key in (("json", "bytes"), ("gzip", "gzip_bytes"), ("brotli", "brotli_bytes")))
+        print(f"Done! {len(entries)} shards: {sizes}")
+        if entries and "brotli_bytes" not in entries[0]:
+            print("⚠️  brotli is not installed; no .br shards were written")
+    else:
+        # Also write a flat summary for quick reference (the shard manifest has the counts with --shards)
+        summary = {
+            cat: {letter: len(meds) for letter, meds in letters.items()}
+            for cat, letters in result.items()
+        }
+        with open(SUMMARY_OUT, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Summary written to {SUMMARY_OUT}")
+
+    if snapshot:
+        print(f"\nWriting columnar snapshot -> {SNAPSHOT_OUT} ...")
+        write_snapshot(result, SNAPSHOT_OUT)
+        print(f"Done! File size: {os.path.getsize(SNAPSHOT_OUT) / (1024 * 1024):.2f} MB")
+
+    if sqlite:
+        print(f"\nWriting SQLite full-text search database -> {SQLITE_OUT} ...")
+        write_database(result, SQLITE_OUT, sources)
+        print(f"Done! File size: {os.path.getsize(SQLITE_OUT) / (1024 * 1024):.2f} MB")
+
+    # Fuzzy search index: built here once so the backend only has to load it
+    print(f"\nBuilding fuzzy search index -> {FUZZY_OUT} ...")
+    FuzzyIndex.build(result).save(FUZZY_OUT)
+    print(f"Done! File size: {os.path.getsize(FUZZY_OUT) / (1024 * 1024):.2f} MB")
+
+    with open(MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({"version": BUILD_VERSION, "sources": digests,
+                   "outputs": {name: file_digest(path) for name, path in output_paths(shards, snapshot, sqlite).items()}}, f, indent=2)
+    return read
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streaming", action="store_true",
+                        help="Read the CSV in blocks with pyarrow and vectorized string operations")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Read again only the sources changed since the last build (see data/unified_build/manifest.json)")
+    parser.add_argument("--shards", action="store_true",
+                        help="Also write minified, precompressed per-category, per-letter shards (replacing the summary file)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Also write a memory-mappable Arrow snapshot (needs pyarrow)")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="Also write a SQLite FTS5 (trigram) database of the names")
+    args = parser.parse_args()
+    build(incremental=args.incremental, streaming=args.streaming, shards=args.shards, snapshot=args.snapshot,
+          sqlite=args.sqlite)
+
+
+if __name__ == "__main__":
+    main()